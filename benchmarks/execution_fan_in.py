@@ -0,0 +1,50 @@
+"""
+Times an execution of a wide, high fan-in plan of no-op steps.
+
+Every sink step depends on 'fan_in' randomly chosen source steps, so readiness tracking for the sinks dominates
+the run once the sources start finishing.
+
+    python -m benchmarks.execution_fan_in --sources 49000 --sinks 1000 --fan-in 200
+"""
+import argparse
+import logging
+import random
+import time
+
+from daisychain.executor import Executor, Execution
+from daisychain.steps.marker import Marker
+
+
+def build_plan(sources, sinks, fan_in, seed=0):
+    rng = random.Random(seed)
+    source_steps = [Marker(name='source_{}'.format(i)) for i in range(sources)]
+    sink_steps = [Marker(name='sink_{}'.format(i), dependencies=rng.sample(source_steps, fan_in)) for i in range(sinks)]
+    return source_steps + sink_steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sources', type=int, default=49000)
+    parser.add_argument('--sinks', type=int, default=1000)
+    parser.add_argument('--fan-in', type=int, default=200)
+    args = parser.parse_args()
+    logging.getLogger('').setLevel(logging.WARNING)
+
+    steps = build_plan(args.sources, args.sinks, args.fan_in)
+    executor = Executor(name='fan_in', dependencies=steps)
+
+    start = time.time()
+    Execution(executor=executor)
+    setup_seconds = time.time() - start
+
+    start = time.time()
+    executor.execute()
+    execute_seconds = time.time() - start
+
+    print("{} steps, {} edges".format(len(steps), args.sinks * args.fan_in))
+    print("Execution setup: {:.3f}s".format(setup_seconds))
+    print("Executor.execute (validation + execution): {:.3f}s".format(execute_seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Times the instantiation of a large plan configuration through the Instantiator, and the construction of the same
+number of steps directly, with the fields of the steps checked as they are created and with their checks deferred.
+
+The configuration has 'steps' Marker steps, each depending on up to 'fan_in' of the steps before it.
+
+    python -m benchmarks.instantiation --steps 20000 --fan-in 3
+"""
+import argparse
+import logging
+import random
+import time
+
+from daisychain.field import deferred_validation
+from daisychain.instantiator import Instantiator
+from daisychain.steps.marker import Marker
+
+
+def build_config(steps, fan_in, seed=0):
+    rng = random.Random(seed)
+    names = []
+    config = dict()
+    for i in range(steps):
+        name = 'step_{}'.format(i)
+        dependencies = rng.sample(names[-100:], min(len(names), rng.randint(0, fan_in))) if names else []
+        config[name] = {'class': 'daisychain.steps.marker.Marker', 'dependencies': dependencies}
+        names.append(name)
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--steps', type=int, default=20000)
+    parser.add_argument('--fan-in', type=int, default=3)
+    args = parser.parse_args()
+    logging.getLogger('').setLevel(logging.WARNING)
+
+    start = time.time()
+    for i in range(args.steps):
+        Marker(name='step_{}'.format(i))
+    construction_seconds = time.time() - start
+
+    start = time.time()
+    with deferred_validation():
+        for i in range(args.steps):
+            Marker(name='step_{}'.format(i))
+    deferred_construction_seconds = time.time() - start
+
+    instantiator = Instantiator(name='instantiation', config=build_config(args.steps, args.fan_in))
+    start = time.time()
+    instantiator.run()
+    instantiation_seconds = time.time() - start
+
+    instantiator = Instantiator(name='instantiation', config=build_config(args.steps, args.fan_in), defer_validation=True)
+    start = time.time()
+    instantiator.run()
+    deferred_instantiation_seconds = time.time() - start
+
+    print("{} steps, up to {} dependencies each".format(args.steps, args.fan_in))
+    print("Direct construction: {:.3f}s ({:.1f} us/step)".format(construction_seconds, construction_seconds * 1e6 / args.steps))
+    print("Deferred checks:     {:.3f}s ({:.1f} us/step)".format(deferred_construction_seconds, deferred_construction_seconds * 1e6 / args.steps))
+    print("Instantiator.run:    {:.3f}s ({:.1f} us/step)".format(instantiation_seconds, instantiation_seconds * 1e6 / args.steps))
+    print("Deferred checks:     {:.3f}s ({:.1f} us/step)".format(deferred_instantiation_seconds, deferred_instantiation_seconds * 1e6 / args.steps))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Measures the memory taken by a large generated plan with tracemalloc.
+
+The plan is made of 'steps' Marker steps, each depending on up to 'fan_in' steps generated before it, the way plans
+generated from templates tend to chain.  Reports the memory per step once the steps are built and once an Execution
+was set up for them.
+
+    python -m benchmarks.plan_memory --steps 100000 --fan-in 3
+"""
+import argparse
+import gc
+import logging
+import random
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from daisychain.executor import Executor, Execution
+from daisychain.steps.marker import Marker
+
+
+def build_plan(steps, fan_in, seed=0):
+    rng = random.Random(seed)
+    plan = []
+    for i in range(steps):
+        dependencies = rng.sample(plan[-100:], min(len(plan), rng.randint(0, fan_in))) if plan else []
+        plan.append(Marker(name='step_{}'.format(i), dependencies=dependencies))
+    return plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--steps', type=int, default=100000)
+    parser.add_argument('--fan-in', type=int, default=3)
+    args = parser.parse_args()
+    if tracemalloc is None:
+        parser.error("tracemalloc is only available on Python 3.4+")
+    logging.getLogger('').setLevel(logging.WARNING)
+
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    plan = build_plan(args.steps, args.fan_in)
+    gc.collect()
+    built, built_peak = tracemalloc.get_traced_memory()
+
+    executor = Executor(name='memory', dependencies=plan)
+    Execution(executor=executor)
+    gc.collect()
+    setup, setup_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print("{} steps, up to {} dependencies each".format(args.steps, args.fan_in))
+    print("Steps built:       {:8.1f} MB, {:6.0f} bytes/step (peak {:.1f} MB)".format((built - baseline) / 1e6, float(built - baseline) / args.steps, (built_peak - baseline) / 1e6))
+    print("Execution set up:  {:8.1f} MB, {:6.0f} bytes/step (peak {:.1f} MB)".format((setup - baseline) / 1e6, float(setup - baseline) / args.steps, (setup_peak - baseline) / 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Synthetic plan generators for the benchmarks.  Every generator returns a plan configuration, a dictionary of
+<step_name, step_config> like the 'steps' section of a plan, so that the same plan can go through the Instantiator or
+Chain, or be built directly with 'build_steps'.
+"""
+import math
+import random
+
+from daisychain.steps.marker import Marker
+from daisychain.steps.monitor import Monitor
+
+MARKER = 'daisychain.steps.marker.Marker'
+MONITOR = 'benchmarks.plans.NoOpMonitor'
+
+
+class NoOpMonitor(Monitor):
+    def run(self):
+        pass
+
+
+def step_name(i):
+    return 'step_{}'.format(i)
+
+
+def fan_out(size, seed=0):
+    """
+    One root step with every other step depending on it
+    """
+    config = {step_name(0): {'class': MARKER, 'dependencies': []}}
+    for i in range(1, size):
+        config[step_name(i)] = {'class': MARKER, 'dependencies': [step_name(0)]}
+    return config
+
+
+def chain(size, seed=0):
+    """
+    A single chain of steps, each depending on the one before it
+    """
+    config = dict()
+    for i in range(size):
+        config[step_name(i)] = {'class': MARKER, 'dependencies': [step_name(i - 1)] if i else []}
+    return config
+
+
+def diamond(size, seed=0):
+    """
+    A lattice of layers about as wide as the lattice is deep, each step depending on the two steps diagonally before it
+    """
+    width = max(1, int(math.sqrt(size)))
+    config = dict()
+    for i in range(size):
+        layer, column = divmod(i, width)
+        dependencies = []
+        if layer:
+            dependencies = sorted(set(step_name((layer - 1) * width + c) for c in (column, (column + 1) % width)))
+        config[step_name(i)] = {'class': MARKER, 'dependencies': dependencies}
+    return config
+
+
+def random_dag(size, seed=0, fan_in=3, window=100):
+    """
+    Each step depends on up to 'fan_in' of the 'window' steps before it, the way generated plans tend to chain
+    """
+    rng = random.Random(seed)
+    config = dict()
+    for i in range(size):
+        candidates = range(max(0, i - window), i)
+        dependencies = rng.sample(candidates, min(len(candidates), rng.randint(0, fan_in)))
+        config[step_name(i)] = {'class': MARKER, 'dependencies': [step_name(d) for d in sorted(dependencies)]}
+    return config
+
+
+def monitor_heavy(size, seed=0, watches=5):
+    """
+    A random DAG where one step in ten is a monitor watching 'watches' of the steps
+    """
+    rng = random.Random(seed)
+    monitors = size // 10
+    config = random_dag(size - monitors, seed=seed)
+    names = sorted(config)
+    for i in range(monitors):
+        config['monitor_{}'.format(i)] = {'class': MONITOR, 'watches': rng.sample(names, min(len(names), watches))}
+    return config
+
+
+SHAPES = {
+    'fan-out': fan_out,
+    'chain': chain,
+    'diamond': diamond,
+    'random': random_dag,
+    'monitors': monitor_heavy,
+}
+
+
+def build_steps(config):
+    """
+    Builds the steps of a plan configuration directly, without the Instantiator.  Steps are built in name order, which
+    the generators number so that steps only refer to steps built before them
+    """
+    steps = dict()
+    for name in sorted(config, key=lambda name: (name.split('_')[0] == 'monitor', int(name.rsplit('_', 1)[1]))):
+        step_config = config[name]
+        if step_config['class'] == MONITOR:
+            steps[name] = NoOpMonitor(name=name, watches=[steps[watched] for watched in step_config['watches']])
+        else:
+            steps[name] = Marker(name=name, dependencies=[steps[dependency] for dependency in step_config['dependencies']])
+    return list(steps.values())
@@ -0,0 +1,102 @@
+"""
+Measures how many StepStatus stage reads per second a scan over many statuses gets, with the lock-free reads of
+StepStatus against reads that take the status lock, as StepStatus did before.
+
+Each scan reads every stage property of every status, like an executor pass followed by a monitor search.  With
+'--threads', that many threads scan at once while another thread keeps transitioning the statuses.
+
+    python -m benchmarks.step_status_scan --statuses 10000 --scans 20 --threads 4
+"""
+import argparse
+import threading
+import time
+
+from daisychain.step_status import StepStatus
+
+
+class LockingStepStatus(StepStatus):
+    """
+    StepStatus with the stage reads of earlier versions, which took the status lock
+    """
+
+    @property
+    def pending(self):
+        with self.lock:
+            return self.stage == self.PENDING
+
+    @property
+    def running(self):
+        with self.lock:
+            return self.stage == self.RUNNING
+
+    @property
+    def validated(self):
+        with self.lock:
+            return self.stage == self.VALIDATED
+
+    @property
+    def finished(self):
+        with self.lock:
+            return self.stage == self.FINISHED
+
+    @property
+    def failed(self):
+        with self.lock:
+            return self.stage not in self.NOT_FAILED
+
+
+def scan(statuses, scans):
+    for _ in range(scans):
+        for status in statuses:
+            status.pending
+            status.validated
+            status.running
+            status.finished
+            status.failed
+
+
+def transition(statuses, stop):
+    while not stop.is_set():
+        for status in statuses:
+            status.set_running()
+            status.set_pending()
+
+
+def measure(status_class, count, scans, threads):
+    statuses = [status_class() for _ in range(count)]
+    stop = threading.Event()
+    mutator = None
+    if threads > 1:
+        mutator = threading.Thread(target=transition, args=(statuses[::10], stop))
+        mutator.start()
+
+    scanners = [threading.Thread(target=scan, args=(statuses, scans)) for _ in range(threads)]
+    start = time.time()
+    for scanner in scanners:
+        scanner.start()
+    for scanner in scanners:
+        scanner.join()
+    seconds = time.time() - start
+
+    stop.set()
+    if mutator is not None:
+        mutator.join()
+    return count * scans * threads * 5 / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--statuses', type=int, default=10000)
+    parser.add_argument('--scans', type=int, default=20)
+    parser.add_argument('--threads', type=int, default=1)
+    args = parser.parse_args()
+
+    locking = measure(LockingStepStatus, args.statuses, args.scans, args.threads)
+    lock_free = measure(StepStatus, args.statuses, args.scans, args.threads)
+    print("{} statuses, {} scans, {} scanning threads".format(args.statuses, args.scans, args.threads))
+    print("Locking reads:   {:,.0f} reads/s".format(locking))
+    print("Lock-free reads: {:,.0f} reads/s ({:.1f}x)".format(lock_free, lock_free / locking))
+
+
+if __name__ == '__main__':
+    main()
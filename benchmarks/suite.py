@@ -0,0 +1,148 @@
+"""
+Benchmark suite for the executor, the reference graph and the instantiator over synthetic plans.
+
+Every benchmark runs for every plan shape (see benchmarks.plans) and size, keeping the best of 'repeat' runs.  Results
+are written as JSON with '--output', and '--compare' checks them against a stored baseline, exiting with status 1 if
+any benchmark got slower by more than '--threshold'.
+
+    python -m benchmarks.suite --sizes 1000 10000 100000 --output results.json
+    python -m benchmarks.suite --sizes 1000 10000 --compare results.json --threshold 0.2
+"""
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+
+from benchmarks import plans
+from daisychain.executor import Executor
+from daisychain.instantiator import Instantiator
+from daisychain.steps.compilers.chain import Chain
+from daisychain.steps.input import InMemoryInput
+from daisychain.steps.marker import Marker
+from daisychain.steps.pipes.json_convert import JsonLoad
+
+INHERITANCE_COMPILER = 'daisychain.steps.compilers.step_config_inheritance.StepConfigInheritance'
+
+
+def bench_instantiate(config):
+    instantiator = Instantiator(name='instantiation', config=config)
+    start = time.time()
+    instantiator.run()
+    return time.time() - start
+
+
+def bench_reverse_mapping(config):
+    executor = Executor(name='benchmark', dependencies=plans.build_steps(config))
+    start = time.time()
+    executor._get_reverse_mapping(for_execution=True)
+    return time.time() - start
+
+
+def bench_prune(config):
+    root = Marker(name='root', dependencies=plans.build_steps(config))
+    start = time.time()
+    root.prune()
+    return time.time() - start
+
+
+def bench_generations(config):
+    executor = Executor(name='benchmark', dependencies=plans.build_steps(config))
+    start = time.time()
+    list(executor.reference_generations(for_execution=True))
+    return time.time() - start
+
+
+def bench_execute(config):
+    executor = Executor(name='benchmark', dependencies=plans.build_steps(config))
+    start = time.time()
+    executor.execute()
+    return time.time() - start
+
+
+def bench_chain_compile(config):
+    """
+    Compiles the plan from JSON through Chain, with every step inheriting its class from a template step
+    """
+    steps = {'template': {'class': plans.MARKER}}
+    for name, step_config in config.items():
+        steps[name] = dict((key, value) for key, value in step_config.items() if key != 'class')
+        steps[name]['__super__'] = 'template'
+    json_input = InMemoryInput(output=json.dumps({'__compilers__': [INHERITANCE_COMPILER], 'steps': steps}))
+    compiler = Chain(input_step=JsonLoad(input_step=json_input))
+    executor = Executor(name='compilation', dependencies=[compiler])
+    start = time.time()
+    executor.execute()
+    return time.time() - start
+
+
+BENCHMARKS = {
+    'instantiate': bench_instantiate,
+    'reverse_mapping': bench_reverse_mapping,
+    'prune': bench_prune,
+    'generations': bench_generations,
+    'execute': bench_execute,
+    'chain_compile': bench_chain_compile,
+}
+
+
+def run(benchmarks, shapes, sizes, repeat):
+    results = dict()
+    for size in sizes:
+        for shape in shapes:
+            for benchmark in benchmarks:
+                key = '{}.{}.{}'.format(benchmark, shape, size)
+                best = min(BENCHMARKS[benchmark](plans.SHAPES[shape](size)) for _ in range(repeat))
+                results[key] = best
+                print("{:45} {:10.4f}s".format(key, best))
+                sys.stdout.flush()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints how each result compares to the baseline and returns the keys of the results that regressed
+    """
+    regressions = []
+    print("\n{:45} {:>10} {:>10} {:>8}".format('benchmark', 'baseline', 'current', 'ratio'))
+    for key in sorted(results):
+        if key not in baseline:
+            continue
+        ratio = results[key] / baseline[key] if baseline[key] else float('inf')
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            flag = '  REGRESSION'
+        print("{:45} {:10.4f} {:10.4f} {:8.2f}{}".format(key, baseline[key], results[key], ratio, flag))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--shapes', nargs='+', choices=sorted(plans.SHAPES), default=sorted(plans.SHAPES))
+    parser.add_argument('--benchmarks', nargs='+', choices=sorted(BENCHMARKS), default=sorted(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', metavar='PATH', help="Write the results to this JSON file")
+    parser.add_argument('--compare', metavar='PATH', help="Compare the results to the baseline results in this JSON file")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Fraction a benchmark can get slower than the baseline before it counts as a regression")
+    args = parser.parse_args()
+    logging.getLogger('').setLevel(logging.WARNING)
+
+    results = run(args.benchmarks, args.shapes, args.sizes, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': platform.python_version(), 'repeat': args.repeat, 'results': results}, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\n{} of {} benchmarks regressed by more than {:.0%}".format(len(regressions), len(results), args.threshold))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Times the validation of a large ReferenceList, as when an Executor is given every step of a generated plan as its
+dependencies, against the loop of earlier versions of ListField.check_value, which resolved the element validator
+again for every element.
+
+The field checks that its elements are Steps and validates each of them with an instance method, 'repeat' times.
+
+    python -m benchmarks.validation --steps 50000 --repeat 5
+"""
+import argparse
+import logging
+import time
+
+from daisychain.executor import Executor
+from daisychain.reference import ReferenceList
+from daisychain.step import Step
+from daisychain.steps.marker import Marker
+
+
+class PerElementReferenceList(ReferenceList):
+    """
+    ReferenceList with the element loop of earlier versions
+    """
+
+    def check_value(self, source, attribute_name, value):
+        for element in value:
+            if self.elements_of is not None and not isinstance(element, self.elements_of):
+                raise TypeError("{!r} is not a {!r}".format(element, self.elements_of))
+            if self.element_validator is not None:
+                result = self._get_validator(source, attribute_name, self.element_validator)(element)
+                if result is not None:
+                    assert result
+
+
+class ValidatingExecutor(Executor):
+
+    def is_named(self, step):
+        return step.name is not None
+
+
+def measure(field, source, plan, repeat):
+    start = time.time()
+    for _ in range(repeat):
+        field.check_value(source, 'dependencies', plan)
+    return (time.time() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--steps', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    logging.getLogger('').setLevel(logging.WARNING)
+
+    plan = [Marker(name='step_{}'.format(i)) for i in range(args.steps)]
+    executor = ValidatingExecutor(name='validation')
+
+    per_element = measure(PerElementReferenceList(elements_of=Step, element_validator='is_named'), executor, plan, args.repeat)
+    resolved_once = measure(ReferenceList(elements_of=Step, element_validator='is_named'), executor, plan, args.repeat)
+    type_only = measure(ReferenceList(elements_of=Step), executor, plan, args.repeat)
+
+    print("{} elements, mean of {} checks".format(args.steps, args.repeat))
+    print("Validator resolved per element: {:.4f}s".format(per_element))
+    print("Validator resolved once:        {:.4f}s ({:.1f}x)".format(resolved_once, per_element / resolved_once))
+    print("Type checks only:               {:.4f}s".format(type_only))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+import asyncio
+import functools
+
+from daisychain.async_step import AsyncStep
+from daisychain.executor import Executor, Execution, _DEFAULT_START
+
+
+class AsyncExecutor(Executor):
+    """
+    Executor that drives the same Execution state machine on an asyncio event loop.  Requires Python 3.5+.
+
+    AsyncSteps are validated, run and checked as coroutines on the loop, so thousands of I/O-bound steps can be in
+    flight at once.  Synchronous steps are validated and run in a thread executor: the loop's default one, or the
+    worker pool if 'max_workers' is set.  The loop only wakes up for status changes, or every 'scan_interval' when
+    an in-flight step has to be polled.
+
+    Steps are validated on the loop rather than on a validation pool, so 'validation_workers' is rejected instead of
+    being ignored.
+    """
+
+    def __init__(self, **fields):
+        if fields.get('validation_workers') is not None:
+            raise ValueError("AsyncExecutor validates steps on its event loop and does not support validation_workers")
+        fields.setdefault('scheduler', Executor.EVENT)
+        super(AsyncExecutor, self).__init__(**fields)
+        self._loop = None
+        self._wakeup = None
+
+    def execute(self):
+        """
+        Runs 'execute_async' to completion on a new event loop
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.execute_async())
+        finally:
+            loop.close()
+
+    async def execute_async(self):
+        """
+        Runs a validation execution which, if 'self.dry_run' is not set, will be followed by a full execution
+        """
+        # get_running_loop only exists from Python 3.7, where get_event_loop is deprecated inside of coroutines
+        self._loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)()
+        self._wakeup = asyncio.Event()
+
+        self.compile_plan()
+        if self.execution is None:
+            self.execution = Execution(executor=self)
+        self._restore_from_journal()
+        self._skip_clean_steps()
+        self._check_deferred_fields()
+
+        self.log().info("Validating plan...")
+        await self._run_execution_async(for_validation=True)
+        if self.execution.aborted:
+            self.log().error("Plan failed to validate.")
+        else:
+            self.log().info("Plan successfully validated.")
+            if self.dry_run:
+                self.log().info("Execution is in 'dry-run' mode so steps are not run")
+            else:
+                self.log().info("Beginning execution...")
+                self.execution = Execution(executor=self)
+                self._start_worker_pool()
+                self._start_timing()
+                self._start_journal()
+                try:
+                    await self._run_execution_async()
+                finally:
+                    self._stop_journal()
+                    self._stop_timing()
+                    self._shutdown_worker_pool()
+
+        self.release_reachability()
+        return self.execution
+
+    def _on_status_change(self, status, stage):
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run_execution_async(self, for_validation=False):
+        if for_validation:
+            execution_type = 'validation'
+        else:
+            execution_type = 'execution'
+
+        self.execution.watch_statuses()
+        for step in self.execution.all_refs:
+            step.status.add_listener(self._on_status_change)
+        if self.ready_policy is not None:
+            self.ready_policy.prepare(self.execution)
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.attach(self.execution.all_refs)
+            phase_started = instrumentation.clock()
+
+        try:
+            while self.execution.working_set:
+                self.execution.updated = False
+                if instrumentation is not None:
+                    pass_started = instrumentation.clock()
+                steps_to_visit = self._steps_with_changes(for_validation)
+                for step in steps_to_visit:
+                    try:
+                        if for_validation:
+                            if not self.execution.aborted:
+                                await self._validate_step_async(step)
+                            self._consider_step_validated(step)
+                        else:
+                            await self._execute_step_async(step)
+
+                    except Exception as e:
+                        step.status.set_failed(e)
+                        self._handle_step_failure(step)
+
+                    if self._needs_another_visit(step):
+                        self.execution.dirty.add(step)
+
+                if self.execution.updated:
+                    self._log_progress(execution_type)
+
+                if instrumentation is not None:
+                    wait_started = instrumentation.clock()
+                    instrumentation.scanned(execution_type, len(steps_to_visit), wait_started - pass_started)
+                if self.execution.working_set and not for_validation:
+                    await self._wait_for_changes_async(execution_type)
+                    if instrumentation is not None:
+                        instrumentation.waited(execution_type, instrumentation.clock() - wait_started)
+        finally:
+            for step in self.execution.all_refs:
+                step.status.remove_listener(self._on_status_change)
+            self.execution.unwatch_statuses()
+            if instrumentation is not None:
+                instrumentation.phase(execution_type, instrumentation.clock() - phase_started)
+                instrumentation.detach(self.execution.all_refs)
+
+        self._log_outcome(execution_type)
+
+    async def _wait_for_changes_async(self, execution_type):
+        self._wakeup.clear()
+        self.execution.collect_events()
+        if self.execution.dirty:
+            return
+
+        if any(step.polls_status for step in self.execution.working_set):
+            if self.scan_interval <= 0:
+                await asyncio.sleep(0)
+                return
+            self.log(execution_type).debug("Waiting up to {!s} seconds for status changes".format(self.scan_interval))
+            timeout = self.scan_interval
+        else:
+            timeout = None
+
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _validate_step_async(self, step):
+        if not isinstance(step, AsyncStep):
+            await self._loop.run_in_executor(None, self._validate_step, step)
+            return
+
+        if step.status.pending:
+            if self.instrumentation is not None:
+                self.instrumentation.validating(step)
+            try:
+                await step.validate()
+                if step.status.pending:
+                    step.status.set_validated()
+            except Exception as e:
+                step.status.set_failed(e)
+
+        if step.status.failed:
+            raise step.status.stage
+
+    async def _execute_step_async(self, step):
+        if isinstance(step, AsyncStep):
+            instrumentation = self.instrumentation
+            if instrumentation is None:
+                await step.status.check_async()
+            else:
+                check_started = instrumentation.clock()
+                await step.status.check_async()
+                instrumentation.checked(step, instrumentation.clock() - check_started)
+        else:
+            self._check_step(step)
+
+        if step.status.pending and not self.execution.aborted:
+            try:
+                await self._validate_step_async(step)
+            except Exception as e:
+                step.status.set_failed(e)
+                raise
+        else:
+            self._advance_step(step)
+
+    def _runs_on_workers(self, step):
+        if self._worker_pool is not None:
+            return super(AsyncExecutor, self)._runs_on_workers(step)
+        # Without a worker pool, synchronous steps run on the loop's default thread executor
+        step_start = type(step).start
+        return getattr(step_start, '__func__', step_start) is _DEFAULT_START
+
+    def _start_step(self, step):
+        if not isinstance(step, AsyncStep):
+            super(AsyncExecutor, self)._start_step(step)
+            return
+
+        step.status.set_running()
+        task = self._loop.create_task(step.run())
+        task.add_done_callback(functools.partial(self._finish_async_step, step))
+
+    def _finish_async_step(self, step, task):
+        try:
+            exception = task.exception()
+            if exception is not None:
+                step.status.set_failed(exception)
+            elif step.status.running and not step.polls_status:
+                step.status.set_finished()
+        except Exception as e:
+            step.status.set_failed(e)
+
+    def _submit_run(self, step):
+        if self._worker_pool is None or self.pool == self.THREAD_POOL:
+            return self._loop.run_in_executor(self._worker_pool, step.run)
+        return super(AsyncExecutor, self)._submit_run(step)
@@ -0,0 +1,56 @@
+from daisychain.step import Step
+from daisychain.step_status import StepStatus, CheckStatusException
+from abc import abstractmethod
+
+
+class AsyncStepStatus(StepStatus):
+    """
+    Status for an AsyncStep, whose callback is a coroutine function
+    """
+    async def check_async(self):
+        if (self.pending or self.validated or self.running) and self.callback is not None:
+            if self.step is not None:
+                self.step.log('status.check').debug("Checking status")
+            try:
+                await self.callback()
+            except Exception as e:
+                self.set_failed(CheckStatusException(self, self.stage, e))
+
+
+class AsyncStep(Step):
+    """
+    Superclass for steps whose 'run', 'check_status' and 'validate' methods are coroutines.  These can only be run by
+    an AsyncExecutor, which awaits them on its event loop instead of tying up a thread for each step.  Requires
+    Python 3.5+.
+
+    Like a ThreadedStep, a step that is still running once 'run' returns is marked finished, unless the step
+    overrides 'check_status' to decide that itself.
+    """
+
+    def __init__(self, status=None, **fields):
+        if status is None:
+            status = AsyncStepStatus()
+        super(AsyncStep, self).__init__(status=status, **fields)
+
+    @property
+    def polls_status(self):
+        callback = self.status.callback
+        return callback is not None and getattr(callback, '__func__', None) is not AsyncStep.check_status
+
+    async def check_status(self):
+        """
+        Check and set the status of the step.
+        """
+        pass
+
+    async def validate(self):
+        self.status.set_validated()
+
+    def start(self):
+        raise TypeError("{!r} is an AsyncStep and can only be run by an AsyncExecutor".format(self))
+
+    @abstractmethod
+    async def run(self):
+        """
+        This should throw an exception if it cannot run or fails
+        """
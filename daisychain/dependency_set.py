@@ -0,0 +1,107 @@
+try:
+    from collections.abc import MutableSet
+except ImportError:
+    from collections import MutableSet
+
+
+class DependencySet(MutableSet):
+    """
+    Set of the dependencies of a step.  Most steps only have a handful of dependencies, which are kept in a tuple that
+    takes a fraction of the memory of a set.  Past SMALL_SIZE dependencies, they move to a set so that membership and
+    updates stay constant-time.
+
+    Besides the operators of MutableSet, it has the named methods of the builtin set, which like theirs take any
+    iterables
+    """
+    __slots__ = ('_items',)
+
+    SMALL_SIZE = 8
+
+    def __init__(self, iterable=()):
+        items = set(iterable)
+        if len(items) <= self.SMALL_SIZE:
+            items = tuple(items)
+        self._items = items
+
+    def __contains__(self, value):
+        return value in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, list(self._items))
+
+    def __reduce__(self):
+        return (self.__class__, (list(self._items),))
+
+    def add(self, value):
+        items = self._items
+        if isinstance(items, tuple):
+            if value in items:
+                return
+            if len(items) < self.SMALL_SIZE:
+                self._items = items + (value,)
+                return
+            items = self._items = set(items)
+        items.add(value)
+
+    def discard(self, value):
+        items = self._items
+        if isinstance(items, tuple):
+            if value in items:
+                self._items = tuple(item for item in items if item != value)
+        else:
+            items.discard(value)
+
+    def update(self, *iterables):
+        for iterable in iterables:
+            for value in iterable:
+                self.add(value)
+
+    def difference_update(self, *iterables):
+        for iterable in iterables:
+            for value in iterable:
+                self.discard(value)
+
+    def intersection_update(self, *iterables):
+        self._items = self.intersection(*iterables)._items
+
+    def symmetric_difference_update(self, iterable):
+        for value in set(iterable):
+            if value in self:
+                self.discard(value)
+            else:
+                self.add(value)
+
+    def copy(self):
+        return self.__class__(self._items)
+
+    def union(self, *iterables):
+        union = self.copy()
+        union.update(*iterables)
+        return union
+
+    def intersection(self, *iterables):
+        items = set(self._items)
+        items.intersection_update(*iterables)
+        return self.__class__(items)
+
+    def difference(self, *iterables):
+        items = set(self._items)
+        items.difference_update(*iterables)
+        return self.__class__(items)
+
+    def symmetric_difference(self, iterable):
+        difference = self.copy()
+        difference.symmetric_difference_update(iterable)
+        return difference
+
+    def issubset(self, iterable):
+        return self <= frozenset(iterable)
+
+    def issuperset(self, iterable):
+        return all(value in self for value in iterable)
@@ -0,0 +1,180 @@
+from daisychain.step_status import StepStatus
+from abc import ABCMeta, abstractmethod
+from collections import defaultdict, deque
+from py3compat import with_metaclass
+from threading import Lock
+import sqlite3
+import time
+
+
+def step_key(step):
+    """
+    Identifies a step across runs of the same plan by its class and name
+    """
+    return '{0.__class__.__module__}.{0.__class__.__name__}:{0.name}'.format(step)
+
+
+class DurationStore(with_metaclass(ABCMeta, object)):
+    """
+    Local history of how long steps took, keyed by 'step_key'.  Subclasses persist the records; 'estimate' averages
+    the most recent 'history' durations of a step
+    """
+
+    def __init__(self, history=5):
+        self.history = history
+        self._durations = None
+
+    @abstractmethod
+    def load(self):
+        """
+        Returns every stored record as (key, started, finished) tuples, oldest first
+        """
+
+    @abstractmethod
+    def save(self, records):
+        """
+        Persists new (key, started, finished) records
+        """
+
+    def record(self, records):
+        records = list(records)
+        if not records:
+            return
+        self.save(records)
+        if self._durations is not None:
+            for key, started, finished in records:
+                self._durations[key].append(finished - started)
+
+    def durations(self):
+        if self._durations is None:
+            self._durations = defaultdict(lambda: deque(maxlen=self.history))
+            for key, started, finished in self.load():
+                self._durations[key].append(finished - started)
+        return self._durations
+
+    def estimate(self, step):
+        """
+        Expected duration of a step in seconds, or None if it never finished before
+        """
+        durations = self.durations().get(step_key(step))
+        if not durations:
+            return None
+        return sum(durations) / float(len(durations))
+
+
+class SqliteDurationStore(DurationStore):
+    """
+    Keeps durations in a SQLite database at 'path'
+    """
+
+    def __init__(self, path, history=5):
+        super(SqliteDurationStore, self).__init__(history=history)
+        self.path = path
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("CREATE TABLE IF NOT EXISTS step_durations (step_key TEXT NOT NULL, started REAL NOT NULL, finished REAL NOT NULL)")
+        finally:
+            connection.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def load(self):
+        connection = self._connect()
+        try:
+            return connection.execute("SELECT step_key, started, finished FROM step_durations ORDER BY rowid").fetchall()
+        finally:
+            connection.close()
+
+    def save(self, records):
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany("INSERT INTO step_durations (step_key, started, finished) VALUES (?, ?, ?)", records)
+        finally:
+            connection.close()
+
+
+class FileDurationStore(DurationStore):
+    """
+    Keeps durations in an append-only, tab-separated file at 'path'
+    """
+
+    def __init__(self, path, history=5):
+        super(FileDurationStore, self).__init__(history=history)
+        self.path = path
+
+    def load(self):
+        records = []
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    pieces = line.rstrip('\n').rsplit('\t', 2)
+                    if len(pieces) == 3:
+                        records.append((pieces[0], float(pieces[1]), float(pieces[2])))
+        except IOError:
+            pass
+        return records
+
+    def save(self, records):
+        with open(self.path, 'a') as f:
+            for key, started, finished in records:
+                f.write('{}\t{!r}\t{!r}\n'.format(key, started, finished))
+
+
+def open_duration_store(path, history=5):
+    """
+    Opens a SqliteDurationStore for paths ending in '.db' or '.sqlite', and a FileDurationStore otherwise
+    """
+    if path.endswith(('.db', '.sqlite', '.sqlite3')):
+        return SqliteDurationStore(path, history=history)
+    return FileDurationStore(path, history=history)
+
+
+class DurationRecorder(object):
+    """
+    StepStatus listener that times the steps of an execution from the moment they are set running until they are
+    set finished
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.started = dict()
+        self.records = []
+        self._lock = Lock()
+
+    def __call__(self, status, stage):
+        step = status.step
+        if step is None:
+            return
+        with self._lock:
+            if stage == StepStatus.RUNNING:
+                self.started.setdefault(step, self.clock())
+            elif stage == StepStatus.FINISHED and step in self.started:
+                self.records.append((step, self.started.pop(step), self.clock()))
+            elif stage not in StepStatus.NOT_FAILED:
+                self.started.pop(step, None)
+
+    def attach(self, steps):
+        for step in steps:
+            step.status.add_listener(self)
+
+    def detach(self, steps):
+        for step in steps:
+            step.status.remove_listener(self)
+
+    def elapsed(self, step):
+        with self._lock:
+            started = self.started.get(step)
+        if started is None:
+            return None
+        return self.clock() - started
+
+    def take_records(self):
+        """
+        Returns the steps timed since the last call as (step, started, finished) tuples
+        """
+        with self._lock:
+            records, self.records = self.records, []
+        return records
@@ -1,48 +1,196 @@
 from daisychain.step import Step
-from daisychain.step_status import CheckStatusException
+from daisychain.step_status import StepStatus, CheckStatusException
 from daisychain.steps.input import ConsoleInput
 from daisychain.log import get_logger
-from daisychain.reference import ReferenceList, ReferencingObject
+from daisychain.reference import Reference, ReferenceList, ReferencingObject
+from daisychain.plan_graph import PlanGraph
+from daisychain.reachability import ReachabilityIndex
+from daisychain.step_table import StepTable, StepView, AllStepsView, ExecutionSnapshot
+from daisychain.result_cache import result_key
+from daisychain.duration_store import DurationRecorder, step_key
+from daisychain.ready_policy import ReadyPolicy, FifoPolicy, PriorityPolicy, CriticalPathPolicy
+from threading import Lock
+import copy
+import functools
+import itertools
 import time
 
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
+
+_DEFAULT_START = getattr(Step.start, '__func__', Step.start)
+
 
 class ExecutorAborted(Exception):
     pass
 
 
+def _detached_copy(step, with_references=True):
+    """
+    A shallow copy of a step to send to a worker process.  The steps it refers to are replaced by copies of them
+    without references of their own, so that the worker gets the state of the step and of the steps it reads from,
+    like the 'input_step' of a pipe, rather than the whole graph upstream of it
+    """
+    detached = object.__new__(type(step))
+    state = step.__getstate__()
+    for attr, field in step.__fields__.items():
+        if not isinstance(field, Reference):
+            continue
+        value = state.get(attr)
+        if isinstance(field, ReferenceList):
+            state[attr] = [_detached_reference(element) for element in value] if with_references and value is not None else []
+        else:
+            state[attr] = _detached_reference(value) if with_references else None
+    status = copy.copy(step.status)
+    status.step = detached
+    state['status'] = status
+    detached.__dict__.update(state)
+    return detached
+
+
+def _detached_reference(value):
+    if isinstance(value, Step):
+        return _detached_copy(value, with_references=False)
+    return value
+
+
+def _run_step_in_process(step):
+    """
+    Runs a step on a copy of it inside of a worker process, returning the stage it ended in and the attributes that
+    'run' could have set, leaving out its references since those are copies as well
+    """
+    step.run()
+    skipped_attributes = {'status', 'executor', '__fields__'}
+    skipped_attributes.update(attr for attr, field in step.__fields__.items() if isinstance(field, Reference))
+    attributes = dict((attr, value) for attr, value in step.__dict__.items() if attr not in skipped_attributes)
+    return step.status.stage, attributes
+
+
+def _run_validation(step):
+    """
+    Runs the validation of a step on a worker thread, returning the exception it raised, if any, so that it can be
+    shared by every step with the same validation key
+    """
+    try:
+        step.validate()
+    except Exception as e:
+        return e
+    return None
+
+
 class Execution(object):
     """
-    Data structure for holding status of an execution
+    Data structure for holding status of an execution.  The working set, the finished and failed steps and all of the
+    steps are views over a StepTable of codes indexed by node ID
     """
     def __init__(self, executor=None):
-        self.working_set = set()
-        self.failed_steps = set()
-        self.finished_steps = set()
-        self.consumer_dict = {}
-        self.all_refs = set()
+        self.plan_graph = None
+        self.remaining_dependencies = {}
         self.aborted = False
         self.updated = False
         self.executor = executor
+        self.events = queue.Queue()
+        self.dirty = set()
+        self.ready_sequence = dict()
+        self._ready_counter = itertools.count()
         if executor is not None:
-            self.working_set, self.consumer_dict, self.all_refs = executor._get_reverse_mapping(for_execution=True, include_self=False)
-            for step in self.all_refs:
+            if executor.plan_graph is None:
+                executor.compile_plan()
+            self.plan_graph = graph = executor.plan_graph
+        self.table = table = StepTable(self.plan_graph)
+        self.working_set = StepView(table, StepTable.WORKING)
+        self.finished_steps = StepView(table, StepTable.FINISHED)
+        self.failed_steps = StepView(table, StepTable.FAILED)
+        self.all_refs = AllStepsView(table)
+        if self.plan_graph is not None:
+            for node_id in graph.execution_order:
+                step = graph.nodes[node_id]
                 step.executor = executor
                 step.root_log_id = executor.root_log_id
+                self.remaining_dependencies[step] = len(graph.reduced_execution_producers[node_id])
+                if not graph.reduced_execution_producers[node_id]:
+                    table.move(node_id, StepTable.WORKING)
+                    self.ready_sequence[step] = next(self._ready_counter)
+                else:
+                    table.move(node_id, StepTable.WAITING)
+        self.dirty.update(self.working_set)
+
+    def snapshot(self):
+        """
+        Read-only copy of where the steps of the execution stand, to hand to monitors and reporters
+        """
+        return ExecutionSnapshot(self.table.snapshot(), self.aborted)
+
+    def on_status_change(self, status, stage):
+        """
+        StepStatus listener that queues the step whose stage changed so that an event-driven executor can visit it
+        """
+        self.events.put(status.step)
+
+    def watch_statuses(self):
+        for step in self.all_refs:
+            step.status.add_listener(self.on_status_change)
+
+    def unwatch_statuses(self):
+        for step in self.all_refs:
+            step.status.remove_listener(self.on_status_change)
+
+    def collect_events(self, timeout=None):
+        """
+        Moves queued status events into the dirty set.  If 'timeout' is not None and there is nothing dirty, blocks
+        for up to 'timeout' seconds waiting for the first event
+        """
+        if timeout is not None and not self.dirty:
+            try:
+                self.dirty.add(self.events.get(timeout=timeout))
+            except queue.Empty:
+                return
+        while True:
+            try:
+                self.dirty.add(self.events.get_nowait())
+            except queue.Empty:
+                return
+
+    def take_dirty_steps(self):
+        working_set = self.working_set
+        dirty_steps = set(step for step in self.dirty if step in working_set)
+        self.dirty = set()
+        return dirty_steps
 
     def consider_step_finished(self, step):
-        self.finished_steps.add(step)
-        self.working_set.remove(step)
-        self.updated = True
+        self._leave_working_set(step, StepTable.FINISHED)
 
     def consider_step_failed(self, step):
-        self.failed_steps.add(step)
-        self.working_set.remove(step)
+        self._leave_working_set(step, StepTable.FAILED)
+
+    def _leave_working_set(self, step, code):
+        node_id = self.table.node_id(step)
+        if node_id is None or self.table.codes[node_id] != StepTable.WORKING:
+            raise KeyError(step)
+        self.table.move(node_id, code)
         self.updated = True
 
     def add_consumers_to_working_set(self, step):
-        for consumer in self.consumer_dict.get(step, set()):
-            if len(consumer.get_references(for_execution=True) - self.finished_steps) == 0:
-                self.working_set.add(consumer)
+        """
+        Counts 'step' as finished for each of its consumers, adding the consumers that have no unfinished
+        dependencies left to the working set
+        """
+        if self.plan_graph is None:
+            return
+        for consumer_id in self.plan_graph.reduced_execution_consumers[self.plan_graph.node_ids[step]]:
+            consumer = self.plan_graph.nodes[consumer_id]
+            self.remaining_dependencies[consumer] -= 1
+            if self.remaining_dependencies[consumer] == 0:
+                self.table.move(consumer_id, StepTable.WORKING)
+                self.ready_sequence[consumer] = next(self._ready_counter)
+                self.dirty.add(consumer)
                 self.updated = True
 
 
@@ -52,9 +200,28 @@ class Executor(ReferencingObject):
     PROMPT = 'prompt'
     RAISE = 'raise'
 
+    POLL = 'poll'
+    EVENT = 'event'
+
+    THREAD_POOL = 'thread'
+    PROCESS_POOL = 'process'
+
+    ARBITRARY = 'arbitrary'
+    FIFO = 'fifo'
+    PRIORITY = 'priority'
+    CRITICAL_PATH = 'critical-path'
+    READY_POLICIES = {
+        FIFO: FifoPolicy,
+        PRIORITY: PriorityPolicy,
+        CRITICAL_PATH: CriticalPathPolicy,
+    }
+
+    # Upper bound on a single blocking wait for status events so the event-driven loop stays interruptible
+    EVENT_WAIT_SECONDS = 1.0
+
     dependencies = ReferenceList(elements_of=Step, optional=True)
 
-    def __init__(self, on_failure=RAISE, user_input_class=ConsoleInput, execution=None, scan_interval=0.0, dry_run=False, **fields):
+    def __init__(self, on_failure=RAISE, user_input_class=ConsoleInput, execution=None, scan_interval=0.0, dry_run=False, scheduler=POLL, max_workers=None, pool=THREAD_POOL, validation_workers=None, ready_policy=ARBITRARY, duration_store=None, slow_step_report=0, journal=None, resume=False, result_cache=None, since=None, instrumentation=None, **fields):
         super(Executor, self).__init__(**fields)
         self.dependencies = set(self.dependencies)
 
@@ -62,11 +229,86 @@ class Executor(ReferencingObject):
         if on_failure not in (self.GRACEFUL_SHUTDOWN, self.SKIP, self.PROMPT, self.RAISE):
             raise ValueError("on_failure must be one of Executor.SKIP, Executor.RAISE, Executor.PROMPT, Executor.GRACEFUL_SHUTDOWN")
 
+        if scheduler not in (self.POLL, self.EVENT):
+            raise ValueError("scheduler must be one of Executor.POLL, Executor.EVENT")
+
+        if pool not in (self.THREAD_POOL, self.PROCESS_POOL):
+            raise ValueError("pool must be one of Executor.THREAD_POOL, Executor.PROCESS_POOL")
+
+        if ready_policy in self.READY_POLICIES:
+            ready_policy = self.READY_POLICIES[ready_policy]()
+        elif ready_policy == self.ARBITRARY:
+            ready_policy = None
+        elif not isinstance(ready_policy, ReadyPolicy):
+            raise ValueError("ready_policy must be a ReadyPolicy or one of Executor.ARBITRARY, Executor.FIFO, Executor.PRIORITY, Executor.CRITICAL_PATH")
+
+        for workers_field, workers in (('max_workers', max_workers), ('validation_workers', validation_workers)):
+            if workers is not None:
+                if workers < 1:
+                    raise ValueError("{} must be at least 1".format(workers_field))
+                if futures is None:
+                    raise ValueError("{} requires concurrent.futures, which on Python 2 is provided by the 'futures' package".format(workers_field))
+
         self.on_failure = on_failure
+        self.scheduler = scheduler
         self.user_input_class = user_input_class
         self.execution = execution
         self.scan_interval = scan_interval
         self.dry_run = dry_run
+        self.plan_graph = None
+        self.max_workers = max_workers
+        self.pool = pool
+        self._worker_pool = None
+        self._pooled_steps = set()
+        self._pooled_steps_lock = Lock()
+        self._waiting_for_worker = set()
+        self.validation_workers = validation_workers
+        self.ready_policy = ready_policy
+        self.duration_store = duration_store
+        self.slow_step_report = slow_step_report
+        self.step_durations = []
+        self._duration_recorder = None
+        self._estimates = None
+        self._remaining_paths = None
+        self.journal = journal
+        self.resume = resume
+        self.result_cache = result_cache
+        self.since = since
+        self.instrumentation = instrumentation
+        self._reachability = None
+        self._results_to_cache = set()
+        if resume and journal is None:
+            raise ValueError("resume requires a journal to resume from")
+        if resume and since is not None:
+            raise ValueError("resume and since cannot be combined")
+        self._validation_pool = None
+        self._validations = dict()
+        self._shared_validations = dict()
+
+    def compile_plan(self):
+        """
+        Walks the dependencies of the executor once, keeping the resulting PlanGraph for the executions that follow
+        """
+        self.release_reachability()
+        self.plan_graph = PlanGraph(self, include_root=False)
+        return self.plan_graph
+
+    def reachability(self):
+        """
+        ReachabilityIndex of the plan, built the first time it is needed, which keeps track of the failed steps until
+        'release_reachability'
+        """
+        if self._reachability is None:
+            if self.plan_graph is None:
+                self.compile_plan()
+            self._reachability = ReachabilityIndex(self.plan_graph)
+            self._reachability.attach()
+        return self._reachability
+
+    def release_reachability(self):
+        if self._reachability is not None:
+            self._reachability.detach()
+            self._reachability = None
 
     def log(self, stream=None):
         stream_pieces = [r for r in [self.root_log_id, stream] if r is not None]
@@ -95,11 +337,19 @@ class Executor(ReferencingObject):
         Runs a validation execution which, if 'self.dry_run' is not set, will be followed by a full execution
         """
 
+        self.compile_plan()
         if self.execution is None:
             self.execution = Execution(executor=self)
+        self._restore_from_journal()
+        self._skip_clean_steps()
+        self._check_deferred_fields()
 
         self.log().info("Validating plan...")
-        self._run_execution(for_validation=True)
+        self._start_validation_pool()
+        try:
+            self._run_execution(for_validation=True)
+        finally:
+            self._shutdown_validation_pool()
         if self.execution.aborted:
             self.log().error("Plan failed to validate.")
         else:
@@ -109,36 +359,284 @@ class Executor(ReferencingObject):
             else:
                 self.log().info("Beginning execution...")
                 self.execution = Execution(executor=self)
-                self._run_execution()
-
+                self._start_worker_pool()
+                self._start_timing()
+                self._start_journal()
+                try:
+                    self._run_execution()
+                finally:
+                    self._stop_journal()
+                    self._stop_timing()
+                    self._shutdown_worker_pool()
+
+        self.release_reachability()
         return self.execution
 
+    def _restore_from_journal(self):
+        """
+        When resuming, sets finished the steps that the journal recorded as finished in an earlier execution
+        """
+        if not self.resume:
+            return
+        restored = self.journal.restore(self.plan_graph)
+        self.log().info("Resuming from {}: {} steps already finished".format(self.journal.path, len(restored)))
+
+    def _skip_clean_steps(self):
+        """
+        With 'since', sets finished every step that does not have to run again since the journaled execution, so that
+        only the steps that changed and everything downstream of them run
+        """
+        if self.since is None:
+            return
+        dirty_steps = self.since.dirty_steps(self.plan_graph)
+        for node_id in self.plan_graph.execution_order:
+            step = self.plan_graph.nodes[node_id]
+            if step not in dirty_steps and not step.status.finished:
+                step.status.set_finished()
+        self.log().info("Rerunning {} of {} steps changed since {}".format(len(dirty_steps), len(self.plan_graph.execution_order), self.since.path))
+
+    def _check_deferred_fields(self):
+        """
+        Checks the fields of the steps that were created under 'deferred_validation' in one pass.  Steps the journal
+        already finished are left out, since they ran with the same configuration before
+        """
+        for node in self.plan_graph.nodes:
+            # References that do not affect the execution order can point at any object, not only ValidatingObjects
+            if getattr(node, '_unchecked_fields', None) is not None and not (isinstance(node, Step) and node.status.finished):
+                node.check_fields()
+
+    def _start_journal(self):
+        if self.journal is not None:
+            self.journal.attach(self.execution.all_refs)
+
+    def _stop_journal(self):
+        if self.journal is not None:
+            self.journal.detach(self.execution.all_refs)
+
+    def _start_timing(self):
+        """
+        Starts timing the steps of the execution if their durations are stored or reported on
+        """
+        self.step_durations = []
+        if self.duration_store is None and not self.slow_step_report:
+            return
+        self._estimates = self.estimate_durations()
+        self._duration_recorder = DurationRecorder()
+        self._duration_recorder.attach(self.execution.all_refs)
+
+    def _stop_timing(self):
+        if self._duration_recorder is None:
+            return
+        self._duration_recorder.detach(self.execution.all_refs)
+        self.step_durations = self._duration_recorder.take_records()
+        self._duration_recorder = None
+        if self.duration_store is not None:
+            try:
+                self.duration_store.record((step_key(step), started, finished) for step, started, finished in self.step_durations)
+            except Exception:
+                self.log('durations').exception("Could not store the durations of this execution")
+        if self.slow_step_report:
+            self._log_slow_steps()
+
+    def estimate_durations(self):
+        """
+        Expected duration of each step of the plan according to the duration store.  Steps without history are
+        expected to take as long as the average step that has some, and nothing is expected without any history at all
+        """
+        if self.duration_store is None:
+            return dict()
+        if self.plan_graph is None:
+            self.compile_plan()
+        steps = [self.plan_graph.nodes[node_id] for node_id in self.plan_graph.execution_order]
+        estimates = dict((step, self.duration_store.estimate(step)) for step in steps)
+        known = [estimate for estimate in estimates.values() if estimate is not None]
+        if not known:
+            return dict()
+        average = sum(known) / float(len(known))
+        return dict((step, average if estimate is None else estimate) for step, estimate in estimates.items())
+
+    def _prepare_remaining_paths(self):
+        """
+        Works out once per execution how long the path from each step to the end of the plan is expected to take,
+        and weighs the steps of its StepTable by their estimates so that the remaining work is kept up to date as they
+        finish.  The node IDs are kept sorted by path length, longest first, with a cursor past the ones that finished
+        """
+        graph = self.execution.plan_graph
+        weights = [0.0] * len(graph.nodes)
+        paths = [0.0] * len(graph.nodes)
+        consumers = graph.reduced_execution_consumers
+        for node_id in reversed(graph.execution_order):
+            weights[node_id] = self._estimates.get(graph.nodes[node_id], 0.0)
+            paths[node_id] = weights[node_id] + max([paths[consumer] for consumer in consumers[node_id]] or [0.0])
+        self.execution.table.set_weights(weights)
+        by_path = sorted(graph.execution_order, key=lambda node_id: paths[node_id], reverse=True)
+        self._remaining_paths = (self.execution, paths, by_path, [0])
+
+    def estimate_remaining_seconds(self):
+        """
+        Estimated seconds until the execution finishes, or None without duration history.  It is the longest remaining
+        path through the unfinished steps, or the remaining work spread over the workers if that is longer
+        """
+        if not self._estimates or self.execution.plan_graph is None:
+            return None
+        if self._remaining_paths is None or self._remaining_paths[0] is not self.execution:
+            self._prepare_remaining_paths()
+        _, paths, by_path, cursor = self._remaining_paths
+        table = self.execution.table
+        codes = table.codes
+        done = (StepTable.FINISHED, StepTable.FAILED)
+        while cursor[0] < len(by_path) and codes[by_path[cursor[0]]] in done:
+            cursor[0] += 1
+
+        # The steps downstream of an unfinished step are unfinished too, so the longest remaining path starts at one
+        # of the unfinished steps with the longest paths.  Only running steps can have less left than their path
+        longest_path = 0.0
+        for node_id in itertools.islice(by_path, cursor[0], None):
+            if paths[node_id] <= longest_path:
+                break
+            if codes[node_id] in done:
+                continue
+            remaining = paths[node_id]
+            elapsed = self._duration_recorder.elapsed(table.node(node_id)) if self._duration_recorder is not None else None
+            if elapsed is not None:
+                remaining -= min(elapsed, table.weights[node_id])
+            longest_path = max(longest_path, remaining)
+
+        if self.max_workers is not None:
+            totals = table.weight_totals
+            total = sum(totals) - totals[StepTable.FINISHED] - totals[StepTable.FAILED]
+            return max(longest_path, total / self.max_workers)
+        return longest_path
+
+    def slow_steps(self, limit=10):
+        """
+        The steps that took longest in the last execution as (step, seconds, expected seconds or None) tuples
+        """
+        estimates = self._estimates or dict()
+        durations = sorted(((step, finished - started) for step, started, finished in self.step_durations), key=lambda duration: duration[1], reverse=True)
+        return [(step, seconds, estimates.get(step)) for step, seconds in durations[:limit]]
+
+    def _log_slow_steps(self):
+        slow_steps = self.slow_steps(limit=self.slow_step_report)
+        if not slow_steps:
+            return
+        log = self.log('durations')
+        log.info("Slowest {} steps:".format(len(slow_steps)))
+        for step, seconds, expected in slow_steps:
+            if expected is None:
+                log.info("  {0.name}: {1:.2f}s".format(step, seconds))
+            else:
+                log.info("  {0.name}: {1:.2f}s (usually {2:.2f}s)".format(step, seconds, expected))
+
     def _validate_step(self, step):
+        """
+        Validates a pending step, returning False if its validation is still in progress on the validation pool
+        """
         if step.status.pending:
-            try:
-                step.validate()
-                if step.status.pending:
+            if self.instrumentation is not None:
+                self.instrumentation.validating(step)
+            if self._validation_pool is not None and not step.validates_interactively:
+                exception = self._pooled_validation_outcome(step)
+                if exception is False:
+                    return False
+                if exception is not None:
+                    step.status.set_failed(exception)
+                elif step.status.pending:
                     step.status.set_validated()
-            except Exception as e:
-                step.status.set_failed(e)
+            else:
+                try:
+                    step.validate()
+                    if step.status.pending:
+                        step.status.set_validated()
+                except Exception as e:
+                    step.status.set_failed(e)
 
         if step.status.failed:
             raise step.status.stage
+        return True
+
+    def _start_validation_pool(self):
+        if self.validation_workers is None:
+            return
+        self._validation_pool = futures.ThreadPoolExecutor(max_workers=self.validation_workers)
+        self._validations = dict()
+        self._shared_validations = dict()
+
+    def _shutdown_validation_pool(self):
+        if self._validation_pool is not None:
+            self._validation_pool.shutdown(wait=not self.execution.aborted)
+            self._validation_pool = None
+            self._validations = dict()
+            self._shared_validations = dict()
+
+    def _pooled_validation_outcome(self, step):
+        """
+        Submits the validation of a step to the validation pool, unless a step with the same validation key already
+        did.  Returns False while the validation is in progress, then the exception it raised or None
+        """
+        future = self._validations.get(step)
+        if future is None:
+            key = step.validation_key()
+            if key is not None:
+                future = self._shared_validations.get(key)
+            if future is None:
+                future = self._validation_pool.submit(_run_validation, step)
+                if key is not None:
+                    self._shared_validations[key] = future
+            else:
+                self.log('validation').debug("Sharing the validation of {0.name} with an identical one".format(step))
+            self._validations[step] = future
+
+        if not future.done():
+            return False
+        del self._validations[step]
+        return future.result()
+
+    def _wait_for_validations(self):
+        """
+        Blocks until at least one validation in progress on the validation pool completes, marking the steps waiting on
+        it for another visit
+        """
+        if not self._validations:
+            return
+        futures.wait(set(self._validations.values()), return_when=futures.FIRST_COMPLETED)
+        self.execution.dirty.update(step for step, future in self._validations.items() if future.done())
+
+    def _consider_step_validated(self, step):
+        self.execution.consider_step_finished(step)
+        if not self.execution.aborted:
+            self.execution.add_consumers_to_working_set(step)
 
     def _execute_step(self, step):
+        self._check_step(step)
+        self._advance_step(step)
+
+    def _check_step(self, step):
         try:
             self.log('execution').debug("Checking status of {0.name}".format(step))
-            step.status.check()
+            instrumentation = self.instrumentation
+            if instrumentation is None:
+                step.status.check()
+            else:
+                check_started = instrumentation.clock()
+                step.status.check()
+                instrumentation.checked(step, instrumentation.clock() - check_started)
             self.log('execution').debug("Status of {0.name}: {0.status.stage}".format(step))
         except Exception as e:
             step.status.set_failed(CheckStatusException(step.status, previous_stage=step.status.stage, exception=e))
             raise step.status.stage
 
+    def _advance_step(self, step):
+        """
+        Acts on the stage of a step that has just been checked: accounting for it if it finished and validating or
+        starting it if it is waiting on the executor
+        """
         if step.status.running:
             # Step is still running so don't interact with it
             return
 
         elif step.status.finished:
+            self._cache_result(step)
             self.execution.consider_step_finished(step)
             if not self.execution.aborted:
                 self.execution.add_consumers_to_working_set(step)
@@ -152,8 +650,8 @@ class Executor(ReferencingObject):
             try:
                 if step.status.pending:
                     self._validate_step(step)
-                else:
-                    step.start()
+                elif not self._restore_cached_result(step):
+                    self._start_step(step)
             except Exception as e:
                 step.status.set_failed(e)
                 raise
@@ -161,6 +659,133 @@ class Executor(ReferencingObject):
         else:
             raise step.status.stage
 
+    def _restore_cached_result(self, step):
+        """
+        For a cacheable step that is about to start, looks up its result key in the result cache.  On a hit, restores
+        the cached output and sets the step finished without running it
+        """
+        if self.result_cache is None or not step.cacheable or step in self._results_to_cache:
+            return False
+        step.result_key = result_key(step)
+        hit, output = self.result_cache.get(step.result_key)
+        if hit:
+            self.log('cache').info("Restoring the output of {0.name} from the result cache".format(step))
+            step.output = output
+            step.status.set_finished()
+            return True
+        self._results_to_cache.add(step)
+        return False
+
+    def _cache_result(self, step):
+        if step not in self._results_to_cache:
+            return
+        self._results_to_cache.discard(step)
+        try:
+            self.result_cache.put(step.result_key, step.output)
+        except Exception:
+            self.log('cache').exception("Could not cache the output of {0.name}".format(step))
+
+    def _start_worker_pool(self):
+        if self.max_workers is None:
+            return
+        if self.pool == self.PROCESS_POOL:
+            self._worker_pool = futures.ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            self._worker_pool = futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        self._pooled_steps = set()
+        self._waiting_for_worker = set()
+
+    def _shutdown_worker_pool(self):
+        if self._worker_pool is not None:
+            # Steps that are still in flight after an abort are left to finish on their own
+            self._worker_pool.shutdown(wait=not self.execution.aborted)
+            self._worker_pool = None
+
+    def _has_free_worker(self):
+        if self.max_workers is None:
+            return True
+        with self._pooled_steps_lock:
+            return len(self._pooled_steps) < self.max_workers
+
+    def _runs_on_workers(self, step):
+        if self._worker_pool is None:
+            return False
+        # A step that polls its status keeps what 'check_status' needs on it, which a worker process would only set on
+        # its own copy of the step, so it is started in this process instead
+        if self.pool == self.PROCESS_POOL and step.polls_status:
+            return False
+        step_start = type(step).start
+        return getattr(step_start, '__func__', step_start) is _DEFAULT_START
+
+    def _submit_run(self, step):
+        if self.pool == self.PROCESS_POOL:
+            return self._worker_pool.submit(_run_step_in_process, _detached_copy(step))
+        return self._worker_pool.submit(step.run)
+
+    def _start_step(self, step):
+        """
+        Starts a validated step.  With a worker pool, the step's 'run' is submitted to the pool unless the step
+        delegates 'start' itself, like a ThreadedStep.  If every worker is busy, the step stays validated until the
+        next time it is visited with a free worker
+        """
+        if not self._runs_on_workers(step):
+            step.start()
+            return
+
+        if not self._has_free_worker():
+            self._waiting_for_worker.add(step)
+            return
+
+        self._waiting_for_worker.discard(step)
+        with self._pooled_steps_lock:
+            self._pooled_steps.add(step)
+        step.status.set_running()
+        future = self._submit_run(step)
+        future.add_done_callback(functools.partial(self._finish_pooled_step, step))
+
+    def _finish_pooled_step(self, step, future):
+        """
+        Sets the status of a step from the result of its 'run' on the worker pool.  A step that is still running once
+        'run' has returned is finished, unless it has a 'check_status' of its own to decide that.  The worker is freed
+        before the status changes, so that a scheduler woken up by the change can start a step that was waiting for it
+        """
+        try:
+            set_status = self._pooled_step_outcome(step, future)
+        except Exception as e:
+            set_status = functools.partial(step.status.set_failed, e)
+        with self._pooled_steps_lock:
+            self._pooled_steps.discard(step)
+        if set_status is not None:
+            set_status()
+        elif self._waiting_for_worker and self.scheduler == self.EVENT:
+            # 'run' changed the status itself while the worker was still taken, so wake the scheduler up again
+            self.execution.events.put(step)
+
+    def _pooled_step_outcome(self, step, future):
+        """
+        The status change that the result of a pooled 'run' calls for, as a callable, or None if there is none
+        """
+        exception = future.exception()
+        if exception is not None:
+            return functools.partial(step.status.set_failed, exception)
+
+        stage = step.status.stage
+        if self.pool == self.PROCESS_POOL:
+            stage, attributes = future.result()
+            step.__dict__.update(attributes)
+            if stage not in StepStatus.NOT_FAILED:
+                return functools.partial(step.status.set_failed, stage)
+            elif stage == StepStatus.PENDING:
+                return step.status.set_pending
+            elif stage == StepStatus.VALIDATED:
+                return step.status.set_validated
+            elif stage == StepStatus.FINISHED:
+                return step.status.set_finished
+
+        if stage == StepStatus.RUNNING and not step.polls_status:
+            return step.status.set_finished
+        return None
+
     def _handle_step_failure(self, step):
         if self.on_failure in (self.RAISE, self.GRACEFUL_SHUTDOWN):
             self.execution.aborted = True
@@ -186,37 +811,137 @@ class Executor(ReferencingObject):
         else:
             execution_type = 'execution'
 
-        while self.execution.working_set:
-            self.execution.updated = False
-            for step in list(self.execution.working_set):
-                with step.status.lock:
-                    try:
-                        if for_validation:
-                            if not self.execution.aborted:
-                                self._validate_step(step)
-                            self.execution.consider_step_finished(step)
-                            if not self.execution.aborted:
-                                self.execution.add_consumers_to_working_set(step)
-                        else:
-                            self._execute_step(step)
-
-                    except Exception as e:
-                        step.status.set_failed(e)
-                        self._handle_step_failure(step)
-
-            if self.execution.updated:
-                self.log(execution_type).info("Step status update: {}/{} finished. {} in-flight. {} failed.".format(len(self.execution.finished_steps),
-                                                                                                  len(self.execution.all_refs),
-                                                                                                  len(self.execution.working_set),
-                                                                                                  len(self.execution.failed_steps)))
-
-            if self.scan_interval > 0 and self.execution.working_set and not for_validation:
-                self.log(execution_type).debug("Sleeping {!s} seconds before next run".format(self.scan_interval))
-                time.sleep(self.scan_interval)
+        event_driven = self.scheduler == self.EVENT
+        if event_driven:
+            self.execution.watch_statuses()
+        if self.ready_policy is not None:
+            self.ready_policy.prepare(self.execution)
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.attach(self.execution.all_refs)
+            phase_started = instrumentation.clock()
+
+        try:
+            while self.execution.working_set:
+                self.execution.updated = False
+                if instrumentation is not None:
+                    pass_started = instrumentation.clock()
+                if event_driven:
+                    steps_to_visit = self._steps_with_changes(for_validation)
+                else:
+                    steps_to_visit = self._order_steps(self.execution.working_set)
+
+                for step in steps_to_visit:
+                    with step.status.lock:
+                        try:
+                            if for_validation:
+                                if self.execution.aborted or self._validate_step(step):
+                                    self._consider_step_validated(step)
+                            else:
+                                self._execute_step(step)
+
+                        except Exception as e:
+                            step.status.set_failed(e)
+                            self._handle_step_failure(step)
+
+                    if event_driven and self._needs_another_visit(step):
+                        self.execution.dirty.add(step)
 
+                if self.execution.updated:
+                    self._log_progress(execution_type)
+
+                if not self.execution.working_set:
+                    continue
+
+                if instrumentation is None:
+                    self._wait_between_passes(execution_type, for_validation, event_driven)
+                else:
+                    wait_started = instrumentation.clock()
+                    instrumentation.scanned(execution_type, len(steps_to_visit), wait_started - pass_started)
+                    self._wait_between_passes(execution_type, for_validation, event_driven)
+                    instrumentation.waited(execution_type, instrumentation.clock() - wait_started)
+        finally:
+            if event_driven:
+                self.execution.unwatch_statuses()
+            if instrumentation is not None:
+                instrumentation.phase(execution_type, instrumentation.clock() - phase_started)
+                instrumentation.detach(self.execution.all_refs)
+
+        self._log_outcome(execution_type)
+
+    def _wait_between_passes(self, execution_type, for_validation, event_driven):
+        if for_validation:
+            self._wait_for_validations()
+        elif event_driven:
+            self._wait_for_changes(execution_type)
+        elif self.scan_interval > 0:
+            self.log(execution_type).debug("Sleeping {!s} seconds before next run".format(self.scan_interval))
+            time.sleep(self.scan_interval)
+
+    def _log_outcome(self, execution_type):
         if self.execution.aborted:
             self.log(execution_type).error("Aborted prematurely")
         elif self.execution.failed_steps:
             self.log(execution_type).info("Finished all steps but some had errors that were skipped.")
         else:
             self.log(execution_type).info("Finished all steps successfully")
+
+    def _log_progress(self, execution_type):
+        message = "Step status update: {}/{} finished. {} in-flight. {} failed.".format(len(self.execution.finished_steps),
+                                                                                     len(self.execution.all_refs),
+                                                                                     len(self.execution.working_set),
+                                                                                     len(self.execution.failed_steps))
+        if execution_type == 'execution':
+            remaining_seconds = self.estimate_remaining_seconds()
+            if remaining_seconds is not None:
+                message += " ETA {:.0f}s.".format(remaining_seconds)
+        self.log(execution_type).info(message)
+
+    def _needs_another_visit(self, step):
+        """
+        Whether a step that was just visited is still waiting on the executor to validate or start it
+        """
+        return step in self.execution.working_set and (step.status.pending or step.status.validated) and step not in self._waiting_for_worker and step not in self._validations
+
+    def _steps_with_changes(self, for_validation):
+        """
+        For the event-driven scheduler, the steps that need a visit this pass: those that were made ready, had a stage
+        transition or are still waiting on the executor, plus any step that can only be observed by polling
+        """
+        self.execution.collect_events()
+        steps_to_visit = self.execution.take_dirty_steps()
+        if self._waiting_for_worker and self._has_free_worker():
+            steps_to_visit.update(self._waiting_for_worker & self.execution.working_set)
+            self._waiting_for_worker = set()
+        if not for_validation:
+            steps_to_visit.update(step for step in self.execution.working_set if step.polls_status)
+        return self._order_steps(steps_to_visit)
+
+    def _order_steps(self, steps):
+        """
+        Orders the steps to visit in a pass according to the ready policy, so that with a limited number of workers
+        the steps that come first are started first
+        """
+        if self.ready_policy is None:
+            return list(steps)
+        return self.ready_policy.order(self.execution, steps)
+
+    def _wait_for_changes(self, execution_type):
+        """
+        Blocks the event-driven scheduler until a status event arrives.  If any in-flight step has to be polled, waits
+        no longer than 'scan_interval' so that it is checked again
+        """
+        if self.execution.dirty:
+            return
+
+        if any(step.polls_status for step in self.execution.working_set):
+            if self.scan_interval > 0:
+                self.log(execution_type).debug("Waiting up to {!s} seconds for status changes".format(self.scan_interval))
+                self.execution.collect_events(timeout=self.scan_interval)
+            else:
+                self.execution.collect_events()
+        else:
+            while not self.execution.dirty:
+                self.execution.collect_events(timeout=self.EVENT_WAIT_SECONDS)
+                if self._waiting_for_worker and self._has_free_worker():
+                    return
@@ -1,17 +1,118 @@
 import inspect
 import copy
-from py3compat import string_types
+from abc import ABCMeta
+import functools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from py3compat import string_types, text_type, with_metaclass
+
+_MISSING = object()
+
+_deferral = threading.local()
+
+
+@contextmanager
+def deferred_validation():
+    """
+    Context manager under which ValidatingObjects created by the current thread skip checking the fields they are
+    given, for configurations that are trusted.  The checks are left for 'check_fields', which an Executor calls before
+    validating its plan
+    """
+    depth = getattr(_deferral, 'depth', 0)
+    _deferral.depth = depth + 1
+    try:
+        yield
+    finally:
+        _deferral.depth = depth
+
+
+def validation_deferred():
+    return getattr(_deferral, 'depth', 0) > 0
+
+# Defaults of these types are never modified in place, so every instance can share them.  type(2 ** 64) is 'long' on
+# Python 2
+_IMMUTABLE_TYPES = frozenset([type(None), bool, int, type(2 ** 64), float, complex, str, bytes, text_type, type])
+
+# Mutable defaults of these types are copied with their constructor, which is enough when their contents are immutable
+_SHALLOW_COPY_TYPES = frozenset([list, dict, set, OrderedDict])
+
+
+def _is_immutable(value):
+    value_type = type(value)
+    if value_type in _IMMUTABLE_TYPES:
+        return True
+    if value_type in (tuple, frozenset):
+        return all(_is_immutable(element) for element in value)
+    return False
+
+
+def _default_factory(default):
+    """
+    Returns a function making a fresh copy of 'default' for each instance, or None if 'default' can be shared by them
+    """
+    if _is_immutable(default):
+        return None
+    default_type = type(default)
+    if default_type in _SHALLOW_COPY_TYPES:
+        if not default:
+            return default_type
+        elements = default.items() if isinstance(default, dict) else [(element, None) for element in default]
+        if all(_is_immutable(key) and _is_immutable(element) for key, element in elements):
+            return functools.partial(default_type, default)
+    return functools.partial(copy.deepcopy, default)
+
+
+def _positional_args(function):
+    if hasattr(inspect, 'getfullargspec'):
+        return inspect.getfullargspec(function).args
+    return inspect.getargspec(function).args
+
+
+def _class_attribute(owner, name):
+    """
+    The attribute 'name' as defined in the class dictionaries of the MRO of 'owner', before any descriptor binding
+    """
+    for klass in inspect.getmro(owner):
+        if name in klass.__dict__:
+            return klass.__dict__[name]
+    return _MISSING
 
 
 class Field(object):
 
-    def __init__(self, instance_of=None, optional=False, validator=None, default=None):
+    def __init__(self, instance_of=None, optional=False, validator=None, default=None, default_factory=None):
         self.instance_of = instance_of
-        if default is not None:
+        if default is not None and default_factory is not None:
+            raise TypeError("A field takes either a default or a default_factory, not both")
+        if default is not None or default_factory is not None:
             optional = True
         self.optional = optional
         self.validator = validator
+        self.default_factory = default_factory
         self.default = default
+        self._compiled_validators = dict()
+
+    @property
+    def default(self):
+        return self._default
+
+    @default.setter
+    def default(self, default):
+        # How to copy the default for each instance is worked out once, when it is set
+        self._default = default
+        self._copy_default = _default_factory(default)
+
+    def new_default(self):
+        """
+        The value of the field for an instance that was not given one: the result of the default_factory if there is
+        one, otherwise the default itself when it is immutable and a copy of it when it is not
+        """
+        if self.default_factory is not None:
+            return self.default_factory()
+        if self._copy_default is None:
+            return self._default
+        return self._copy_default()
 
     def check_value(self, source, attribute_name, value):
         if self.optional and value == self.default:
@@ -22,12 +123,59 @@ class Field(object):
 
         if self.validator is not None:
             try:
-                result = self._get_validator(source, attribute_name, self.validator)(value)
+                result = self._resolve_validator(source, attribute_name, self.validator)(value)
                 if result is not None:
                     assert result, "Result from validating {!r} is not None or evaluates true but {!r}".format(value, result)
             except Exception as e:
                 raise TypeError("{source!r} tried to validate the attribute {attribute_name!r} with the value {value!r} and got an exception {exception!s}".format(source=source, attribute_name=attribute_name, value=value, exception=e))
 
+    def _resolve_validator(self, source, attribute_name, validator):
+        """
+        Returns the validator as a callable taking the value to validate.  How to get there from the validator only
+        depends on the class of 'source', so that is worked out once per class and then reused
+        """
+        key = (type(source), id(validator))
+        cached = self._compiled_validators.get(key)
+        if cached is None or cached[0] != FieldOwnerType.generation:
+            cached = (FieldOwnerType.generation, self._compile_validator(type(source), validator))
+            self._compiled_validators[key] = cached
+
+        compiled = cached[1]
+        if compiled is None:
+            return self._get_validator(source, attribute_name, validator)
+        binds_source, function = compiled
+        if binds_source:
+            return functools.partial(function, source)
+        return function
+
+    def _compile_validator(self, owner, validator):
+        """
+        Resolves a validator for the instances of the class 'owner', the same way '_get_validator' would for each of
+        them.  Returns a pair (binds_source, function), where 'function' takes the instance first if 'binds_source',
+        or None when the validator has to be resolved for every instance
+        """
+        if isinstance(validator, string_types):
+            validator = _class_attribute(owner, validator)
+            if validator is _MISSING:
+                return None
+            if inspect.isfunction(validator):
+                # Looking up an instance method by name on an instance binds it
+                return True, validator
+
+        if isinstance(validator, (classmethod, staticmethod)):
+            validator = validator.__get__(None, owner)
+        elif inspect.ismethoddescriptor(validator):
+            return None
+
+        if not callable(validator):
+            return None
+
+        if inspect.isfunction(validator):
+            args = _positional_args(validator)
+            if len(args) >= 2 and 'self' == args[0]:
+                return True, validator
+        return False, validator
+
     def _get_validator(self, source, attribute_name, validator):
         if isinstance(validator, string_types):
             if not hasattr(source, validator):
@@ -43,8 +191,8 @@ class Field(object):
 
         # Necessary to use instance_methods inside class definitions as validations
         if inspect.isfunction(validator):
-            argspec = inspect.getargspec(validator)
-            if len(argspec.args) >= 2 and 'self' == argspec.args[0]:
+            args = _positional_args(validator)
+            if len(args) >= 2 and 'self' == args[0]:
                 def wrapper(value):
                     return validator(source, value)
                 return wrapper
@@ -53,51 +201,137 @@ class Field(object):
 
 
 class ListField(Field):
-    def __init__(self, elements_of=None, optional=False, validator=None, element_validator=None, default=None):
-        super(ListField, self).__init__(instance_of=list, optional=optional, validator=validator, default=default)
-        if self.optional and self.default is None:
+    def __init__(self, elements_of=None, optional=False, validator=None, element_validator=None, default=None, default_factory=None):
+        super(ListField, self).__init__(instance_of=list, optional=optional, validator=validator, default=default, default_factory=default_factory)
+        if self.optional and self.default is None and self.default_factory is None:
             self.default = list()
         self.elements_of = elements_of
         self.element_validator = element_validator
 
     def check_value(self, source, attribute_name, value):
         super(ListField, self).check_value(source=source, attribute_name=attribute_name, value=value)
+        elements_of = self.elements_of
+        if self.element_validator is None:
+            if elements_of is not None:
+                for element in value:
+                    if not isinstance(element, elements_of):
+                        self._raise_for_element_type(source, attribute_name, element)
+            return
+
+        element_validator = None
         for element in value:
-            if self.elements_of is not None and not isinstance(element, self.elements_of):
-                raise TypeError("{source!r} expects an instantiation argument {attribute_name} which should have elements of {field.elements_of!r} but found {value.__class__!r}".format(field=self, source=source, attribute_name=attribute_name, value=element))
+            if elements_of is not None and not isinstance(element, elements_of):
+                self._raise_for_element_type(source, attribute_name, element)
+
+            try:
+                if element_validator is None:
+                    element_validator = self._resolve_validator(source, attribute_name, self.element_validator)
+                result = element_validator(element)
+                if result is not None:
+                    assert result, "Result from element_validator for {!r} is not None or True but {!r}".format(element, result)
+            except Exception as e:
+                raise TypeError("{source!r} tried to validate the element of the attribute {attribute_name!r} with a value of {value!r} and got an exception {exception!s}".format(source=source, attribute_name=attribute_name, value=value, exception=e))
+
+    def _raise_for_element_type(self, source, attribute_name, element):
+        raise TypeError("{source!r} expects an instantiation argument {attribute_name} which should have elements of {field.elements_of!r} but found {value.__class__!r}".format(field=self, source=source, attribute_name=attribute_name, value=element))
+
+
+def _affects_class_caches(value):
+    """
+    Whether a class attribute with this value can be a field or a validator, which the caches of fields and validators
+    depend on
+    """
+    return isinstance(value, (Field, staticmethod, classmethod)) or callable(value)
+
 
-            if self.element_validator is not None:
-                try:
-                    result = self._get_validator(source, attribute_name, self.element_validator)(element)
-                    if result is not None:
-                        assert result, "Result from element_validator for {!r} is not None or True but {!r}".format(element, result)
-                except Exception as e:
-                    raise TypeError("{source!r} tried to validate the element of the attribute {attribute_name!r} with a value of {value!r} and got an exception {exception!s}".format(source=source, attribute_name=attribute_name, value=value, exception=e))
+class FieldOwnerType(ABCMeta):
+    """
+    Metaclass of ValidatingObject that keeps track of changes to its classes, which can still get fields or validator
+    methods after they are created, so that the fields and validators cached for each class are worked out again when
+    anything may have changed.  Other class attributes, like counters or flags, come and go without invalidating them.
+    It derives from ABCMeta so that ValidatingObjects can also take abstract base classes as mixins
+    """
+    generation = 0
 
+    def __setattr__(cls, name, value):
+        if name == '__bases__' or _affects_class_caches(value) or _affects_class_caches(_class_attribute(cls, name)):
+            FieldOwnerType.generation += 1
+        super(FieldOwnerType, cls).__setattr__(name, value)
 
-class ValidatingObject(object):
+    def __delattr__(cls, name):
+        previous = _class_attribute(cls, name)
+        super(FieldOwnerType, cls).__delattr__(name)
+        # Deleting an attribute can also uncover a field or validator of the same name further up the MRO
+        if _affects_class_caches(previous) or _affects_class_caches(_class_attribute(cls, name)):
+            FieldOwnerType.generation += 1
+
+
+class ValidatingObject(with_metaclass(FieldOwnerType, object)):
+    # Values of the fields given to an object created under 'deferred_validation', until they are checked
+    _unchecked_fields = None
 
     def __init__(self, **fields):
         super(ValidatingObject, self).__init__()
-        self.__fields__ = dict()
-        for field_attr, field in self.__class__._find_fields():
+        # Every instance of a class has the same fields, so they share the class' mapping of them
+        self.__fields__ = self.__class__._field_map()
+        deferred = validation_deferred()
+        if deferred:
+            self._unchecked_fields = dict()
+        for field_attr, field in self.__fields__.items():
             if field_attr not in fields:
                 if not field.optional:
                     raise TypeError("{0!r} requires the keyword-argument {1!r}".format(self.__class__, field_attr))
                 else:
-                    fields[field_attr] = copy.deepcopy(field.default)
+                    fields[field_attr] = field.new_default()
+            elif deferred:
+                self._unchecked_fields[field_attr] = fields[field_attr]
             field_value = fields.pop(field_attr)
-            field.check_value(source=self, attribute_name=field_attr, value=field_value)
+            if not deferred:
+                field.check_value(source=self, attribute_name=field_attr, value=field_value)
 
             setattr(self, field_attr, field_value)
-            self.__fields__[field_attr] = field
 
         if len(fields) > 0:
             raise TypeError("__init__() got an unexpected keyword arguments: {!r}".format(list(fields.keys())))
 
+    def check_fields(self):
+        """
+        Checks the fields this object was given when it was created under 'deferred_validation', as its constructor
+        would have, and raises a TypeError for the first one that is invalid
+        """
+        unchecked_fields = self._unchecked_fields
+        if unchecked_fields is None:
+            return
+        for field_attr, field_value in unchecked_fields.items():
+            self.__fields__[field_attr].check_value(source=self, attribute_name=field_attr, value=field_value)
+        del self._unchecked_fields
+
+    @classmethod
+    def _field_map(cls):
+        """
+        Ordered mapping of the fields of the class, built once per class and shared by its instances.  It must not be
+        modified
+        """
+        cached = cls.__dict__.get('_field_map_cache')
+        if cached is None or cached[0] != FieldOwnerType.generation:
+            cached = (FieldOwnerType.generation, OrderedDict(cls._collect_fields()))
+            type.__setattr__(cls, '_field_map_cache', cached)
+        return cached[1]
+
+    @classmethod
+    def _collect_fields(cls):
+        """
+        Walks the MRO once for the attributes of the class that are Fields, sorted by name like 'dir' sorts them.  An
+        attribute is taken from the first class of the MRO that defines it, as 'getattr' would
+        """
+        attributes = dict()
+        for klass in reversed(cls.__mro__):
+            attributes.update(klass.__dict__)
+        return sorted((attr_name, value) for attr_name, value in attributes.items() if isinstance(value, Field))
+
     @classmethod
     def _find_fields(cls):
-        return ((attr_name,  getattr(cls, attr_name)) for attr_name in dir(cls) if isinstance(getattr(cls, attr_name), Field))
+        return iter(cls._field_map().items())
 
     @classmethod
     def _split_fields(cls, **kwargs):
@@ -1,9 +1,10 @@
 from daisychain.executor import Executor
 from daisychain.step import Step
-from daisychain.field import Field
+from daisychain.field import Field, deferred_validation
 from daisychain.constants import CLASS_KEY
 from daisychain.reference import Reference, ReferenceList
 from daisychain.importer import find_class
+from daisychain.journal import hash_config
 
 ANONYMOUS_SUFFIX = 'reference'
 
@@ -11,9 +12,11 @@ ANONYMOUS_SUFFIX = 'reference'
 class Instantiator(Step):
     """
     Class that takes in a dictionary of <step_name, step_config> and instantiates them in the correct
-    order to satisfy their references
+    order to satisfy their references.  With 'defer_validation', the fields of the steps are only checked by the
+    Executor that runs them, for configurations that are trusted
     """
     config = Field(instance_of=dict)
+    defer_validation = Field(instance_of=bool, optional=True, default=False)
 
     def __init__(self, **fields):
         super(Instantiator, self).__init__(**fields)
@@ -57,6 +60,7 @@ class InstantiationStep(Step):
         if step_class is None:
             raise KeyError("Could not find the class {!r}".format(step_class_name))
 
+        self.step_class_name = step_class_name
         self.step_class = step_class
         self.creator = creator
         self.result_instance = None
@@ -101,6 +105,8 @@ class InstantiationStep(Step):
 
     def run(self):
         self.log('instantiation').info("Instantiating with config {!r}".format(self.step_config))
+        # Only hashed if a journal or result cache asks for it, with the names of the steps it refers to
+        plan_config = dict(self.step_config, **{CLASS_KEY: self.step_class_name})
         for reference_attr, reference in self.step_class._find_fields():
             if isinstance(reference, Reference) and reference_attr in self.step_config:
                 ref_key = self.step_config.pop(reference_attr)
@@ -109,6 +115,11 @@ class InstantiationStep(Step):
                 else:
                     self.step_config[reference_attr] = self.creator.steps[ref_key]
 
-        self.creator.steps[self.name] = self.step_class(**self.step_config)
+        if self.creator.defer_validation:
+            with deferred_validation():
+                self.creator.steps[self.name] = self.step_class(**self.step_config)
+        else:
+            self.creator.steps[self.name] = self.step_class(**self.step_config)
+        self.creator.steps[self.name].plan_config = plan_config
 
         self.status.set_finished()
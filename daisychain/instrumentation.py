@@ -0,0 +1,150 @@
+from daisychain.step_status import StepStatus
+from threading import Lock, current_thread
+import json
+import timeit
+
+
+class Instrumentation(object):
+    """
+    Hooks an Executor calls, when it is given one, to report where the time of an execution goes.  It is also attached
+    to the statuses of the steps as a StepStatus listener to see their transitions.  Every hook does nothing here, so
+    subclasses only override the ones they need.  An executor without instrumentation skips the hooks entirely
+    """
+
+    def __init__(self, clock=timeit.default_timer):
+        self.clock = clock
+
+    def __call__(self, status, stage):
+        step = status.step
+        if step is not None:
+            self.transition(step, stage, self.clock())
+
+    def attach(self, steps):
+        for step in steps:
+            step.status.add_listener(self)
+
+    def detach(self, steps):
+        for step in steps:
+            step.status.remove_listener(self)
+
+    def transition(self, step, stage, timestamp):
+        """
+        'step' moved to 'stage' at 'timestamp', on the thread that is current
+        """
+
+    def validating(self, step):
+        """
+        The executor is about to validate 'step', which can take more than one pass when it is validated on a pool
+        """
+
+    def checked(self, step, seconds):
+        """
+        Checking the status of 'step' took 'seconds'
+        """
+
+    def scanned(self, execution_type, steps, seconds):
+        """
+        One pass of the executor over 'steps' steps of the 'validation' or 'execution' took 'seconds'
+        """
+
+    def waited(self, execution_type, seconds):
+        """
+        The executor waited 'seconds' between two passes, sleeping for 'scan_interval' or waiting for events
+        """
+
+    def phase(self, execution_type, seconds):
+        """
+        The whole 'validation' or 'execution' took 'seconds'
+        """
+
+
+class Timing(object):
+    """
+    Count, total and maximum of a series of durations
+    """
+    __slots__ = ('count', 'total', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def as_dict(self):
+        return {'count': self.count, 'total_seconds': self.total, 'max_seconds': self.maximum,
+                'mean_seconds': self.total / self.count if self.count else 0.0}
+
+
+class InstrumentationCollector(Instrumentation):
+    """
+    Instrumentation that keeps everything it is told in memory, for 'report' or 'write_report' once the execution is
+    over.  Transitions are kept as (step, stage name, seconds since the collector was created, thread name) tuples
+    """
+
+    def __init__(self, clock=timeit.default_timer):
+        super(InstrumentationCollector, self).__init__(clock=clock)
+        self.started = clock()
+        self.transitions = []
+        self.checks = dict()
+        self.scans = dict()
+        self.waits = dict()
+        self.phases = dict()
+        self._lock = Lock()
+
+    def transition(self, step, stage, timestamp):
+        # Failed stages are the exception the step failed with
+        stage_name = stage if stage in StepStatus.NOT_FAILED else 'failed'
+        thread_name = current_thread().name
+        with self._lock:
+            self.transitions.append((step, stage_name, timestamp - self.started, thread_name))
+
+    def checked(self, step, seconds):
+        with self._lock:
+            timing = self.checks.get(step)
+            if timing is None:
+                timing = self.checks[step] = Timing()
+            timing.add(seconds)
+
+    def scanned(self, execution_type, steps, seconds):
+        self.scans.setdefault(execution_type, Timing()).add(seconds)
+
+    def waited(self, execution_type, seconds):
+        self.waits.setdefault(execution_type, Timing()).add(seconds)
+
+    def phase(self, execution_type, seconds):
+        self.phases[execution_type] = self.phases.get(execution_type, 0.0) + seconds
+
+    def report(self):
+        """
+        Everything collected as a dictionary that can be dumped as JSON
+        """
+        with self._lock:
+            transitions = list(self.transitions)
+            checks = dict(self.checks)
+
+        steps = dict()
+        for step, stage_name, timestamp, _ in transitions:
+            steps.setdefault(step.name, {'transitions': [], 'checks': None})['transitions'].append([stage_name, timestamp])
+        all_checks = Timing()
+        for step, timing in checks.items():
+            steps.setdefault(step.name, {'transitions': [], 'checks': None})['checks'] = timing.as_dict()
+            all_checks.count += timing.count
+            all_checks.total += timing.total
+            all_checks.maximum = max(all_checks.maximum, timing.maximum)
+
+        return {
+            'phases': dict((execution_type, {'seconds': seconds}) for execution_type, seconds in self.phases.items()),
+            'scans': dict((execution_type, timing.as_dict()) for execution_type, timing in self.scans.items()),
+            'waits': dict((execution_type, timing.as_dict()) for execution_type, timing in self.waits.items()),
+            'checks': all_checks.as_dict(),
+            'steps': steps,
+        }
+
+    def write_report(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2, sort_keys=True)
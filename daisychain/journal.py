@@ -0,0 +1,179 @@
+from daisychain.reference import Reference, ReferenceList
+from daisychain.step_status import StepStatus
+from threading import Lock
+import hashlib
+import json
+import os
+import time
+
+
+def hash_config(config):
+    """
+    Stable hash of a JSON-like step configuration
+    """
+    encoded = json.dumps(config, sort_keys=True, default=repr, separators=(',', ':'))
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def config_hash(step):
+    """
+    Hash of the configuration a step was created with.  Steps created by an Instantiator carry their plan
+    configuration, which is hashed the first time it is asked for; for other steps it is derived from their class and
+    fields, naming the steps they refer to
+    """
+    step_config_hash = getattr(step, 'config_hash', None)
+    if step_config_hash is not None:
+        return step_config_hash
+    plan_config = getattr(step, 'plan_config', None)
+    if plan_config is not None:
+        step_config_hash = step.config_hash = hash_config(plan_config)
+        return step_config_hash
+
+    config = {'class': '{0.__module__}.{0.__name__}'.format(type(step))}
+    for attr, field in step.__fields__.items():
+        value = getattr(step, attr, None)
+        if isinstance(field, ReferenceList):
+            value = sorted(str(getattr(element, 'name', element)) for element in value)
+        elif isinstance(field, Reference):
+            value = getattr(value, 'name', value)
+        config[attr] = value
+    return hash_config(config)
+
+
+class Journal(object):
+    """
+    Append-only record of the stage transitions of the steps of an execution, keyed by step name and configuration
+    hash, from which an interrupted execution can be resumed.  Records are JSON lines that are flushed and fsync'd in
+    batches: once 'sync_every' records are waiting or 'sync_interval' seconds have passed, and when the journal is
+    closed
+    """
+    STAGES = {StepStatus.RUNNING: 'running', StepStatus.FINISHED: 'finished'}
+    FAILED = 'failed'
+
+    def __init__(self, path, sync_every=100, sync_interval=1.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.time()
+        self._lock = Lock()
+        self._hashes = dict()
+
+    def load(self):
+        """
+        Returns the last journaled (config hash, stage) of every step name
+        """
+        stages = dict()
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A record cut short when the process died
+                        continue
+                    stages[record['step']] = (record['config'], record['stage'])
+        except IOError:
+            pass
+        return stages
+
+    def restore(self, plan_graph):
+        """
+        Sets finished the steps of a PlanGraph that the journal recorded as finished with the same configuration, as
+        long as they are 'restorable' and every step they depend on is finished as well, since anything downstream of
+        a step that runs again has to run again too.  Steps that are not 'restorable', like credentials, run again but
+        do not hold back the steps depending on them unless a step they depend on runs again.  Returns the restored
+        steps
+        """
+        stages = self.load()
+        restored = set()
+        passed_through = set()
+        for node_id in plan_graph.execution_order:
+            step = plan_graph.nodes[node_id]
+            producers_done = all(producer in passed_through or plan_graph.nodes[producer].status.finished for producer in plan_graph.execution_producers[node_id])
+            if not step.restorable:
+                if producers_done:
+                    passed_through.add(node_id)
+                continue
+            if step.name not in stages or not producers_done:
+                continue
+            journaled_hash, stage = stages[step.name]
+            if stage == 'finished' and journaled_hash == config_hash(step) and not step.status.finished:
+                step.status.set_finished()
+                restored.add(step)
+        return restored
+
+    def dirty_steps(self, plan_graph):
+        """
+        Returns the steps of a PlanGraph that have to run again since the journaled execution: those whose
+        configuration changed or that did not finish then, every step that depends on one of them, directly or
+        indirectly, and the steps these depend on that are not 'restorable'
+        """
+        stages = self.load()
+        changed_ids = []
+        for node_id in plan_graph.execution_order:
+            step = plan_graph.nodes[node_id]
+            if stages.get(step.name) != (config_hash(step), 'finished'):
+                changed_ids.append(node_id)
+
+        dirty_ids = set(changed_ids)
+        pending_ids = list(changed_ids)
+        while pending_ids:
+            for consumer in plan_graph.execution_consumers[pending_ids.pop()]:
+                if consumer not in dirty_ids:
+                    dirty_ids.add(consumer)
+                    pending_ids.append(consumer)
+
+        pending_ids = list(dirty_ids)
+        while pending_ids:
+            for producer in plan_graph.execution_producers[pending_ids.pop()]:
+                if producer not in dirty_ids and not plan_graph.nodes[producer].restorable:
+                    dirty_ids.add(producer)
+                    pending_ids.append(producer)
+        return set(plan_graph.nodes[node_id] for node_id in dirty_ids)
+
+    def attach(self, steps):
+        for step in steps:
+            self._hashes[step] = config_hash(step)
+            step.status.add_listener(self)
+
+    def detach(self, steps):
+        for step in steps:
+            step.status.remove_listener(self)
+            self._hashes.pop(step, None)
+        self.close()
+
+    def __call__(self, status, stage):
+        step = status.step
+        if step not in self._hashes:
+            return
+        if stage in self.STAGES:
+            stage_name = self.STAGES[stage]
+        elif stage not in StepStatus.NOT_FAILED:
+            stage_name = self.FAILED
+        else:
+            return
+        self.write({'step': step.name, 'config': self._hashes[step], 'stage': stage_name, 'time': time.time()})
+
+    def write(self, record):
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a')
+            self._file.write(json.dumps(record, sort_keys=True) + '\n')
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every or time.time() - self._last_sync >= self.sync_interval:
+                self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.time()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
@@ -0,0 +1,118 @@
+from daisychain.constants import STEPS_KEY
+import codecs
+import json
+import re
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = ' \t\n\r'
+NUMBER_START = '-0123456789'
+NUMBER_END = re.compile(r'[,\]}\s]')
+
+
+class JsonStreamReader(object):
+    """
+    Reads a JSON document from a file object, or anything else with a 'read' method like an mmap, a chunk at a time.
+    Only the part of the document that was read but not consumed yet is kept in memory, so objects can be walked
+    member by member with 'members' and each value decoded on its own with 'value'
+    """
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = u''
+        self.position = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def _fill(self):
+        """
+        Reads more of the document, at least as much as is buffered so that a value spanning many chunks is only
+        decoded a few times.  Returns False at the end of the document
+        """
+        if self.eof:
+            return False
+        chunk = self.f.read(max(self.chunk_size, len(self.buffer) - self.position))
+        if not chunk:
+            self.eof = True
+        if isinstance(chunk, bytes):
+            chunk = self._text_decoder.decode(chunk, final=self.eof)
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return not self.eof
+
+    def peek(self):
+        """
+        The next character that is not whitespace, without consuming it, or '' at the end of the document
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                return ''
+
+    def expect(self, character):
+        found = self.peek()
+        if found != character:
+            raise ValueError("Expected {!r} but found {!r} in the JSON document".format(character, found or 'the end of it'))
+        self.position += 1
+
+    def value(self):
+        """
+        Decodes the next value of the document
+        """
+        if self.peek() in NUMBER_START:
+            # A number only ends at the first delimiter after it, which may be in a later chunk
+            while NUMBER_END.search(self.buffer, self.position) is None and self._fill():
+                pass
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.position)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+            self.position = end
+            return value
+
+    def members(self):
+        """
+        Yields the keys of the object that comes next in the document.  The value of each key has to be consumed, with
+        'value' or by walking it with 'members', before asking for the next key
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.position += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, type(u'')):
+                raise ValueError("Expected a string key but found {!r} in the JSON document".format(key))
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self.position += 1
+            else:
+                self.expect('}')
+                return
+
+
+def iter_steps(f, top_level=None, chunk_size=CHUNK_SIZE):
+    """
+    Yields the (step_name, step_config) entries of the 'steps' section of a plan read from 'f', one at a time, without
+    ever holding the whole document.  The other top-level sections of the plan, like '__compilers__', are decoded
+    whole into the 'top_level' dictionary when one is given
+    """
+    reader = JsonStreamReader(f, chunk_size=chunk_size)
+    for key in reader.members():
+        if key == STEPS_KEY:
+            for step_name in reader.members():
+                yield step_name, reader.value()
+        else:
+            value = reader.value()
+            if top_level is not None:
+                top_level[key] = value
+    if reader.peek():
+        raise ValueError("Found data after the end of the JSON document")
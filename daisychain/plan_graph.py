@@ -0,0 +1,228 @@
+from daisychain.reference import ReferencingObject, walk_references
+
+
+def transitive_reduction(order, producers):
+    """
+    Transitive reduction of a DAG: for every node, the producers it does not also depend on through another of its
+    producers.  'order' is a topological order of the node IDs, producers first, and 'producers[node_id]' the IDs of
+    the producers of each node.  Returns a dictionary of node ID to the tuple of the producers to keep.
+
+    The ancestors of each node are a bitset over the positions in 'order', as a Python int, and are dropped as soon as
+    every consumer of the node was reduced.  Memory is then bounded by the nodes whose consumers are still to come, not
+    by the square of the graph
+    """
+    position = dict((node_id, i) for i, node_id in enumerate(order))
+    remaining_consumers = dict.fromkeys(order, 0)
+    for node_id in order:
+        for producer_id in producers[node_id]:
+            remaining_consumers[producer_id] += 1
+
+    ancestors = dict()
+    reduced = dict()
+    for node_id in order:
+        # A producer reachable through another producer comes before it in the order, so it is seen after it here
+        node_producers = sorted(set(producers[node_id]), key=position.__getitem__, reverse=True)
+        reachable = 0
+        kept = []
+        for producer_id in node_producers:
+            bit = 1 << position[producer_id]
+            if reachable & bit:
+                continue
+            kept.append(producer_id)
+            reachable |= bit | ancestors[producer_id]
+        reduced[node_id] = tuple(kept)
+
+        if remaining_consumers[node_id]:
+            ancestors[node_id] = reachable
+        for producer_id in node_producers:
+            remaining_consumers[producer_id] -= 1
+            if not remaining_consumers[producer_id]:
+                del ancestors[producer_id]
+    return reduced
+
+
+class PlanGraph(object):
+    """
+    Compiled, read-only snapshot of the reference graph below a root object.
+
+    Every object reachable from the root through any reference gets an integer node ID, which indexes the tuples
+    'producers' (the IDs of the references of each node) and 'consumers' (the IDs of the nodes referring to each
+    node).  'execution_producers' and 'execution_consumers' hold the same for the execution graph, which only
+    contains the ReferencingObjects reachable from the root through references that affect the execution order.
+    'execution_order' is a topological order of the execution graph, producers before consumers.
+
+    param root: Object whose references make up the graph
+    type root: ReferencingObject
+    param include_root: Whether the root is itself a node of the graph.  An Executor is not, since it only groups
+                        the steps it runs
+    type include_root: bool
+    """
+
+    def __init__(self, root, include_root=True):
+        self.root = root
+        self.include_root = include_root
+
+        nodes = []
+        node_ids = dict()
+        producers = []
+        execution_references = []
+
+        def node_id(node):
+            if node not in node_ids:
+                node_ids[node] = len(nodes)
+                nodes.append(node)
+                producers.append(None)
+                execution_references.append(None)
+            return node_ids[node]
+
+        if include_root:
+            self.root_id = node_id(root)
+            execution_roots = [self.root_id]
+        else:
+            self.root_id = None
+            for reference in root.get_references():
+                node_id(reference)
+            execution_roots = [node_ids[reference] for reference in root.get_references(for_execution=True) if isinstance(reference, ReferencingObject)]
+
+        index = 0
+        while index < len(nodes):
+            node = nodes[index]
+            if isinstance(node, ReferencingObject):
+                producers[index] = tuple(node_id(reference) for reference in node.get_references())
+                execution_references[index] = [node_ids[reference] for reference in node.get_references(for_execution=True) if isinstance(reference, ReferencingObject)]
+            else:
+                producers[index] = ()
+                execution_references[index] = []
+            index += 1
+
+        self.nodes = tuple(nodes)
+        self.node_ids = node_ids
+        self.producers = tuple(producers)
+        self.consumers = self._invert(self.producers)
+
+        is_execution_node = [False] * len(nodes)
+        pending_ids = list(execution_roots)
+        for node_index in pending_ids:
+            is_execution_node[node_index] = True
+        while pending_ids:
+            for producer in execution_references[pending_ids.pop()]:
+                if not is_execution_node[producer]:
+                    is_execution_node[producer] = True
+                    pending_ids.append(producer)
+
+        self.is_execution_node = tuple(is_execution_node)
+        self.execution_producers = tuple(tuple(refs) if is_execution_node[i] else () for i, refs in enumerate(execution_references))
+        self.execution_consumers = self._invert(self.execution_producers)
+        self.execution_order = self._topological_order([i for i in range(len(nodes)) if is_execution_node[i]], self.execution_producers, self.execution_consumers, for_execution=True)
+        self._order = None
+        self._reduced_execution_producers = None
+        self._reduced_execution_consumers = None
+
+    @staticmethod
+    def _invert(producers):
+        consumers = [[] for _ in producers]
+        for consumer, node_producers in enumerate(producers):
+            for producer in node_producers:
+                consumers[producer].append(consumer)
+        return tuple(tuple(node_consumers) for node_consumers in consumers)
+
+    def _topological_order(self, node_ids, producers, consumers, for_execution):
+        remaining = dict((i, len(producers[i])) for i in node_ids)
+        order = [i for i in node_ids if remaining[i] == 0]
+        for node_index in order:
+            for consumer in consumers[node_index]:
+                remaining[consumer] -= 1
+                if remaining[consumer] == 0:
+                    order.append(consumer)
+
+        if len(order) < len(node_ids):
+            # Every node left over depends on a cycle, so walking its references will find and describe it
+            unordered = next(i for i in node_ids if remaining[i] > 0)
+            for _ in walk_references(self.nodes[unordered], lambda node: node.get_references(for_execution=for_execution), for_execution=for_execution):
+                pass
+        return tuple(order)
+
+    def order(self, for_execution=True):
+        """
+        Topological order of the node IDs, producers before consumers, of the execution graph or of the whole graph
+        """
+        if for_execution:
+            return self.execution_order
+        if self._order is None:
+            self._order = self._topological_order(range(len(self.nodes)), self.producers, self.consumers, for_execution=False)
+        return self._order
+
+    def generations(self, for_execution=False):
+        """
+        Generator through generations of node IDs, each of which only depends on nodes from earlier generations.
+        Objects that are referred to but are not ReferencingObjects, like a plain value of a Reference, are nodes of
+        the whole graph too, so they come in the first generation and the nodes referring to them after it.  The
+        execution graph only has ReferencingObjects
+        """
+        if for_execution:
+            producers, consumers = self.execution_producers, self.execution_consumers
+        else:
+            producers, consumers = self.producers, self.consumers
+
+        order = self.order(for_execution)
+        remaining = dict((i, len(producers[i])) for i in order)
+        generation = [i for i in order if remaining[i] == 0]
+        while generation:
+            yield generation
+            next_generation = []
+            for node_index in generation:
+                for consumer in consumers[node_index]:
+                    remaining[consumer] -= 1
+                    if remaining[consumer] == 0:
+                        next_generation.append(consumer)
+            generation = next_generation
+
+    @property
+    def reduced_execution_producers(self):
+        """
+        'execution_producers' without the producers that a node also depends on through another of its producers.  A
+        node is ready once its reduced producers are finished just the same, with fewer producers to count down
+        """
+        if self._reduced_execution_producers is None:
+            reduced = transitive_reduction(self.execution_order, self.execution_producers)
+            if all(len(reduced[i]) == len(self.execution_producers[i]) for i in self.execution_order):
+                # Nothing was redundant, so the execution graph is shared rather than copied
+                self._reduced_execution_producers = self.execution_producers
+                self._reduced_execution_consumers = self.execution_consumers
+            else:
+                self._reduced_execution_producers = tuple(reduced.get(i, ()) for i in range(len(self.nodes)))
+        return self._reduced_execution_producers
+
+    @property
+    def reduced_execution_consumers(self):
+        if self._reduced_execution_consumers is None:
+            self._reduced_execution_consumers = self._invert(self.reduced_execution_producers)
+        return self._reduced_execution_consumers
+
+    def ancestors(self, node, for_execution=False):
+        """
+        Every object that 'node' refers to, directly or indirectly
+        """
+        producers = self.execution_producers if for_execution else self.producers
+        seen = set()
+        pending_ids = [self.node_ids[node]]
+        while pending_ids:
+            for producer in producers[pending_ids.pop()]:
+                if producer not in seen:
+                    seen.add(producer)
+                    pending_ids.append(producer)
+        return set(self.nodes[i] for i in seen)
+
+    @property
+    def all_references(self):
+        return set(node for i, node in enumerate(self.nodes) if i != self.root_id or self.consumers[i])
+
+    @property
+    def all_execution_references(self):
+        return set(self.nodes[i] for i in self.execution_order if i != self.root_id)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __repr__(self):
+        return '<{0.__class__.__name__} of {0.root!r}: {1} nodes, {2} in the execution graph>'.format(self, len(self.nodes), len(self.execution_order))
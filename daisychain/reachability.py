@@ -0,0 +1,106 @@
+from daisychain.step_status import StepStatus
+from threading import Lock
+
+
+def mask_ids(mask):
+    """
+    The node IDs set in a bitset, lowest first
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+class ReachabilityIndex(object):
+    """
+    Which steps of the execution graph of a PlanGraph are upstream of which, as one bitset over node IDs per node, in a
+    Python int.  Ancestor bitsets are built once from the reduced execution graph, descendant bitsets the first time
+    they are asked for.
+
+    As a StepStatus listener, the index also keeps a bitset of the steps whose status is failed, so that whether any
+    ancestor of a step failed is a single 'and' of two ints rather than a walk of its dependencies
+    """
+
+    def __init__(self, plan_graph):
+        self.plan_graph = plan_graph
+        self.failed_mask = 0
+        self._lock = Lock()
+        self._descendants = None
+
+        ancestors = [0] * len(plan_graph.nodes)
+        producers = plan_graph.reduced_execution_producers
+        for node_id in plan_graph.execution_order:
+            mask = 0
+            for producer_id in producers[node_id]:
+                mask |= ancestors[producer_id] | (1 << producer_id)
+            ancestors[node_id] = mask
+        self._ancestors = ancestors
+
+    def __call__(self, status, stage):
+        node_id = self.plan_graph.node_ids.get(status.step)
+        if node_id is None:
+            return
+        bit = 1 << node_id
+        with self._lock:
+            if stage in StepStatus.NOT_FAILED:
+                self.failed_mask &= ~bit
+            else:
+                self.failed_mask |= bit
+
+    def attach(self):
+        graph = self.plan_graph
+        with self._lock:
+            for node_id in graph.execution_order:
+                graph.nodes[node_id].status.add_listener(self)
+                if graph.nodes[node_id].status.failed:
+                    self.failed_mask |= 1 << node_id
+
+    def detach(self):
+        graph = self.plan_graph
+        for node_id in graph.execution_order:
+            graph.nodes[node_id].status.remove_listener(self)
+
+    def __contains__(self, node):
+        node_id = self.plan_graph.node_ids.get(node)
+        return node_id is not None and self.plan_graph.is_execution_node[node_id]
+
+    def ancestors_mask(self, node):
+        return self._ancestors[self.plan_graph.node_ids[node]]
+
+    def descendants_mask(self, node):
+        if self._descendants is None:
+            graph = self.plan_graph
+            descendants = [0] * len(graph.nodes)
+            consumers = graph.reduced_execution_consumers
+            for node_id in reversed(graph.execution_order):
+                mask = 0
+                for consumer_id in consumers[node_id]:
+                    mask |= descendants[consumer_id] | (1 << consumer_id)
+                descendants[node_id] = mask
+            self._descendants = descendants
+        return self._descendants[self.plan_graph.node_ids[node]]
+
+    def nodes(self, mask):
+        return set(self.plan_graph.nodes[node_id] for node_id in mask_ids(mask))
+
+    def ancestors(self, node):
+        return self.nodes(self.ancestors_mask(node))
+
+    def descendants(self, node):
+        return self.nodes(self.descendants_mask(node))
+
+    def is_upstream(self, node, of):
+        """
+        Whether 'of' depends on 'node', directly or indirectly
+        """
+        return bool(self.ancestors_mask(of) >> self.plan_graph.node_ids[node] & 1)
+
+    def failed_ancestor(self, node):
+        """
+        An upstream step of 'node' whose status is failed, or None
+        """
+        failed = self.ancestors_mask(node) & self.failed_mask
+        if not failed:
+            return None
+        return self.plan_graph.nodes[next(mask_ids(failed))]
@@ -0,0 +1,72 @@
+from abc import ABCMeta, abstractmethod
+from py3compat import with_metaclass
+
+
+class ReadyPolicy(with_metaclass(ABCMeta, object)):
+    """
+    Decides the order in which an executor visits the steps in its working set, and so which ready steps get a
+    worker first when workers are limited.  Subclasses implement 'key', sorting the steps of an execution from first
+    to last visited
+    """
+
+    def prepare(self, execution):
+        """
+        Called once for every new execution, before any of its steps are visited
+        """
+        pass
+
+    @abstractmethod
+    def key(self, execution, step):
+        """
+        Sort key of a step of the execution, the steps with the lowest keys being visited first
+        """
+
+    def order(self, execution, steps):
+        return sorted(steps, key=lambda step: self.key(execution, step))
+
+
+class FifoPolicy(ReadyPolicy):
+    """
+    Visits steps in the order they became ready
+    """
+
+    def key(self, execution, step):
+        return execution.ready_sequence.get(step, 0)
+
+
+class PriorityPolicy(ReadyPolicy):
+    """
+    Visits steps with a higher 'priority' field first, breaking ties in the order they became ready
+    """
+
+    def key(self, execution, step):
+        return (-step.priority, execution.ready_sequence.get(step, 0))
+
+
+class CriticalPathPolicy(ReadyPolicy):
+    """
+    Visits first the steps with the longest remaining path through the steps that depend on them, weighing each step
+    by its expected duration when the executor has a duration store with history for the plan, and by its 'cost'
+    field otherwise.  Starting the head of a long chain before many short independent steps keeps the chain from
+    being starved of workers
+    """
+
+    def prepare(self, execution):
+        graph = execution.plan_graph
+        self.remaining_path = dict()
+        if graph is None:
+            return
+
+        estimates = dict()
+        if execution.executor is not None:
+            estimates = execution.executor.estimate_durations()
+
+        path_costs = dict()
+        for node_id in reversed(graph.execution_order):
+            step = graph.nodes[node_id]
+            longest_consumer_path = max([path_costs[consumer] for consumer in graph.execution_consumers[node_id]] or [0])
+            path_costs[node_id] = estimates.get(step, step.cost) + longest_consumer_path
+            self.remaining_path[step] = path_costs[node_id]
+
+    def key(self, execution, step):
+        return (-self.remaining_path.get(step, step.cost), execution.ready_sequence.get(step, 0))
@@ -29,10 +29,51 @@ class CircularReferenceError(Exception):
 
 
 class ExceedsMaximumDepthError(RuntimeError):
+    """
+    No longer raised since reference graphs are walked iteratively.  Kept so that existing 'except' clauses still work
+    """
     def __init__(self):
         super(ExceedsMaximumDepthError, self).__init__('Maximum recursion depth ({}) exceeded.  This exists because of the inherent problem of possible segfaults on stack depth.'.format(MAXIMUM_REFERENCE_DEPTH))
 
 
+def walk_references(root, get_references, for_execution=False):
+    """
+    Iterative depth-first walk of the reference graph below 'root', using an explicit stack instead of recursion.
+
+    Yields a tuple of (node, references) for 'root' and every ReferencingObject reachable from it, in post-order, so a
+    node is only yielded once everything it refers to has been yielded.  'get_references(node)' returns the
+    references of a node, of which only the ReferencingObjects are walked.  Raises a CircularReferenceError tracing
+    the cycle through the attribute names of each node in it if one is found.
+    """
+    finished = set()
+    in_progress = {root}
+    stack = [[root, list(get_references(root)), 0]]
+    while stack:
+        frame = stack[-1]
+        node, references, index = frame
+        if index < len(references):
+            frame[2] = index + 1
+            reference = references[index]
+            if not isinstance(reference, ReferencingObject) or reference in finished:
+                continue
+
+            if reference in in_progress:
+                error = CircularReferenceError(reference)
+                for parent_frame in reversed(stack):
+                    if not error.add_reference(parent_frame[0], parent_frame[0]._find_attributes_for_reference(reference, for_execution=for_execution)):
+                        break
+                    reference = parent_frame[0]
+                raise error
+
+            in_progress.add(reference)
+            stack.append([reference, list(get_references(reference)), 0])
+        else:
+            stack.pop()
+            in_progress.remove(node)
+            finished.add(node)
+            yield node, references
+
+
 class Reference(Field):
     """
     Reference object for identifying attributes for an object that reference another part of the release plan
@@ -47,14 +88,14 @@ class Reference(Field):
     type optional: bool
     """
 
-    def __init__(self, instance_of=None, optional=False, validator=None, default=None, affects_execution_order=True):
-        super(Reference, self).__init__(instance_of=instance_of, optional=optional, validator=validator, default=default)
+    def __init__(self, instance_of=None, optional=False, validator=None, default=None, affects_execution_order=True, default_factory=None):
+        super(Reference, self).__init__(instance_of=instance_of, optional=optional, validator=validator, default=default, default_factory=default_factory)
         self.affects_execution_order = affects_execution_order
 
 
 class ReferenceList(ListField, Reference):
-    def __init__(self, elements_of=None, optional=False, validator=None, element_validator=None, affects_execution_order=True):
-        super(ReferenceList, self).__init__(elements_of=elements_of, optional=optional, validator=validator, element_validator=element_validator)
+    def __init__(self, elements_of=None, optional=False, validator=None, element_validator=None, affects_execution_order=True, default_factory=None):
+        super(ReferenceList, self).__init__(elements_of=elements_of, optional=optional, validator=validator, element_validator=element_validator, default_factory=default_factory)
         self.affects_execution_order = affects_execution_order
 
 
@@ -88,91 +129,57 @@ class ReferencingObject(ValidatingObject, SharedLoggingObject):
                     attribute_names.add(k)
         return attribute_names
 
+    def compile_references(self):
+        """
+        Walks the reference graph below this object once, returning it as a PlanGraph
+        """
+        from daisychain.plan_graph import PlanGraph
+        return PlanGraph(self)
+
     @property
     def all_references(self):
-        _, _, all_refs = self._get_reverse_mapping()
-        return all_refs
+        return self.compile_references().all_references
 
     @property
     def all_execution_references(self):
-        _, _, all_refs = self._get_reverse_mapping(for_execution=True)
-        return all_refs
+        return self.compile_references().all_execution_references
 
-    def _get_reverse_mapping(self, parent_nodes=None, previously_seen_cache=None, for_execution=False, include_self=True):
+    def _get_reverse_mapping(self, for_execution=False, include_self=True):
         """
-        Does the bulk of the work for walking the reference tree for all of the references and references for the node
-        Does this recursively doing a depth-first search
+        Does the bulk of the work for walking the reference tree for all of the references and references for the node.
+        Walks the whole graph once with an explicit stack, so the depth of the tree is only bounded by memory.
+        Returns a tuple of (lowest_level_references, reference_consumers, all_references)
         """
-        if parent_nodes is None:
-            parent_nodes = set()
-            previously_seen_cache = dict()
-
-        if self in previously_seen_cache:
-            return previously_seen_cache[self]
-
         reference_consumers = defaultdict(set)
         all_references = set()
         lowest_level_references = set()
 
-        references = self.get_references(for_execution=for_execution)
-
-        if len(references) == 0:
-            if include_self:
-                lowest_level_references.add(self)
-            previously_seen_cache[self] = (lowest_level_references, reference_consumers, all_references)
-            return previously_seen_cache[self]
-
-        elif len(parent_nodes) >= MAXIMUM_REFERENCE_DEPTH:
-            raise ExceedsMaximumDepthError()
-
-        parent_nodes.add(self)
-        for reference in references:
-            if not isinstance(reference, ReferencingObject):
+        for node, references in walk_references(self, lambda n: n.get_references(for_execution=for_execution), for_execution=for_execution):
+            all_references.update(references)
+            if node is self and not include_self:
                 continue
 
-            if reference in parent_nodes:
-                error = CircularReferenceError(reference)
-                error.add_reference(self, self._find_attributes_for_reference(reference, for_execution=for_execution))
-                raise error
-
-            try:
-                ref_ll_references, ref_reference_consumers, ref_all_references = reference._get_reverse_mapping(parent_nodes, previously_seen_cache, for_execution)
-            except CircularReferenceError as e:
-                e.add_reference(self, self._find_attributes_for_reference(reference, for_execution=for_execution))
-                raise e
-
-            all_references.update(ref_all_references)
-            lowest_level_references.update(ref_ll_references)
-            for ref, ref_consumers in ref_reference_consumers.items():
-                reference_consumers[ref].update(ref_consumers)
-
-            if include_self:
-                reference_consumers[reference].add(self)
+            if len(references) == 0:
+                lowest_level_references.add(node)
 
-        parent_nodes.remove(self)
-        all_references.update(references)
+            for reference in references:
+                if isinstance(reference, ReferencingObject):
+                    reference_consumers[reference].add(node)
 
-        previously_seen_cache[self] = (lowest_level_references, reference_consumers, all_references)
-        return previously_seen_cache[self]
+        return lowest_level_references, reference_consumers, all_references
 
     def reference_generations(self, for_execution=False):
         """
         Generator through generations of references, so each yield contains
         steps that can all be run in parallel with one another if the generations
         are run serially.  Useful for manually running nodes or visualization.
+        Referenced objects that are not ReferencingObjects are included, in the
+        first generation, unless only the references that affect the execution
+        order are followed.
         """
-        lowest_level_references, reference_consumers, _ = self._get_reverse_mapping()
-        finished_references = set()
-        while len(lowest_level_references) > 0:
-            yield lowest_level_references
-            finished_references.update(lowest_level_references)
-            new_lowest_level_references = set()
-            for reference in lowest_level_references:
-                for consumer in reference_consumers[reference]:
-                    con_unfinished_refs = consumer.get_references(for_execution=for_execution) - finished_references
-                    if len(con_unfinished_refs) == 0:
-                        new_lowest_level_references.add(consumer)
-            lowest_level_references = new_lowest_level_references
+        graph = self.compile_references()
+        for generation in graph.generations(for_execution=for_execution):
+            yield set(graph.nodes[i] for i in generation)
 
     def __repr__(self):
         return '<{0.__class__.__name__}: {0.name}>'.format(self, )
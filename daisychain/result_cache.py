@@ -0,0 +1,118 @@
+from daisychain.journal import hash_config, config_hash
+from daisychain.reference import Reference, ReferenceList
+from threading import Lock
+import os
+import pickle
+import tempfile
+
+# Fields that only affect how a step is scheduled or logged, not what it outputs
+UNCACHED_FIELDS = {'name', 'priority', 'cost'}
+
+
+def content_key(step):
+    """
+    Content address of what a step produced: its result key if it is cacheable, the hash of its 'output' if it
+    presents one, and its configuration hash otherwise
+    """
+    key = getattr(step, 'result_key', None)
+    if key is not None:
+        return key
+    if hasattr(step, 'output'):
+        return hash_config({'output': step.output})
+    return config_hash(step)
+
+
+def result_key(step):
+    """
+    Key of the output of a cacheable step, made from its class, its non-reference fields, its 'cache_config' and the
+    content keys of the steps it refers to.  Only meaningful once those steps are finished
+    """
+    config = {'class': '{0.__module__}.{0.__name__}'.format(type(step)), 'extra': step.cache_config()}
+    for attr, field in step.__fields__.items():
+        if attr in UNCACHED_FIELDS:
+            continue
+        value = getattr(step, attr, None)
+        if isinstance(field, ReferenceList):
+            value = sorted(content_key(element) for element in value)
+        elif isinstance(field, Reference):
+            value = None if value is None else content_key(value)
+        config[attr] = value
+    return hash_config(config)
+
+
+class ResultCache(object):
+    """
+    On-disk cache of the outputs of cacheable steps, one pickle per result key in 'directory'.  Once the cache holds
+    more than 'max_bytes', the least recently used results are evicted
+    """
+    SUFFIX = '.pickle'
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key):
+        """
+        Returns (True, output) for a cached result and (False, None) otherwise
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                output = pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return False, None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return True, output
+
+    def put(self, key, output):
+        data = pickle.dumps(output, pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            # Written to a temporary file first so a reader never sees a partial result
+            handle, temporary_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(handle, 'wb') as f:
+                f.write(data)
+            os.rename(temporary_path, self._path(key))
+            self._evict()
+
+    def _entries(self):
+        entries = []
+        for filename in os.listdir(self.directory):
+            if filename.endswith(self.SUFFIX):
+                path = os.path.join(self.directory, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            for _, _, path in self._entries():
+                os.remove(path)
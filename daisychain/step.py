@@ -1,5 +1,8 @@
 from daisychain.step_status import StepStatus, CheckStatusException
-from daisychain.reference import ReferencingObject, ReferenceList, MAXIMUM_REFERENCE_DEPTH, ExceedsMaximumDepthError, CircularReferenceError
+from daisychain.field import Field
+from daisychain.dependency_set import DependencySet
+from daisychain.plan_graph import transitive_reduction
+from daisychain.reference import ReferencingObject, ReferenceList, MAXIMUM_REFERENCE_DEPTH, ExceedsMaximumDepthError, CircularReferenceError, walk_references
 from abc import abstractmethod
 
 
@@ -16,6 +19,20 @@ class Step(ReferencingObject):
                           state.  For long running steps, you may want to have it spawn a thread and specify a callback
                           for the 'status' attribute that points to an instance method for updating the status
     """
+    # Hints for the ready policy of an executor: steps with a higher priority are started first with
+    # Executor.PRIORITY and 'cost' is the relative duration of the step along a critical path with Executor.CRITICAL_PATH
+    priority = Field(instance_of=(int, float), optional=True, default=0)
+    cost = Field(instance_of=(int, float), optional=True, default=1)
+
+    # Whether a journaled finished run of this step can stand in for running it again when resuming an execution.
+    # Steps whose results only live in memory, like credentials, have to run again
+    restorable = True
+
+    # Whether the 'output' of this step only depends on its fields and on the steps it refers to, so that an executor
+    # with a result cache can restore it instead of running the step again
+    cacheable = False
+    result_key = None
+
     STATUS_PROMPT = "What would you like to do? (a)bort the plan, mark the step as (f)inished (any step that requires output from this step may have issues), or (r)etry?"
 
     def __init__(self, status=None, **fields):
@@ -27,11 +44,16 @@ class Step(ReferencingObject):
         self.executor = None
 
         super(Step, self).__init__(**fields)
-        self.dependencies = set(self.dependencies)
+        self.dependencies = DependencySet(self.dependencies)
 
     def __repr__(self):
         return "<%s %r>" % (self.__class__.__name__, self.name)
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['executor'] = None
+        return state
+
     @property
     def finished(self):
         return self.status.finished
@@ -52,43 +74,44 @@ class Step(ReferencingObject):
     def validated(self):
         return self.status.validated
 
-    def prune(self, previously_seen_cache=None, parent_nodes=None):
+    @property
+    def validates_interactively(self):
         """
-        Does the bulk of the work for walking the reference tree for all of the references and references for the node
-        Does this recursively doing a depth-first search
+        Whether 'validate' may prompt the user, in which case an executor never runs it alongside other validations
         """
-        if previously_seen_cache is None:
-            parent_nodes = set()
-            previously_seen_cache = dict()
+        return False
 
-        if self in previously_seen_cache:
-            return previously_seen_cache[self]
-
-        if len(self.dependencies) == 0:
-            previously_seen_cache[self] = set()
-        else:
-            if len(parent_nodes) > MAXIMUM_REFERENCE_DEPTH:
-                raise ExceedsMaximumDepthError()
-
-        parent_nodes.add(self)
-        sub_dependencies = set()
-
-        for reference in self.dependencies:
-            if reference in parent_nodes:
-                error = CircularReferenceError(reference)
-                error.add_reference(self, self._find_attributes_for_reference(reference, for_execution=True))
-                raise error
-
-            try:
-                sub_dependencies.update(reference.prune(previously_seen_cache=previously_seen_cache, parent_nodes=parent_nodes))
-            except CircularReferenceError as e:
-                e.add_reference(self, self._find_attributes_for_reference(reference, for_execution=True))
-                raise e
+    @property
+    def polls_status(self):
+        """
+        Whether the stage of this step can only be discovered by calling 'status.check'.  Steps that keep the default
+        no-op 'check_status' as their callback only change stage through explicit transitions, so an event-driven
+        executor never needs to poll them
+        """
+        callback = self.status.callback
+        return callback is not None and getattr(callback, '__func__', None) is not _DEFAULT_CHECK_STATUS
 
-        parent_nodes.remove(self)
-        self.dependencies -= sub_dependencies
-        previously_seen_cache[self] = self.dependencies | sub_dependencies
-        return previously_seen_cache[self]
+    def prune(self):
+        """
+        Removes the dependencies of this step, and of every step it depends on, that are already depended on through
+        another dependency.  Walks the dependency tree iteratively, reduces it with 'transitive_reduction' and returns
+        every step this step depends on
+        """
+        steps = []
+        step_ids = dict()
+        producers = []
+        # Steps come out of the walk after everything they depend on, which is a topological order
+        for step, dependencies in walk_references(self, lambda s: s.dependencies, for_execution=True):
+            step_ids[step] = len(steps)
+            steps.append(step)
+            producers.append([step_ids[dependency] for dependency in dependencies])
+
+        reduced = transitive_reduction(range(len(steps)), producers)
+        for step_id, step in enumerate(steps):
+            if len(reduced[step_id]) < len(producers[step_id]):
+                kept = set(reduced[step_id])
+                step.dependencies -= set(steps[producer_id] for producer_id in producers[step_id] if producer_id not in kept)
+        return set(steps[:-1])
 
     def check_status(self):
         """
@@ -106,6 +129,19 @@ class Step(ReferencingObject):
         """
         self.status.set_validated()
 
+    def cache_config(self):
+        """
+        Configuration, other than fields, that the output of a cacheable step depends on
+        """
+        return None
+
+    def validation_key(self):
+        """
+        Identifies what 'validate' checks.  Steps returning the same key, other than None, validate the same thing, so
+        an executor validating steps in parallel only runs one of their validations and shares its outcome
+        """
+        return None
+
     def start(self):
         """
         This method is to allow delegation of run in the case of Threading or other types of steps
@@ -157,3 +193,4 @@ class Step(ReferencingObject):
                 self.executor.execution.failed_steps.add(self)
 
 Step.dependencies = ReferenceList(elements_of=Step, optional=True)
+_DEFAULT_CHECK_STATUS = getattr(Step.check_status, '__func__', Step.check_status)
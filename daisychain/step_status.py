@@ -1,4 +1,7 @@
-from threading import RLock
+from threading import Lock, RLock
+
+# Guards the lazy creation of the lock of each status
+_LOCK_CREATION_LOCK = Lock()
 
 
 class CheckStatusException(Exception):
@@ -9,80 +12,170 @@ class CheckStatusException(Exception):
         self.previous_stage = previous_stage
 
     def revert(self):
-        self.status_ob.stage = self.previous_stage
+        # Listeners, like the ReachabilityIndex of an executor, have to see the step leave its failed stage
+        status = self.status_ob
+        with status.lock:
+            status.stage = self.previous_stage
+            status._notify(status.stage)
 
 
 class StepStatus(object):
+    """
+    Stage of a step.  The stage and its integer code are kept together in a single tuple that transitions replace
+    whole, so reading them is atomic without taking 'lock'.  The lock only serializes transitions, with their
+    listeners, and compound operations like 'check'.
+
+    Plans can hold hundreds of thousands of statuses, so the core attributes are slots and the lock is only created
+    the first time it is needed.  Attributes that steps add to their status, like the process of a RunCommand, go in
+    an instance dictionary that is also only created when first needed
+    """
+    __slots__ = ('_state', '_lock', 'callback', 'step', 'listeners', '__dict__', '__weakref__')
     PENDING = 'pending'
     RUNNING = 'running'
     VALIDATED = 'validated'
     FINISHED = 'finished'
     NOT_FAILED = {PENDING, RUNNING, VALIDATED, FINISHED}
 
+    PENDING_CODE = 0
+    VALIDATED_CODE = 1
+    RUNNING_CODE = 2
+    FINISHED_CODE = 3
+    FAILED_CODE = 4
+    STAGE_CODES = {PENDING: PENDING_CODE, VALIDATED: VALIDATED_CODE, RUNNING: RUNNING_CODE, FINISHED: FINISHED_CODE}
+
     def __init__(self, stage=PENDING):
         super(StepStatus, self).__init__()
         self.stage = stage
         self.callback = None
-        self.lock = RLock()
+        self._lock = None
         self.step = None
+        self.listeners = None
+
+    @property
+    def lock(self):
+        lock = self._lock
+        if lock is None:
+            with _LOCK_CREATION_LOCK:
+                if self._lock is None:
+                    self._lock = RLock()
+                lock = self._lock
+        return lock
+
+    def add_listener(self, listener):
+        """
+        Registers a callable that is called as 'listener(status, stage)' after every stage transition.  Listeners may be
+        called from whichever thread made the transition, so they should be cheap and thread-safe
+        """
+        with self.lock:
+            if self.listeners is None:
+                self.listeners = []
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with self.lock:
+            if self.listeners is not None and listener in self.listeners:
+                self.listeners.remove(listener)
+                if len(self.listeners) == 0:
+                    self.listeners = None
+
+    def __getstate__(self):
+        # The lock, listeners and callback only make sense in the process that has them
+        state = self.__dict__.copy()
+        state['_state'] = self._state
+        state['step'] = self.step
+        return state
+
+    def __setstate__(self, state):
+        self._lock = None
+        self.listeners = None
+        self.callback = None
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
+    @property
+    def stage(self):
+        """
+        One of the stage constants, or the exception the step failed with
+        """
+        return self._state[1]
+
+    @stage.setter
+    def stage(self, stage):
+        if isinstance(stage, BaseException):
+            code = self.FAILED_CODE
+        else:
+            code = self.STAGE_CODES.get(stage, self.FAILED_CODE)
+        self._state = (code, stage)
+
+    @property
+    def code(self):
+        """
+        Integer code of the stage, with every failure sharing FAILED_CODE
+        """
+        return self._state[0]
+
+    def _notify(self, stage):
+        if self.listeners is not None:
+            for listener in list(self.listeners):
+                listener(self, stage)
 
     def set_pending(self):
         with self.lock:
             if self.step is not None:
                 self.step.log('status.pending').info("Set to Pending")
             self.stage = self.PENDING
+            self._notify(self.stage)
 
     def set_validated(self):
         with self.lock:
             if self.step is not None:
                 self.step.log('status.validated').info("Set to Validated")
             self.stage = self.VALIDATED
+            self._notify(self.stage)
 
     def set_running(self):
         with self.lock:
             if self.step is not None:
                 self.step.log('status.running').info("Set to Running")
             self.stage = self.RUNNING
+            self._notify(self.stage)
 
     def set_finished(self):
         with self.lock:
             if self.step is not None:
                 self.step.log('status.finished').info("Set to Finished")
             self.stage = self.FINISHED
+            self._notify(self.stage)
 
     def set_failed(self, exception=None):
         with self.lock:
             if self.step is not None:
                 self.step.log('status.failed').exception("Step failed")
             self.stage = exception
+            self._notify(self.stage)
 
     @property
     def pending(self):
-        with self.lock:
-            return self.stage == self.PENDING
+        return self._state[0] == self.PENDING_CODE
 
     @property
     def running(self):
-        with self.lock:
-            return self.stage == self.RUNNING
+        return self._state[0] == self.RUNNING_CODE
 
     @property
     def validated(self):
-        with self.lock:
-            return self.stage == self.VALIDATED
+        return self._state[0] == self.VALIDATED_CODE
 
     @property
     def finished(self):
-        with self.lock:
-            return self.stage == self.FINISHED
+        return self._state[0] == self.FINISHED_CODE
 
     @property
     def failed(self):
-        with self.lock:
-            return self.stage not in self.NOT_FAILED
+        return self._state[0] == self.FAILED_CODE
 
     def check(self):
-        if (self.pending or self.validated or self.running) and self.callback is not None:
+        if self._state[0] < self.FINISHED_CODE and self.callback is not None:
             with self.lock:
                 if self.step is not None:
                     self.step.log('status.check').debug("Checking status")
@@ -0,0 +1,209 @@
+from array import array
+try:
+    from collections.abc import MutableSet, Set
+except ImportError:
+    from collections import MutableSet, Set
+
+
+class StepTable(object):
+    """
+    Where each step of an execution stands, kept as one code per node of its PlanGraph in a compact array, with the
+    number of steps at each stage maintained as they move so that summaries never walk the steps.  The working set is
+    also kept as a set of node IDs, since the executor visits it on every pass
+
+    Steps that are not part of the graph get node IDs past the end of it the first time they are added.  With
+    'set_weights', the total weight of the steps at each stage is maintained the same way as their number
+    """
+    OUTSIDE = 0
+    WAITING = 1
+    WORKING = 2
+    FINISHED = 3
+    FAILED = 4
+    CODES = (OUTSIDE, WAITING, WORKING, FINISHED, FAILED)
+
+    def __init__(self, plan_graph=None):
+        self._graph_nodes = plan_graph.nodes if plan_graph is not None else ()
+        self._graph_ids = plan_graph.node_ids if plan_graph is not None else dict()
+        self._extra_nodes = []
+        self._extra_ids = dict()
+        self.codes = array('b', [self.OUTSIDE]) * len(self._graph_nodes)
+        self.counts = [0] * len(self.CODES)
+        self.counts[self.OUTSIDE] = len(self._graph_nodes)
+        self.working_ids = set()
+        self.weights = None
+        self.weight_totals = None
+
+    def set_weights(self, weights):
+        """
+        Gives each node of the graph a weight, like its expected duration, and totals them up by code
+        """
+        self.weights = weights
+        self.weight_totals = [0.0] * len(self.CODES)
+        for node_id, weight in enumerate(weights):
+            self.weight_totals[self.codes[node_id]] += weight
+
+    def node_id(self, step, add=False):
+        """
+        The node ID of 'step', or None if it was never added.  With 'add', steps outside the graph get a node ID
+        """
+        node_id = self._graph_ids.get(step)
+        if node_id is None:
+            node_id = self._extra_ids.get(step)
+            if node_id is None and add:
+                node_id = self._extra_ids[step] = len(self.codes)
+                self._extra_nodes.append(step)
+                self.codes.append(self.OUTSIDE)
+                self.counts[self.OUTSIDE] += 1
+        return node_id
+
+    def node(self, node_id):
+        if node_id < len(self._graph_nodes):
+            return self._graph_nodes[node_id]
+        return self._extra_nodes[node_id - len(self._graph_nodes)]
+
+    def code_of(self, step):
+        node_id = self.node_id(step)
+        return self.OUTSIDE if node_id is None else self.codes[node_id]
+
+    def move(self, node_id, code):
+        previous = self.codes[node_id]
+        if previous == code:
+            return
+        self.codes[node_id] = code
+        self.counts[previous] -= 1
+        self.counts[code] += 1
+        if previous == self.WORKING:
+            self.working_ids.discard(node_id)
+        if code == self.WORKING:
+            self.working_ids.add(node_id)
+        if self.weights is not None and node_id < len(self.weights):
+            self.weight_totals[previous] -= self.weights[node_id]
+            self.weight_totals[code] += self.weights[node_id]
+
+    def ids(self, code):
+        """
+        Node IDs of the steps with 'code'.  The working set is copied so that steps can move while it is walked
+        """
+        if code == self.WORKING:
+            return list(self.working_ids)
+        codes = self.codes
+        return [node_id for node_id in range(len(codes)) if codes[node_id] == code]
+
+    def snapshot(self):
+        """
+        Read-only copy of the table at this point, which copies the array of codes rather than any set of steps
+        """
+        snapshot = StepTable.__new__(StepTable)
+        snapshot._graph_nodes = self._graph_nodes
+        snapshot._graph_ids = self._graph_ids
+        snapshot._extra_nodes = list(self._extra_nodes)
+        snapshot._extra_ids = dict(self._extra_ids)
+        snapshot.codes = array('b', self.codes)
+        snapshot.counts = list(self.counts)
+        snapshot.working_ids = set(self.working_ids)
+        snapshot.weights = self.weights
+        snapshot.weight_totals = None if self.weight_totals is None else list(self.weight_totals)
+        return snapshot
+
+
+class StepView(MutableSet):
+    """
+    Live set of the steps of a StepTable that have one code.  Its length is a counter and membership looks up the
+    code of the step.  Adding a step moves it to that code, and removing it moves it back to WAITING
+    """
+    __slots__ = ('table', 'code', 'read_only')
+
+    def __init__(self, table, code, read_only=False):
+        self.table = table
+        self.code = code
+        self.read_only = read_only
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)
+
+    def __contains__(self, step):
+        return self.table.code_of(step) == self.code
+
+    def __len__(self):
+        return self.table.counts[self.code]
+
+    def __iter__(self):
+        table = self.table
+        return iter([table.node(node_id) for node_id in table.ids(self.code)])
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, list(self))
+
+    def add(self, step):
+        self._check_writable()
+        self.table.move(self.table.node_id(step, add=True), self.code)
+
+    def discard(self, step):
+        self._check_writable()
+        node_id = self.table.node_id(step)
+        if node_id is not None and self.table.codes[node_id] == self.code:
+            self.table.move(node_id, StepTable.WAITING)
+
+    def _check_writable(self):
+        if self.read_only:
+            raise TypeError("{!r} is a read-only view".format(self))
+
+
+class AllStepsView(Set):
+    """
+    Read-only set of every step a StepTable tracks
+    """
+    __slots__ = ('table',)
+
+    def __init__(self, table):
+        self.table = table
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)
+
+    def __contains__(self, step):
+        return self.table.code_of(step) != StepTable.OUTSIDE
+
+    def __len__(self):
+        return len(self.table.codes) - self.table.counts[StepTable.OUTSIDE]
+
+    def __iter__(self):
+        table = self.table
+        codes = table.codes
+        return iter([table.node(node_id) for node_id in range(len(codes)) if codes[node_id] != StepTable.OUTSIDE])
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, list(self))
+
+
+class ExecutionSnapshot(object):
+    """
+    Read-only view of an execution at one point, for monitors and reporters.  Counts are free and the sets of steps
+    are views over a copy of the codes of the steps
+    """
+
+    def __init__(self, table, aborted):
+        self.table = table
+        self.aborted = aborted
+        self.working_set = StepView(table, StepTable.WORKING, read_only=True)
+        self.finished_steps = StepView(table, StepTable.FINISHED, read_only=True)
+        self.failed_steps = StepView(table, StepTable.FAILED, read_only=True)
+        self.all_refs = AllStepsView(table)
+
+    @property
+    def total(self):
+        return len(self.all_refs)
+
+    @property
+    def finished(self):
+        return self.table.counts[StepTable.FINISHED]
+
+    @property
+    def failed(self):
+        return self.table.counts[StepTable.FAILED]
+
+    @property
+    def in_flight(self):
+        return self.table.counts[StepTable.WORKING]
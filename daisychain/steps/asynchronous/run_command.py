@@ -0,0 +1,41 @@
+import asyncio
+import subprocess
+from daisychain.async_step import AsyncStep
+from daisychain.steps.system.run_command import RunCommand
+
+
+class AsyncRunCommand(AsyncStep, RunCommand):
+    """
+    Runs a command as a subprocess of the event loop of an AsyncExecutor, waiting for it to exit instead of polling
+    its return code
+    """
+    check_status = AsyncStep.check_status
+
+    def __init__(self, **fields):
+        super(AsyncRunCommand, self).__init__(**fields)
+        self.status.callback = self.check_status
+
+    async def validate(self):
+        p = await asyncio.create_subprocess_exec('which', self.command[0], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if await p.wait() != 0:
+            raise RuntimeError("Could not find command using 'which {}'".format(self.command[0]))
+
+        if self._forward_auth:
+            p = await asyncio.create_subprocess_exec('sudo', '-S', '/bin/true', stdin=subprocess.PIPE)
+            await p.communicate((str(self.authentication.password) + '\n').encode())
+            if p.returncode != 0:
+                raise RuntimeError("Could not validate authentication credentials for sudo")
+        self.status.set_validated()
+
+    async def run(self):
+        command = self.command[:]
+        if self._forward_auth:
+            command.insert(1, '-S')
+        self.status.process = await asyncio.create_subprocess_exec(*command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, stdin=subprocess.PIPE)
+        if self._forward_auth:
+            self.status.process.stdin.write((str(self.authentication.password) + '\n').encode())
+        self.status.process.stdin.close()
+
+        return_code = await self.status.process.wait()
+        if return_code != 0:
+            raise subprocess.CalledProcessError(returncode=return_code, cmd=self.command)
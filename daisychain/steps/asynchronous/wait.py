@@ -0,0 +1,15 @@
+import asyncio
+import time
+from daisychain.async_step import AsyncStep
+from daisychain.steps.wait import Wait
+
+
+class AsyncWait(AsyncStep, Wait):
+    """
+    Sleeps for a minimum number of seconds on the event loop of an AsyncExecutor
+    """
+    check_status = AsyncStep.check_status
+
+    async def run(self):
+        self.start_time = time.time()
+        await asyncio.sleep(self.seconds)
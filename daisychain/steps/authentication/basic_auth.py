@@ -12,6 +12,7 @@ class BasicAuth(Step):
     username = Field(instance_of=string_types, optional=True)
     password = Field(instance_of=string_types, optional=True)
     credentials_for = Field(instance_of=string_types, optional=True, default='')
+    restorable = False
 
     def __init__(self, **fields):
         super(BasicAuth, self).__init__(**fields)
@@ -28,6 +29,10 @@ class BasicAuth(Step):
         if self.credentials_for:
             self.credentials_for = " for " + self.credentials_for
 
+    @property
+    def validates_interactively(self):
+        return self._should_get_username or self._should_get_password
+
     def validate(self):
         self.run()
 
@@ -9,9 +9,11 @@ class Compiler(Pipe):
     """
     A Compiler is a step that takes in a config input_step reference which presents a 'output' attribute representing the
     configuration tree to process.  Has an abstract method 'compile' which takes in a copy of the uncompiled-config
-    and should return the compiled configuration.
+    and should return the compiled configuration.  Without 'copy_input', the configuration of the input_step is compiled in
+    place, for when nothing else uses it
     """
     run_from_here = Field(instance_of=bool, optional=True, default=False)
+    copy_input = Field(instance_of=bool, optional=True, default=True)
 
     @abstractmethod
     def compile(self, config):
@@ -20,7 +22,9 @@ class Compiler(Pipe):
         """
 
     def run(self):
-        config = copy.deepcopy(self.input_step.output)
+        config = self.input_step.output
+        if self.copy_input:
+            config = copy.deepcopy(config)
         self.output = self.compile(config)
         self.log().debug("Output Configuration: {!r}".format(self.output))
         self.status.set_finished()
@@ -16,6 +16,12 @@ class Input(Step):
         super(Input, self).__init__(**fields)
         self.output = None
 
+    def close(self):
+        """
+        Releases what backs 'output', for inputs whose output is a resource rather than a value.  Nothing to do by
+        default
+        """
+
 
 class InMemoryInput(Input):
     """
@@ -1,11 +1,32 @@
 from daisychain.steps.input import Input
 from daisychain.field import Field
 from py3compat import string_types
+import mmap
+
 
 class InputFile(Input):
+    """
+    Presents the contents of the file at 'path' as its output.  With 'stream', the output is a read-only memory map of
+    the file instead, for a streaming pipe like JsonStreamLoad to read from without the file ever being copied into memory.
+    The memory map belongs to the step reading it, which calls 'close' once it is done with it
+    """
     path = Field(instance_of=string_types)
+    stream = Field(instance_of=bool, optional=True, default=False)
 
     def run(self):
-        with open(self.path) as f:
-            self.output = f.read()
+        if self.stream:
+            with open(self.path, 'rb') as f:
+                try:
+                    self.output = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # Empty files cannot be mapped
+                    self.output = f.read()
+        else:
+            with open(self.path) as f:
+                self.output = f.read()
         self.status.set_finished()
+
+    def close(self):
+        if isinstance(self.output, mmap.mmap):
+            self.output.close()
+            self.output = None
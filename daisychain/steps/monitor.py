@@ -52,9 +52,10 @@ class Monitor(Step):
 
         if self.executor and self.watch_all and len(self.watches) == 0:
             self.log().debug("Evaluating watch_all")
-            _, _, all_execution_references = self._get_reverse_mapping(for_execution=True)
-            for reference in self.executor.all_references:
-                if reference not in all_execution_references and reference is not self.executor and not isinstance(reference, Monitor):
+            reachability = self.executor.reachability()
+            upstream_steps = reachability.ancestors(self)
+            for reference in reachability.plan_graph.all_references:
+                if reference not in upstream_steps and reference is not self.executor and not isinstance(reference, Monitor):
                     self.watches.append(reference)
             if len(self.watches) == 0:
                 self.log().debug("Even though watch_all is set, there are no steps that are valid to watch.  Will still run once before exiting")
@@ -98,7 +99,16 @@ class Monitor(Step):
         return overall_status
 
     def _search_tree_for_failures(self, step):
+        """
+        The status of a failed step upstream of 'step' if 'step' is pending and there is one, and the status of 'step'
+        otherwise.  With an executor, that is a lookup in its ReachabilityIndex
+        """
         if step.status.pending:
+            if self.executor is not None:
+                reachability = self.executor.reachability()
+                if step in reachability:
+                    failed = reachability.failed_ancestor(step)
+                    return step.status if failed is None else failed.status
             for dependency in step.dependencies:
                 status = self._search_tree_for_failures(dependency)
                 if status.failed:
@@ -117,9 +127,17 @@ class MonitorStarter(Step):
         super(MonitorStarter, self).__init__(**fields)
         self.monitors = set(self.monitors)
 
+    def check_status(self):
+        if self.status.running:
+            self._check_monitors()
+
     def run(self):
-        failed_monitors = self.monitors & self.executor.execution.failed_steps
-        remaining_monitors = self.monitors - (self.executor.execution.working_set | self.executor.execution.finished_steps)
+        self._check_monitors()
+
+    def _check_monitors(self):
+        execution = self.executor.execution
+        failed_monitors = [monitor for monitor in self.monitors if monitor in execution.failed_steps]
+        remaining_monitors = [monitor for monitor in self.monitors if monitor not in execution.working_set and monitor not in execution.finished_steps]
         if len(failed_monitors) > 0:
             self.status.set_failed(list(failed_monitors)[0].status.stage)
         elif len(remaining_monitors) == 0:
@@ -7,6 +7,8 @@ class Pipe(Output, Input):
     A Pipe is a step that takes in the 'output' from a passed in 'step_input' and transforms it for consumption,
     presenting its own 'output' attribute for consumption in its run method
     """
+    cacheable = True
+
     def __init__(self, **fields):
         super(Pipe, self).__init__(**fields)
         self.output = None
@@ -1,4 +1,7 @@
 from daisychain.steps.pipe import Pipe
+from daisychain.json_stream import iter_steps
+from daisychain.constants import STEPS_KEY
+import io
 import json
 
 
@@ -8,12 +11,39 @@ class JsonLoad(Pipe):
         self.status.set_finished()
 
 
+class JsonStreamLoad(Pipe):
+    """
+    Loads a plan like JsonLoad, but reads it a step at a time from a file object or memory map, such as the output of
+    InputFile with 'stream', so that its text is never held in memory next to the plan.  It owns that input: once the
+    plan is read, it closes the input step, releasing the memory map.  Its output is not cached, as the plans worth
+    streaming are the ones too big to keep a copy of
+    """
+    cacheable = False
+
+    def run(self):
+        source = self.input_step.output
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        elif isinstance(source, type(u'')):
+            source = io.StringIO(source)
+        plan = dict()
+        try:
+            plan[STEPS_KEY] = dict(iter_steps(source, top_level=plan))
+        finally:
+            self.input_step.close()
+        self.output = plan
+        self.status.set_finished()
+
+
 class JsonDump(Pipe):
     def __init__(self, **kwargs):
         fields, json_args = self.__class__._split_fields(**kwargs)
         super(Pipe, self).__init__(**fields)
         self.json_args = json_args
 
+    def cache_config(self):
+        return self.json_args
+
     def run(self):
         self.output = json.dumps(self.input_step.output, **self.json_args)
         self.status.set_finished()
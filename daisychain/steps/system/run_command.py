@@ -54,6 +54,13 @@ class RunCommand(Step):
                 raise RuntimeError("Could not validate authentication credentials for sudo")
         self.status.set_validated()
 
+    def validation_key(self):
+        # Commands run through sudo with different credentials validate differently, as do subclasses with a
+        # 'validate' of their own
+        if self._forward_auth:
+            return (type(self), self.command[0], self.authentication)
+        return (type(self), self.command[0])
+
     def run(self):
         command = self.command[:]
         if self._forward_auth:
@@ -0,0 +1,78 @@
+from daisychain.instrumentation import InstrumentationCollector
+import itertools
+import json
+import timeit
+
+# Transitions that end a run of a step.  Monitors go back to validated or pending between their runs
+RUN_ENDS = {'finished', 'failed', 'validated', 'pending'}
+
+
+class TraceRecorder(InstrumentationCollector):
+    """
+    Instrumentation that can also export the execution as a timeline in the Chrome Trace Event format, which
+    chrome://tracing and Perfetto open.  There is one track per thread that steps finished on, one span per validation
+    and per run of each step, and a flow arrow from the end of each step to the start of the steps depending on it
+    """
+
+    def __init__(self, clock=timeit.default_timer):
+        super(TraceRecorder, self).__init__(clock=clock)
+        self.validations_started = dict()
+
+    def validating(self, step):
+        timestamp = self.clock() - self.started
+        with self._lock:
+            self.validations_started.setdefault(step, timestamp)
+
+    def spans(self):
+        """
+        Spans of the execution as (step, category, start, end, thread name, outcome) tuples, in seconds since the
+        recorder was created
+        """
+        with self._lock:
+            transitions = list(self.transitions)
+            validations_started = dict(self.validations_started)
+
+        spans = []
+        running = dict()
+        for step, stage_name, timestamp, thread_name in transitions:
+            if step in validations_started and stage_name in ('validated', 'failed'):
+                spans.append((step, 'validate', validations_started.pop(step), timestamp, thread_name, stage_name))
+            if step in running and stage_name in RUN_ENDS:
+                spans.append((step, 'run', running.pop(step), timestamp, thread_name, stage_name))
+            if stage_name == 'running':
+                running[step] = timestamp
+        return spans
+
+    def trace(self):
+        """
+        The execution as a Chrome Trace Event document
+        """
+        thread_ids = dict()
+        events = []
+        run_spans = dict()
+        for step, category, start, end, thread_name, outcome in self.spans():
+            if thread_name not in thread_ids:
+                thread_ids[thread_name] = len(thread_ids) + 1
+                events.append({'ph': 'M', 'name': 'thread_name', 'pid': 1, 'tid': thread_ids[thread_name], 'args': {'name': thread_name}})
+            events.append({'ph': 'X', 'name': step.name, 'cat': category, 'pid': 1, 'tid': thread_ids[thread_name],
+                           'ts': start * 1e6, 'dur': (end - start) * 1e6,
+                           'args': {'class': '{0.__module__}.{0.__name__}'.format(type(step)), 'outcome': outcome}})
+            if category == 'run':
+                first_start = run_spans[step][0] if step in run_spans else start
+                run_spans[step] = (first_start, end, thread_ids[thread_name])
+
+        flow_ids = itertools.count(1)
+        for consumer, (consumer_start, _, consumer_thread) in run_spans.items():
+            for producer in consumer.get_references(for_execution=True):
+                if producer not in run_spans:
+                    continue
+                _, producer_end, producer_thread = run_spans[producer]
+                flow_id = next(flow_ids)
+                events.append({'ph': 's', 'name': 'dependency', 'cat': 'dependency', 'id': flow_id, 'pid': 1, 'tid': producer_thread, 'ts': producer_end * 1e6})
+                events.append({'ph': 'f', 'bp': 'e', 'name': 'dependency', 'cat': 'dependency', 'id': flow_id, 'pid': 1, 'tid': consumer_thread, 'ts': consumer_start * 1e6})
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.trace(), f)
@@ -13,7 +13,7 @@ setup(
     author_email='jeff@edwardsj.com',
     url='https://github.com/python-daisychain/daisychain',
     license='MIT License',
-    packages=find_packages(exclude=["*.test", "*.test.*", "test.*", "test"]),
+    packages=find_packages(exclude=["*.test", "*.test.*", "test.*", "test", "benchmarks", "benchmarks.*"]),
     scripts = ['bin/daisy-chain'],
     install_requires=install_requires
 )
@@ -0,0 +1,10 @@
+import sys
+
+# The asyncio API uses 'async def', which older Pythons cannot even parse
+collect_ignore = []
+if sys.version_info < (3, 5):
+    collect_ignore.extend([
+        'test_async_executor.py',
+        'test_steps__asynchronous__run_command.py',
+        'test_steps__asynchronous__wait.py',
+    ])
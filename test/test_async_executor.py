@@ -0,0 +1,94 @@
+from daisychain.async_executor import AsyncExecutor
+from daisychain.async_step import AsyncStep
+from daisychain.executor import Executor
+from daisychain.step import Step
+from daisychain.steps.marker import Marker
+from daisychain.reference import Reference
+from daisychain.steps.system.run_command import RunCommand
+import asyncio
+import time
+
+
+class Sleeper(AsyncStep):
+    def __init__(self, seconds=0.1, **fields):
+        super(Sleeper, self).__init__(**fields)
+        self.seconds = seconds
+        self.ran = False
+
+    async def run(self):
+        await asyncio.sleep(self.seconds)
+        self.ran = True
+
+
+class FailingStep(AsyncStep):
+    async def run(self):
+        raise RuntimeError("mock failure")
+
+
+class After(AsyncStep):
+    before = Reference(affects_execution_order=True)
+
+    async def run(self):
+        assert self.before.status.finished
+
+
+def test_init():
+    e = AsyncExecutor()
+    assert e.scheduler == Executor.EVENT
+    try:
+        AsyncExecutor(validation_workers=2)
+    except ValueError:
+        pass
+    else:
+        assert False, "validation_workers should have been rejected rather than ignored"
+
+
+def test_polled_steps_stay_off_the_process_pool():
+    commands = [RunCommand(name='true_{}'.format(i), command='true', poll_interval_seconds=0) for i in range(2)]
+    AsyncExecutor(dependencies=commands, max_workers=2, pool=Executor.PROCESS_POOL).execute()
+    assert all(command.finished for command in commands)
+
+
+def test_concurrent_async_steps():
+    steps = [Sleeper(seconds=0.2, name='sleeper_{}'.format(i)) for i in range(50)]
+    executor = AsyncExecutor(dependencies=steps)
+    start_time = time.time()
+    executor.execute()
+    assert time.time() - start_time < 2
+    assert all(step.ran and step.status.finished for step in steps)
+
+
+def test_dependency_order():
+    before = Sleeper(seconds=0.05)
+    after = After(before=before)
+    executor = AsyncExecutor(dependencies=[after])
+    executor.execute()
+    assert before.status.finished
+    assert after.status.finished
+
+
+def test_mixed_with_synchronous_steps():
+    marker = Marker()
+    sleeper = Sleeper(seconds=0.01)
+    executor = AsyncExecutor(dependencies=[marker, sleeper])
+    executor.execute()
+    assert marker.status.finished
+    assert sleeper.status.finished
+
+
+def test_failure():
+    step = FailingStep()
+    executor = AsyncExecutor(dependencies=[step], on_failure=Executor.SKIP)
+    execution = executor.execute()
+    assert step.status.failed
+    assert step in execution.failed_steps
+
+
+def test_step_cannot_be_started_synchronously():
+    step = Sleeper()
+    try:
+        step.start()
+    except TypeError:
+        pass
+    else:
+        assert False, "An AsyncStep should only be run by an AsyncExecutor"
@@ -0,0 +1,64 @@
+from daisychain.dependency_set import DependencySet
+import pickle
+
+def test_small_set():
+    s = DependencySet([1, 2, 2])
+    assert len(s) == 2
+    assert isinstance(s._items, tuple)
+    s.add(3)
+    s.add(3)
+    s.discard(1)
+    s.discard(5)
+    assert s == {2, 3}
+    assert {2, 3} == s
+    assert 2 in s and 1 not in s
+
+def test_grows_into_set():
+    s = DependencySet(range(DependencySet.SMALL_SIZE))
+    assert isinstance(s._items, tuple)
+    s.add(DependencySet.SMALL_SIZE)
+    assert isinstance(s._items, set)
+    assert s == set(range(DependencySet.SMALL_SIZE + 1))
+    assert isinstance(DependencySet(range(100))._items, set)
+
+def test_set_operations():
+    s = DependencySet([1, 2, 3])
+    s -= {1}
+    assert s == {2, 3}
+    s |= {4}
+    assert s == {2, 3, 4}
+    assert isinstance(s | {5}, DependencySet)
+    assert (s | {5}) == {2, 3, 4, 5}
+    assert s - {2} == {3, 4}
+    assert set([1]) | s == {1, 2, 3, 4}
+    s.update([5], [6])
+    s.difference_update([2, 3])
+    assert s == {4, 5, 6}
+    assert s.union([7]) == {4, 5, 6, 7}
+    assert s.copy() == s and s.copy() is not s
+
+def test_named_set_methods():
+    s = DependencySet([1, 2, 3])
+    assert s.intersection([2, 3, 4], (3, 2)) == {2, 3}
+    assert isinstance(s.intersection([2]), DependencySet)
+    assert s.difference([1], iter([2])) == {3}
+    assert s.symmetric_difference([3, 4]) == {1, 2, 4}
+    assert s.issubset(range(5)) and not s.issubset([1, 2])
+    assert s.issuperset(iter([1, 3])) and not s.issuperset([4])
+    assert s.isdisjoint([4, 5])
+    assert s == {1, 2, 3}
+
+    s.intersection_update(range(1, 20))
+    assert s == {1, 2, 3}
+    s.symmetric_difference_update([3, 4, 4])
+    assert s == {1, 2, 4}
+    s.intersection_update([2, 4, 5])
+    assert s == {2, 4} and isinstance(s._items, tuple)
+    assert s & {4} == {4} and s ^ {4, 5} == {2, 5}
+    s.remove(2)
+    s.clear()
+    assert len(s) == 0
+
+def test_pickle():
+    s = DependencySet(['a', 'b'])
+    assert pickle.loads(pickle.dumps(s)) == s
@@ -0,0 +1,94 @@
+from daisychain.duration_store import SqliteDurationStore, FileDurationStore, DurationRecorder, open_duration_store, step_key
+from daisychain.executor import Executor, Execution
+from daisychain.step import Step
+from daisychain.step_status import StepStatus
+import os
+import time
+
+
+class SleepStep(Step):
+    def run(self):
+        time.sleep(0.05)
+        self.status.set_finished()
+
+
+def test_step_key():
+    assert step_key(SleepStep(name='a')) == 'test.test_duration_store.SleepStep:a'
+
+
+def test_stores(tmpdir):
+    directory = str(tmpdir)
+    for store_class, filename in ((SqliteDurationStore, 'durations.db'), (FileDurationStore, 'durations.tsv')):
+        path = os.path.join(directory, filename)
+        step = SleepStep(name='a')
+        store = store_class(path, history=2)
+        assert store.estimate(step) is None
+
+        store.record([(step_key(step), 0.0, 1.0), (step_key(step), 10.0, 13.0)])
+        assert store.estimate(step) == 2.0
+        store.record([(step_key(step), 20.0, 25.0)])
+        assert store.estimate(step) == 4.0
+
+        reopened = store_class(path, history=3)
+        assert reopened.estimate(step) == 3.0
+
+
+def test_open_duration_store(tmpdir):
+    assert isinstance(open_duration_store(str(tmpdir.join('durations.db'))), SqliteDurationStore)
+    assert isinstance(open_duration_store(str(tmpdir.join('durations.tsv'))), FileDurationStore)
+
+
+def test_recorder():
+    clock_times = iter([1.0, 4.0])
+    recorder = DurationRecorder(clock=lambda: next(clock_times))
+    step = SleepStep(name='a')
+    failed_step = SleepStep(name='b')
+    recorder.attach([step, failed_step])
+    step.status.set_running()
+    step.status.set_finished()
+    failed_step.status.set_failed(RuntimeError())
+    recorder.detach([step, failed_step])
+    assert recorder.take_records() == [(step, 1.0, 4.0)]
+    assert recorder.take_records() == []
+    assert step.status.listeners is None
+
+
+def test_executor_records_durations(tmpdir):
+    directory = str(tmpdir)
+    store = FileDurationStore(os.path.join(directory, 'durations.tsv'))
+    for run in range(2):
+        steps = [SleepStep(name='step_{}'.format(i)) for i in range(3)]
+        executor = Executor(dependencies=steps, duration_store=store, slow_step_report=2)
+        executor.execute()
+        assert len(executor.step_durations) == 3
+        slow_steps = executor.slow_steps(limit=2)
+        assert len(slow_steps) == 2
+        if run == 0:
+            assert slow_steps[0][2] is None
+        else:
+            assert slow_steps[0][2] >= 0.05
+
+    assert len(store.load()) == 6
+    assert executor.estimate_durations()[steps[0]] >= 0.05
+
+
+def test_estimate_remaining_seconds():
+    class MockStore(object):
+        def estimate(self, step):
+            return {'first': 2.0, 'second': 3.0}.get(step.name)
+
+    first = SleepStep(name='first')
+    second = SleepStep(name='second', dependencies=[first])
+    unknown = SleepStep(name='unknown')
+    executor = Executor(dependencies=[second, unknown], duration_store=MockStore())
+    executor.compile_plan()
+    executor._estimates = executor.estimate_durations()
+    assert executor._estimates[unknown] == 2.5
+
+    executor.execution = Execution(executor=executor)
+    assert executor.estimate_remaining_seconds() == 5.0
+    executor.max_workers = 1
+    assert executor.estimate_remaining_seconds() == 7.5
+    executor.execution.finished_steps.add(first)
+    executor.max_workers = None
+    assert executor.estimate_remaining_seconds() == 3.0
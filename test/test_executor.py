@@ -1,6 +1,14 @@
 import daisychain.steps.input
 from daisychain.executor import Executor, Execution, ExecutorAborted, ConsoleInput, CheckStatusException
 from . import test_step
+from daisychain.steps.marker import Marker
+from daisychain.step import Step
+from daisychain.step_status import StepStatus
+from daisychain.field import Field, deferred_validation
+from daisychain.reference import Reference
+from daisychain.ready_policy import CriticalPathPolicy
+import threading
+import time
 from mock import patch
 
 import py3compat
@@ -226,3 +234,321 @@ def test_execute_dry_run():
     e.execute()
     assert dep.status.validated
     assert not dep.ran_once
+
+def test_init_scheduler():
+    e = Executor()
+    assert e.scheduler == Executor.POLL
+
+    e = Executor(scheduler=Executor.EVENT)
+    assert e.scheduler == Executor.EVENT
+
+    try:
+        e = Executor(scheduler='NOT_A_KNOWN_SCHEDULER')
+    except ValueError:
+        pass
+    else:
+        assert False, "Should have thrown a Value Error for an unknown scheduler"
+
+def test_execute_event_driven():
+    dep_dep = test_step.MockStep(name='mock_step_dep')
+    dep = test_step.MockStep(name='mock_step', dependencies=[dep_dep])
+    marker = Marker(name='marker', dependencies=[dep])
+    e = Executor(name='test_executor', dependencies=[marker], scheduler=Executor.EVENT)
+    e.execute()
+
+    assert dep_dep.finished
+    assert dep.finished
+    assert marker.finished
+    assert len(e.execution.finished_steps) == 3
+    assert marker.status.listeners is None
+
+def test_execute_event_driven_only_polls_steps_that_need_it():
+    markers = [Marker(name='marker_{}'.format(i)) for i in range(5)]
+    polled = test_step.MockStep(name='polled', dependencies=markers)
+    checks = []
+    for step in markers + [polled]:
+        step.status.check = (lambda check, step: lambda: (checks.append(step), check())[1])(step.status.check, step)
+
+    e = Executor(name='test_executor', dependencies=[polled], scheduler=Executor.EVENT)
+    e.execute()
+    assert polled.finished
+    assert all(marker.finished for marker in markers)
+    # Each marker is only visited for the transitions it went through rather than on every scan
+    for marker in markers:
+        assert checks.count(marker) <= 2
+
+def test_execute_event_driven_skip_failures():
+    dep = test_step.MockStep(name='mock_sibling_step', run_exception=RuntimeError("test_run_exception"))
+    successful_dep = test_step.MockStep(name='successful_dep')
+    parent = test_step.MockStep(name='mock_parent_step', dependencies=[dep, successful_dep])
+    e = Executor(name='test_executor', on_failure=Executor.SKIP, dependencies=[parent], scheduler=Executor.EVENT)
+    e.execute()
+    assert dep.failed
+    assert successful_dep.finished
+    assert parent.validated
+    assert not e.execution.aborted
+
+def test_execution_remaining_dependencies():
+    dep = test_step.MockStep(name='dep')
+    dep2 = test_step.MockStep(name='dep2')
+    parent = test_step.MockStep(name='parent', dependencies=[dep, dep2])
+    e = Executor(name='test_executor', dependencies=[parent])
+    execution = Execution(executor=e)
+    assert execution.working_set == {dep, dep2}
+    assert execution.remaining_dependencies == {dep: 0, dep2: 0, parent: 2}
+
+    execution.consider_step_finished(dep)
+    execution.add_consumers_to_working_set(dep)
+    assert execution.remaining_dependencies[parent] == 1
+    assert parent not in execution.working_set
+
+    execution.consider_step_finished(dep2)
+    execution.add_consumers_to_working_set(dep2)
+    assert execution.remaining_dependencies[parent] == 0
+    assert execution.working_set == {parent}
+
+class SleepingStep(Step):
+    seconds = Field(instance_of=(int, float), optional=True, default=0.2)
+
+    def run(self):
+        time.sleep(self.seconds)
+
+
+class SquaringStep(Step):
+    value = Field(instance_of=int)
+
+    def run(self):
+        self.output = self.value ** 2
+        self.status.set_finished()
+
+
+def test_init_worker_pool():
+    e = Executor()
+    assert e.max_workers is None
+    assert e.pool == Executor.THREAD_POOL
+
+    for kwargs in [{'max_workers': 0}, {'max_workers': 2, 'pool': 'NOT_A_KNOWN_POOL'}]:
+        try:
+            Executor(**kwargs)
+        except ValueError:
+            pass
+        else:
+            assert False, "Should have thrown a Value Error for {!r}".format(kwargs)
+
+def test_execute_with_thread_pool():
+    for scheduler in (Executor.POLL, Executor.EVENT):
+        steps = [SleepingStep(name='sleep_{}'.format(i)) for i in range(4)]
+        final = Marker(name='final', dependencies=steps)
+        e = Executor(name='test_executor', dependencies=[final], max_workers=4, scheduler=scheduler)
+        start_time = time.time()
+        e.execute()
+        assert time.time() - start_time < 0.6
+        assert all(step.finished for step in steps)
+        assert final.finished
+
+def test_execute_with_thread_pool_caps_concurrency():
+    steps = [SleepingStep(name='sleep_{}'.format(i)) for i in range(4)]
+    e = Executor(name='test_executor', dependencies=steps, max_workers=2, scheduler=Executor.EVENT)
+    start_time = time.time()
+    e.execute()
+    assert time.time() - start_time >= 0.4
+    assert all(step.finished for step in steps)
+
+class StallsAfterFinishing(Step):
+    def stall(self, status, stage):
+        if stage == StepStatus.FINISHED:
+            time.sleep(0.3)
+
+    def run(self):
+        # Added while running, so that it is called after the executor has already been told about the transition
+        self.status.add_listener(self.stall)
+        self.status.set_finished()
+
+
+def test_execute_with_thread_pool_frees_worker_before_waking_scheduler():
+    steps = [StallsAfterFinishing(name='stall_{}'.format(i)) for i in range(2)]
+    e = Executor(name='test_executor', dependencies=steps, max_workers=1, scheduler=Executor.EVENT)
+    execution = threading.Thread(target=e.execute)
+    execution.daemon = True
+    execution.start()
+    execution.join(timeout=5)
+    assert not execution.is_alive()
+    assert all(step.finished for step in steps)
+
+def test_execute_with_thread_pool_failure():
+    dep = test_step.MockStep(name='mock_step', run_exception=RuntimeError('Exception while running step'))
+    e = Executor(name='test_executor', dependencies=[dep], max_workers=2)
+    try:
+        e.execute()
+    except RuntimeError:
+        assert dep.failed
+    else:
+        assert False, "Should have thrown the error the step raised"
+
+def test_execute_with_process_pool():
+    steps = [SquaringStep(name='square_{}'.format(i), value=i) for i in range(4)]
+    e = Executor(name='test_executor', dependencies=steps, max_workers=2, pool=Executor.PROCESS_POOL)
+    e.execute()
+    for i, step in enumerate(steps):
+        assert step.finished
+        assert step.output == i ** 2
+
+
+class DependencyCounter(Step):
+    def run(self):
+        self.output = [dependency.name for dependency in self.dependencies]
+        self.status.set_finished()
+
+
+def test_execute_long_chain_with_process_pool():
+    # Each step is sent to its worker without the steps upstream of the ones it refers to
+    chain = [DependencyCounter(name='link_0')]
+    for i in range(1, 400):
+        chain.append(DependencyCounter(name='link_{}'.format(i), dependencies=[chain[-1]]))
+    Executor(dependencies=[chain[-1]], max_workers=2, pool=Executor.PROCESS_POOL).execute()
+    assert all(step.finished for step in chain)
+    assert chain[-1].output == ['link_398']
+    assert chain[-1].dependencies == {chain[-2]}
+
+
+class SlowlyValidatedStep(Step):
+    key = Field(optional=True)
+    validations = []
+
+    def validation_key(self):
+        return self.key
+
+    def validate(self):
+        time.sleep(0.2)
+        SlowlyValidatedStep.validations.append(self)
+        self.status.set_validated()
+
+    def run(self):
+        self.status.set_finished()
+
+
+class ValidatesAfterDependencies(SlowlyValidatedStep):
+    def validate(self):
+        assert all(dependency.status.validated for dependency in self.dependencies)
+        super(ValidatesAfterDependencies, self).validate()
+
+
+def test_init_validation_pool():
+    e = Executor()
+    assert e.validation_workers is None
+    try:
+        Executor(validation_workers=0)
+    except ValueError:
+        pass
+    else:
+        assert False, "Should have thrown a Value Error for validation_workers=0"
+
+def test_execute_with_validation_pool():
+    for scheduler in (Executor.POLL, Executor.EVENT):
+        SlowlyValidatedStep.validations = []
+        steps = [SlowlyValidatedStep(name='validate_{}'.format(i)) for i in range(4)]
+        executor = Executor(dependencies=steps, validation_workers=4, scheduler=scheduler)
+        start_time = time.time()
+        executor.execute()
+        assert time.time() - start_time < 0.6
+        assert len(SlowlyValidatedStep.validations) == 4
+        assert all(step.status.finished for step in steps)
+
+def test_execute_with_validation_pool_honors_dependencies():
+    SlowlyValidatedStep.validations = []
+    first = SlowlyValidatedStep(name='first')
+    second = ValidatesAfterDependencies(name='second', dependencies=[first])
+    executor = Executor(dependencies=[second], validation_workers=4)
+    executor.execute()
+    assert SlowlyValidatedStep.validations == [first, second]
+    assert second.status.finished
+
+def test_execute_with_validation_pool_dedupes_validations():
+    for scheduler in (Executor.POLL, Executor.EVENT):
+        SlowlyValidatedStep.validations = []
+        steps = [SlowlyValidatedStep(name='validate_{}'.format(i), key=i % 2) for i in range(6)]
+        executor = Executor(dependencies=steps, validation_workers=2, scheduler=scheduler)
+        executor.execute()
+        assert len(SlowlyValidatedStep.validations) == 2
+        assert all(step.status.finished for step in steps)
+
+def test_execute_with_validation_pool_failure():
+    class FailsValidation(SlowlyValidatedStep):
+        def validate(self):
+            raise RuntimeError("mock validation failure")
+
+    steps = [FailsValidation(name='fail_{}'.format(i), key='shared') for i in range(3)]
+    executor = Executor(dependencies=steps, validation_workers=2, on_failure=Executor.SKIP)
+    execution = executor.execute()
+    assert all(step.status.failed for step in steps)
+    assert execution.failed_steps == set(steps)
+
+
+class RecordingStep(Step):
+    started = []
+
+    def run(self):
+        RecordingStep.started.append(self.name)
+        time.sleep(0.01)
+
+
+def test_init_ready_policy():
+    assert Executor().ready_policy is None
+    assert isinstance(Executor(ready_policy=Executor.CRITICAL_PATH).ready_policy, CriticalPathPolicy)
+    try:
+        Executor(ready_policy='NOT_A_KNOWN_POLICY')
+    except ValueError:
+        pass
+    else:
+        assert False, "Should have thrown a Value Error for an unknown ready policy"
+
+def test_execute_with_critical_path_policy():
+    for scheduler in (Executor.POLL, Executor.EVENT):
+        RecordingStep.started = []
+        chain = RecordingStep(name='chain_0')
+        for i in range(1, 4):
+            chain = RecordingStep(name='chain_{}'.format(i), dependencies=[chain])
+        short_steps = [RecordingStep(name='short_{}'.format(i)) for i in range(10)]
+        executor = Executor(dependencies=[chain] + short_steps, max_workers=1, ready_policy=Executor.CRITICAL_PATH, scheduler=scheduler)
+        executor.execute()
+        assert RecordingStep.started[0] == 'chain_0'
+
+def test_execute_with_priority_policy():
+    RecordingStep.started = []
+    steps = [RecordingStep(name='step_{}'.format(i), priority=i) for i in range(5)]
+    executor = Executor(dependencies=steps, max_workers=1, ready_policy=Executor.PRIORITY)
+    executor.execute()
+    assert RecordingStep.started[0] == 'step_4'
+
+def test_execute_checks_deferred_fields():
+    with deferred_validation():
+        invalid = Marker(name='invalid', priority='high')
+    e = Executor(dependencies=[invalid])
+    try:
+        e.execute()
+    except TypeError:
+        pass
+    else:
+        assert False, "The executor should have checked the deferred fields"
+    assert not invalid.status.finished
+
+    with deferred_validation():
+        valid = Marker(name='valid', priority=2)
+    Executor(dependencies=[valid]).execute()
+    assert valid.status.finished
+    assert valid._unchecked_fields is None
+
+
+class Holder(object):
+    pass
+
+
+class HoldsPlainObject(Marker):
+    held = Reference(affects_execution_order=False)
+
+
+def test_execute_checks_deferred_fields_with_plain_references():
+    with deferred_validation():
+        step = HoldsPlainObject(name='holds', held=Holder())
+    Executor(dependencies=[step]).execute()
+    assert step.status.finished
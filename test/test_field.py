@@ -1,5 +1,6 @@
-from daisychain.field import Field, ListField, ValidatingObject
-from py3compat import string_types
+from abc import ABCMeta, abstractmethod
+from daisychain.field import Field, ListField, ValidatingObject, deferred_validation
+from py3compat import string_types, with_metaclass
 
 def outside_function_validator(value):
     assert value, "Outside validation failed"
@@ -399,3 +400,149 @@ def test_validating_object_when_thrown_unknown_kwargs():
         pass
     else:
         assert False, "Validating object should have thrown a type-error on kwargs for no known field being passed to it"
+
+def test_fields_shared_by_instances():
+    first, second = TestValid(), TestValid()
+    assert first.__fields__ is second.__fields__
+    assert set(first.__fields__) == set(attr for attr, _ in TestValid._find_fields())
+
+    class Subclass(TestValid):
+        pass
+
+    Subclass()
+    TestValid.added_later = Field(optional=True, default=1)
+    try:
+        assert 'added_later' in Subclass().__fields__
+        assert 'added_later' in TestValid().__fields__
+    finally:
+        del TestValid.added_later
+    assert 'added_later' not in TestValid().__fields__
+
+def test_find_fields_is_cached_per_class():
+    class Base(ValidatingObject):
+        b = Field(optional=True, default=1)
+        a = Field(optional=True, default=2)
+
+    class Shadowing(Base):
+        a = 'not a field'
+
+    assert [attr for attr, _ in Base._find_fields()] == ['a', 'b']
+    assert [attr for attr, _ in Shadowing._find_fields()] == ['b']
+    assert Base._field_map() is Base._field_map()
+
+    Shadowing.b = 'no longer a field'
+    assert list(Shadowing._find_fields()) == []
+    assert [attr for attr, _ in Base._find_fields()] == ['a', 'b']
+    del Shadowing.b
+    assert [attr for attr, _ in Shadowing._find_fields()] == ['b']
+
+    field_map = Base._field_map()
+    Base.instances = 0
+    Base.instances += 1
+    del Base.instances
+    assert Base._field_map() is field_map
+
+def test_abstract_base_class_mixin():
+    class Sized(with_metaclass(ABCMeta, object)):
+        @abstractmethod
+        def size(self):
+            pass
+
+    class Abstract(ValidatingObject, Sized):
+        length = Field(instance_of=int)
+
+    class Concrete(Abstract):
+        def size(self):
+            return self.length
+
+    try:
+        Abstract(length=1)
+    except TypeError:
+        pass
+    else:
+        assert False, "An abstract method should keep the class from being instantiated"
+    assert Concrete(length=3).size() == 3
+    assert isinstance(Concrete(length=3), Sized)
+
+    Concrete.extra = Field(optional=True, default=0)
+    assert 'extra' in Concrete(length=3).__fields__
+
+def test_validators_are_resolved_once_per_class():
+    class Checked(ValidatingObject):
+        threshold = 0
+        values = ListField(element_validator='check_element', optional=True, default=list())
+
+        def check_element(self, element):
+            return element > self.threshold
+
+    Checked(values=[1, 2, 3])
+    try:
+        Checked(values=[1, -1])
+    except TypeError:
+        pass
+    else:
+        assert False, "Element validator bound to the instance should have rejected -1"
+
+    class Lenient(Checked):
+        threshold = -2
+
+    Lenient(values=[1, -1])
+
+    Checked.check_element = lambda self, element: element < 0
+    Checked(values=[-1])
+    try:
+        Lenient(values=[1])
+    except TypeError:
+        pass
+    else:
+        assert False, "Replacing the validator method on the class should be picked up"
+
+def test_defaults_copied_only_when_mutable():
+    shared = ('a', 1, frozenset([2]))
+
+    class Defaults(ValidatingObject):
+        immutable = Field(optional=True, default=shared)
+        empty_list = ListField(optional=True)
+        flat_dict = Field(optional=True, default={'a': 1})
+        nested = Field(optional=True, default={'a': [1]})
+        factory = Field(optional=True, default_factory=lambda: {'made': True})
+
+    first, second = Defaults(), Defaults()
+    assert first.immutable is shared
+    assert first.empty_list == [] and first.empty_list is not second.empty_list
+    assert first.flat_dict == {'a': 1} and first.flat_dict is not second.flat_dict
+    first.nested['a'].append(2)
+    assert second.nested == {'a': [1]}
+    assert first.factory == {'made': True} and first.factory is not second.factory
+    assert Defaults.factory.optional
+
+    try:
+        Field(default=1, default_factory=int)
+    except TypeError:
+        pass
+    else:
+        assert False, "A field should not take both a default and a default_factory"
+
+def test_deferred_validation():
+    with deferred_validation():
+        ob = TestValid(validate_by_class_method=10)
+    assert ob.validate_by_class_method == 10
+    try:
+        ob.check_fields()
+    except TypeError:
+        pass
+    else:
+        assert False, "Checking the deferred fields should have caught the invalid value"
+
+    with deferred_validation():
+        ob = TestValid(validate_by_class_method=4)
+    ob.check_fields()
+    assert ob._unchecked_fields is None
+    ob.check_fields()
+
+    try:
+        TestValid(validate_by_class_method=10)
+    except TypeError:
+        pass
+    else:
+        assert False, "Fields should be checked again outside of deferred_validation"
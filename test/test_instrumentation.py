@@ -0,0 +1,57 @@
+from daisychain.executor import Executor
+from daisychain.instrumentation import Instrumentation, InstrumentationCollector
+from daisychain.step import Step
+from daisychain.steps.marker import Marker
+import json
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+class TwoChecks(Step):
+    def __init__(self, **fields):
+        super(TwoChecks, self).__init__(**fields)
+        self.checks = 0
+
+    def check_status(self):
+        if self.status.running:
+            self.checks += 1
+            if self.checks == 2:
+                self.status.set_finished()
+
+    def run(self):
+        pass
+
+
+def test_default_hooks_do_nothing():
+    step = Marker(name='marker')
+    Executor(dependencies=[step], instrumentation=Instrumentation()).execute()
+    assert step.finished
+
+
+def test_collector_report(tmpdir):
+    collector = InstrumentationCollector(clock=Clock())
+    first = Marker(name='first')
+    second = TwoChecks(name='second', dependencies=[first])
+    Executor(dependencies=[second], instrumentation=collector).execute()
+    assert second.finished
+
+    report = collector.report()
+    assert set(report['phases']) == {'validation', 'execution'}
+    assert report['phases']['execution']['seconds'] > 0
+    assert report['scans']['execution']['count'] >= 2
+    assert report['waits']['execution']['count'] == report['scans']['execution']['count']
+    assert report['steps']['second']['checks']['count'] >= 2
+    assert [stage for stage, _ in report['steps']['second']['transitions']] == ['validated', 'running', 'finished']
+    assert first.status.listeners is None or collector not in first.status.listeners
+
+    path = str(tmpdir.join('profile.json'))
+    collector.write_report(path)
+    with open(path) as f:
+        assert json.load(f)['steps']['first']['transitions'][-1][0] == 'finished'
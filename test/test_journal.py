@@ -0,0 +1,192 @@
+from daisychain.journal import Journal, config_hash, hash_config
+from daisychain.executor import Executor
+from daisychain.instantiator import Instantiator
+from daisychain.step import Step
+from daisychain.field import Field
+from daisychain.reference import Reference
+from daisychain.steps.authentication.basic_auth import BasicAuth
+import json
+import pytest
+
+
+class CountingStep(Step):
+    value = Field(instance_of=int, optional=True, default=0)
+    fail = Field(instance_of=bool, optional=True, default=False)
+    runs = []
+
+    def run(self):
+        CountingStep.runs.append(self.name)
+        if self.fail:
+            raise RuntimeError("mock failure")
+        self.status.set_finished()
+
+
+class NotRestorableStep(CountingStep):
+    restorable = False
+
+
+class SudoStep(CountingStep):
+    authentication = Reference(instance_of=BasicAuth)
+
+
+@pytest.fixture
+def journal(tmpdir):
+    return Journal(str(tmpdir.join('journal')), sync_every=2)
+
+
+def make_plan(fail=False):
+    first = CountingStep(name='first', value=1)
+    second = CountingStep(name='second', dependencies=[first], fail=fail)
+    third = NotRestorableStep(name='third', dependencies=[first])
+    return first, second, third
+
+
+def test_config_hash():
+    assert hash_config({'a': 1, 'b': [1, 2]}) == hash_config({'b': [1, 2], 'a': 1})
+    assert config_hash(CountingStep(name='a', value=1)) != config_hash(CountingStep(name='a', value=2))
+    dependencies = [CountingStep(name='dependency_{}'.format(i)) for i in range(20)]
+    assert config_hash(CountingStep(name='a', dependencies=dependencies)) == config_hash(CountingStep(name='a', dependencies=dependencies[::-1]))
+    step = CountingStep(name='a')
+    step.config_hash = 'from the plan'
+    assert config_hash(step) == 'from the plan'
+
+
+def test_journal_records(journal):
+    first, second, third = make_plan()
+    Executor(dependencies=[second, third], journal=journal).execute()
+    with open(journal.path) as f:
+        records = [json.loads(line) for line in f]
+    assert [(record['step'], record['stage']) for record in records if record['step'] == 'first'] == [('first', 'running'), ('first', 'finished')]
+    assert journal.load()['second'] == (config_hash(second), 'finished')
+
+
+def test_resume(journal):
+    CountingStep.runs = []
+    first, second, third = make_plan(fail=True)
+    Executor(dependencies=[second, third], journal=journal, on_failure=Executor.SKIP).execute()
+    assert journal.load()['second'][1] == Journal.FAILED
+    assert sorted(CountingStep.runs) == ['first', 'second', 'third']
+
+    CountingStep.runs = []
+    first, second, third = make_plan()
+    execution = Executor(dependencies=[second, third], journal=journal, resume=True).execute()
+    assert sorted(CountingStep.runs) == ['second', 'third']
+    assert execution.finished_steps == {first, second, third}
+
+
+def test_resume_reruns_changed_steps(journal):
+    first, second, third = make_plan()
+    Executor(dependencies=[second, third], journal=journal).execute()
+
+    CountingStep.runs = []
+    first, second, third = make_plan()
+    first.value = 2
+    Executor(dependencies=[second, third], journal=journal, resume=True).execute()
+    assert sorted(CountingStep.runs) == ['first', 'second', 'third']
+
+
+def make_sudo_plan(fail=False, value=0):
+    setup = CountingStep(name='setup', value=value)
+    auth = BasicAuth(name='auth', username='user', password='password', dependencies=[setup])
+    sudo = SudoStep(name='sudo', authentication=auth)
+    after = CountingStep(name='after', dependencies=[sudo], fail=fail)
+    return auth, sudo, after
+
+
+def test_resume_past_steps_that_are_not_restorable(journal):
+    CountingStep.runs = []
+    auth, sudo, after = make_sudo_plan(fail=True)
+    Executor(dependencies=[after], journal=journal, on_failure=Executor.SKIP).execute()
+    assert CountingStep.runs == ['setup', 'sudo', 'after']
+
+    CountingStep.runs = []
+    auth, sudo, after = make_sudo_plan()
+    execution = Executor(dependencies=[after], journal=journal, resume=True).execute()
+    assert CountingStep.runs == ['after']
+    assert auth in execution.finished_steps and sudo in execution.finished_steps
+
+    CountingStep.runs = []
+    auth, sudo, after = make_sudo_plan(value=1)
+    Executor(dependencies=[after], journal=journal, resume=True).execute()
+    assert CountingStep.runs == ['setup', 'sudo', 'after']
+
+
+def test_load_ignores_truncated_records(journal):
+    journal.write({'step': 'first', 'config': 'hash', 'stage': 'finished'})
+    journal.close()
+    with open(journal.path, 'a') as f:
+        f.write('{"step": "sec')
+    assert journal.load() == {'first': ('hash', 'finished')}
+
+
+def test_resume_requires_journal():
+    try:
+        Executor(resume=True)
+    except ValueError:
+        pass
+    else:
+        assert False, "Should have thrown a Value Error when resuming without a journal"
+
+
+def test_instantiated_steps_have_config_hashes():
+    config = {
+        "first": {"class": "daisychain.steps.marker.Marker"},
+        "second": {"class": "daisychain.steps.marker.Marker", "dependencies": ["first"]},
+    }
+    instantiator = Instantiator(config=config)
+    instantiator.run()
+    assert getattr(instantiator.steps['first'], 'config_hash', None) is None
+    first_hash = config_hash(instantiator.steps['first'])
+    assert instantiator.steps['first'].config_hash == first_hash
+    assert first_hash != config_hash(instantiator.steps['second'])
+
+
+def make_diamond():
+    source = CountingStep(name='source', value=1)
+    left = CountingStep(name='left', dependencies=[source])
+    right = CountingStep(name='right', dependencies=[source])
+    sink = CountingStep(name='sink', dependencies=[left, right])
+    unrelated = CountingStep(name='unrelated')
+    credentials = NotRestorableStep(name='credentials')
+    left.dependencies.add(credentials)
+    return source, left, right, sink, unrelated, credentials
+
+
+def test_dirty_steps(journal):
+    steps = make_diamond()
+    executor = Executor(dependencies=list(steps), journal=journal)
+    executor.execute()
+    assert journal.dirty_steps(executor.plan_graph) == set()
+
+    source, left, right, sink, unrelated, credentials = make_diamond()
+    left.value = 2
+    executor = Executor(dependencies=[sink, unrelated], since=journal)
+    assert journal.dirty_steps(executor.compile_plan()) == {left, sink, credentials}
+
+
+def test_since(journal):
+    Executor(dependencies=list(make_diamond()), journal=journal).execute()
+
+    CountingStep.runs = []
+    source, left, right, sink, unrelated, credentials = make_diamond()
+    right.value = 2
+    execution = Executor(dependencies=[sink, unrelated, credentials], journal=journal, since=journal).execute()
+    assert sorted(CountingStep.runs) == ['right', 'sink']
+    assert all(step.status.finished for step in (source, left, right, sink, unrelated, credentials))
+    assert len(execution.finished_steps) == 6
+
+    CountingStep.runs = []
+    source, left, right, sink, unrelated, credentials = make_diamond()
+    right.value = 2
+    Executor(dependencies=[sink, unrelated, credentials], since=journal).execute()
+    assert CountingStep.runs == []
+
+
+def test_since_cannot_be_combined_with_resume():
+    journal = Journal('/tmp/unused-journal')
+    try:
+        Executor(journal=journal, resume=True, since=journal)
+    except ValueError:
+        pass
+    else:
+        assert False, "Should have thrown a Value Error when resuming and rerunning changed steps at once"
@@ -0,0 +1,51 @@
+from daisychain.json_stream import JsonStreamReader, iter_steps
+import io
+import json
+import pytest
+
+PLAN = {
+    '__compilers__': ['daisychain.steps.compilers.step_config_inheritance.StepConfigInheritance'],
+    'steps': {
+        'step1': {'class': 'daisychain.steps.marker.Marker', 'dependencies': []},
+        'step2': {'class': 'daisychain.steps.marker.Marker', 'dependencies': ['step1'], 'priority': 12345},
+        'step3': {'class': 'daisychain.steps.marker.Marker', 'dependencies': ['step1', 'step2'], 'note': u'café ☃'},
+    },
+    'other': [1, 2.5, None, True],
+}
+
+
+def test_iter_steps_small_chunks():
+    document = json.dumps(PLAN, indent=2).encode('utf-8')
+    # A chunk size of one splits every token and every multi-byte character across reads
+    for chunk_size in (1, 7, 4096):
+        top_level = dict()
+        steps = list(iter_steps(io.BytesIO(document), top_level=top_level, chunk_size=chunk_size))
+        assert dict(steps) == PLAN['steps']
+        assert sorted(name for name, _ in steps) == ['step1', 'step2', 'step3']
+        assert top_level == {'__compilers__': PLAN['__compilers__'], 'other': PLAN['other']}
+
+
+def test_iter_steps_text_and_empty():
+    assert list(iter_steps(io.StringIO(u'{"steps": {}}'))) == []
+    assert list(iter_steps(io.StringIO(u' { } '))) == []
+
+
+def test_iter_steps_yields_one_at_a_time():
+    document = io.StringIO(u'{"steps": {"step1": {"class": "a"}, "step2": {"class": "b"}, "step3": ')
+    steps = iter_steps(document, chunk_size=8)
+    assert next(steps) == (u'step1', {u'class': u'a'})
+    assert next(steps) == (u'step2', {u'class': u'b'})
+    with pytest.raises(ValueError):
+        next(steps)
+
+
+def test_reader_rejects_malformed_documents():
+    for document in (u'[1, 2]', u'{"steps": {"step1": 1,}}', u'{"steps": {}} {}', u'{1: 2}'):
+        with pytest.raises(ValueError):
+            list(iter_steps(io.StringIO(document), chunk_size=3))
+
+
+def test_reader_numbers_across_chunks():
+    reader = JsonStreamReader(io.StringIO(u'{"a": 1234567890, "b": -1.5e10}'), chunk_size=2)
+    values = dict((key, reader.value()) for key in reader.members())
+    assert values == {'a': 1234567890, 'b': -1.5e10}
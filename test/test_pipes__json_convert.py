@@ -1,5 +1,6 @@
 from daisychain.steps.input import InMemoryInput
-from daisychain.steps.pipes.json_convert import JsonLoad, JsonDump
+from daisychain.steps.inputs.file import InputFile
+from daisychain.steps.pipes.json_convert import JsonLoad, JsonDump, JsonStreamLoad
 import json
 
 from .util import compare_trees
@@ -26,3 +27,26 @@ def test_dump_with_args():
     pipe.run()
     compare_trees(json.loads(pipe.output), input_config)
     assert '\n' in pipe.output or '\r' in pipe.output
+
+def test_stream_load():
+    input_config = {'__compilers__': [], 'steps': {'step1': {'param1': 'value1'}, 'step2': {'param2': ['value2']}}}
+    for output in (json.dumps(input_config), json.dumps(input_config).encode('utf-8')):
+        pipe = JsonStreamLoad(input_step=InMemoryInput(output=output))
+        pipe.run()
+        assert pipe.finished
+        compare_trees(pipe.output, input_config)
+    assert not JsonStreamLoad.cacheable
+
+
+def test_stream_load_closes_streamed_file(tmpdir):
+    input_config = {'steps': {'step1': {'param1': 'value1'}}}
+    path = tmpdir.join('plan.json')
+    path.write(json.dumps(input_config))
+    input_file = InputFile(path=str(path), stream=True)
+    input_file.run()
+    mapped = input_file.output
+    pipe = JsonStreamLoad(input_step=input_file)
+    pipe.run()
+    compare_trees(pipe.output, input_config)
+    assert mapped.closed
+    assert input_file.output is None
@@ -0,0 +1,121 @@
+from daisychain.plan_graph import PlanGraph, transitive_reduction
+from daisychain.reference import ReferencingObject, Reference, ReferenceList, CircularReferenceError
+from daisychain.executor import Executor, Execution
+from daisychain.steps.marker import Marker
+from mock import patch
+
+
+class TestRef(ReferencingObject):
+    ref = Reference(instance_of=ReferencingObject, optional=True)
+    reflist = ReferenceList(elements_of=ReferencingObject, optional=True)
+    non_exec_ref = Reference(optional=True, affects_execution_order=False)
+
+
+def test_graph():
+    t = TestRef(name='t')
+    t2 = TestRef(name='t2', ref=t)
+    t3 = TestRef(name='t3', ref=t)
+    t4 = TestRef(name='t4', reflist=[t2, t3])
+    graph = PlanGraph(t4)
+
+    assert graph.root_id == 0
+    assert graph.nodes[0] is t4
+    assert set(graph.nodes) == {t, t2, t3, t4}
+    for node in graph.nodes:
+        assert graph.nodes[graph.node_ids[node]] is node
+
+    ids = graph.node_ids
+    assert set(graph.producers[ids[t4]]) == {ids[t2], ids[t3]}
+    assert set(graph.consumers[ids[t]]) == {ids[t2], ids[t3]}
+    assert graph.consumers[ids[t4]] == ()
+    assert graph.execution_producers == graph.producers
+
+    order = graph.execution_order
+    assert len(order) == 4
+    assert order.index(ids[t]) < order.index(ids[t2]) < order.index(ids[t4])
+    assert order.index(ids[t3]) < order.index(ids[t4])
+
+    assert graph.all_references == {t, t2, t3}
+    assert graph.all_execution_references == {t, t2, t3}
+    assert graph.ancestors(t2) == {t}
+    assert graph.ancestors(t4) == {t, t2, t3}
+    assert [set(generation) for generation in graph.generations()] == [{ids[t]}, {ids[t2], ids[t3]}, {ids[t4]}]
+
+def test_non_execution_references():
+    t = TestRef(name='t')
+    watched = TestRef(name='watched')
+    t2 = TestRef(name='t2', ref=t, non_exec_ref=watched)
+    graph = PlanGraph(t2)
+    ids = graph.node_ids
+
+    assert set(graph.producers[ids[t2]]) == {ids[t], ids[watched]}
+    assert graph.execution_producers[ids[t2]] == (ids[t],)
+    assert not graph.is_execution_node[ids[watched]]
+    assert graph.all_references == {t, watched}
+    assert graph.all_execution_references == {t}
+    assert graph.ancestors(t2, for_execution=True) == {t}
+
+def test_non_execution_cycle_is_allowed():
+    t = TestRef(name='t')
+    t2 = TestRef(name='t2', ref=t, non_exec_ref=t)
+    t.non_exec_ref = t2
+    graph = PlanGraph(t2)
+    assert graph.execution_order == (graph.node_ids[t], graph.node_ids[t2])
+    try:
+        graph.order(for_execution=False)
+    except CircularReferenceError:
+        pass
+    else:
+        assert False, "Should have thrown a CircularReferenceError"
+
+def test_execution_cycle():
+    t = TestRef(name='t')
+    t2 = TestRef(name='t2', ref=t)
+    t3 = TestRef(name='t3', reflist=[t2])
+    t.ref = t3
+    try:
+        PlanGraph(t3)
+    except CircularReferenceError:
+        pass
+    else:
+        assert False, "Should have thrown a CircularReferenceError"
+
+def test_executor_graph_excludes_executor():
+    s1 = Marker(name='s1')
+    s2 = Marker(name='s2', dependencies=[s1])
+    e = Executor(name='test_executor', dependencies=[s2])
+    graph = e.compile_plan()
+    assert e.plan_graph is graph
+    assert graph.root_id is None
+    assert set(graph.nodes) == {s1, s2}
+    assert graph.all_references == {s1, s2}
+    assert [graph.nodes[i] for i in graph.execution_order] == [s1, s2]
+
+def test_execute_compiles_plan_once():
+    s1 = Marker(name='s1')
+    s2 = Marker(name='s2', dependencies=[s1])
+    e = Executor(name='test_executor', dependencies=[s2])
+    with patch('daisychain.executor.PlanGraph', wraps=PlanGraph) as MockPlanGraph:
+        e.execute()
+        assert MockPlanGraph.call_count == 1
+    assert s2.finished
+
+def test_transitive_reduction():
+    # 0 -> 1 -> 2 -> 3, with shortcuts 0 -> 2, 0 -> 3 and 1 -> 3, plus 4 on its own feeding 3
+    producers = {0: (), 1: (0,), 2: (0, 1), 3: (0, 1, 2, 4), 4: ()}
+    reduced = transitive_reduction([0, 4, 1, 2, 3], producers)
+    assert reduced == {0: (), 1: (0,), 2: (1,), 3: (2, 4), 4: ()}
+
+def test_reduced_execution_producers():
+    s1 = Marker(name='s1')
+    s2 = Marker(name='s2', dependencies=[s1])
+    s3 = Marker(name='s3', dependencies=[s1, s2])
+    e = Executor(name='test_executor', dependencies=[s3])
+    graph = e.compile_plan()
+    ids = graph.node_ids
+    assert set(graph.execution_producers[ids[s3]]) == {ids[s1], ids[s2]}
+    assert graph.reduced_execution_producers[ids[s3]] == (ids[s2],)
+    assert graph.reduced_execution_consumers[ids[s1]] == (ids[s2],)
+    assert s3.dependencies == {s1, s2}
+    e.execute()
+    assert s3.finished
@@ -0,0 +1,71 @@
+from daisychain.executor import Executor
+from daisychain.reachability import ReachabilityIndex, mask_ids
+from daisychain.steps.marker import Marker
+from daisychain.steps.monitor import Monitor
+
+
+class NoOpMonitor(Monitor):
+    def run(self):
+        pass
+
+
+def make_plan():
+    s1 = Marker(name='s1')
+    s2 = Marker(name='s2', dependencies=[s1])
+    s3 = Marker(name='s3', dependencies=[s1, s2])
+    other = Marker(name='other')
+    return Executor(name='test_executor', dependencies=[s3, other]), s1, s2, s3, other
+
+
+def test_mask_ids():
+    assert list(mask_ids(0)) == []
+    assert list(mask_ids(0b101001)) == [0, 3, 5]
+
+
+def test_ancestors_and_descendants():
+    executor, s1, s2, s3, other = make_plan()
+    index = ReachabilityIndex(executor.compile_plan())
+    assert index.ancestors(s3) == {s1, s2}
+    assert index.ancestors(s1) == set()
+    assert index.descendants(s1) == {s2, s3}
+    assert index.is_upstream(s1, of=s3)
+    assert not index.is_upstream(s3, of=s1)
+    assert not index.is_upstream(other, of=s3)
+    assert s1 in index and executor not in index
+
+
+def test_failed_ancestor_follows_statuses():
+    executor, s1, s2, s3, other = make_plan()
+    index = executor.reachability()
+    assert executor.reachability() is index
+    assert index.failed_ancestor(s3) is None
+
+    s1.status.set_failed(RuntimeError("failed"))
+    assert index.failed_ancestor(s3) is s1
+    assert index.failed_ancestor(other) is None
+    s1.status.set_pending()
+    assert index.failed_ancestor(s3) is None
+
+    executor.release_reachability()
+    assert index not in (s1.status.listeners or [])
+
+
+def test_monitor_sees_failed_ancestor():
+    executor, s1, s2, s3, other = make_plan()
+    monitor = NoOpMonitor(name='monitor', watches=[s3])
+    monitor.executor = executor
+    s1.status.set_failed(RuntimeError("failed"))
+    assert monitor.get_watched_steps_status() is s1.status
+
+
+def test_monitor_after_check_status_failure_is_reverted():
+    executor, s1, s2, s3, other = make_plan()
+    monitor = NoOpMonitor(name='monitor', watches=[s3])
+    monitor.executor = executor
+    s1.status.callback = lambda: 1 / 0
+    s1.status.check()
+    assert monitor.get_watched_steps_status() is s1.status
+
+    s1.status.stage.revert()
+    assert executor.reachability().failed_ancestor(s3) is None
+    assert monitor.get_watched_steps_status() is s3.status
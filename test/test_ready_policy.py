@@ -0,0 +1,49 @@
+from daisychain.ready_policy import ReadyPolicy, FifoPolicy, PriorityPolicy, CriticalPathPolicy
+from daisychain.executor import Executor, Execution
+from daisychain.step import Step
+
+
+class MockStep(Step):
+    def run(self):
+        self.status.set_finished()
+
+
+def make_execution(*steps):
+    return Execution(executor=Executor(dependencies=list(steps)))
+
+
+def test_fifo():
+    first, second = MockStep(name='first'), MockStep(name='second')
+    execution = make_execution(first, second)
+    execution.ready_sequence = {first: 1, second: 0}
+    assert FifoPolicy().order(execution, [first, second]) == [second, first]
+
+
+def test_priority():
+    low, high, tie = MockStep(name='low', priority=-1), MockStep(name='high', priority=5), MockStep(name='tie', priority=5)
+    execution = make_execution(low, high, tie)
+    execution.ready_sequence = {low: 0, high: 2, tie: 1}
+    assert PriorityPolicy().order(execution, [low, high, tie]) == [tie, high, low]
+
+
+def test_critical_path():
+    chain_end = MockStep(name='chain_end', cost=3)
+    chain_middle = MockStep(name='chain_middle', dependencies=[chain_end])
+    chain_head = MockStep(name='chain_head', dependencies=[chain_middle])
+    short = MockStep(name='short', cost=2)
+    execution = make_execution(chain_head, short)
+    policy = CriticalPathPolicy()
+    policy.prepare(execution)
+    assert policy.remaining_path[chain_end] == 5
+    assert policy.remaining_path[chain_head] == 1
+    assert policy.order(execution, [short, chain_end]) == [chain_end, short]
+
+
+def test_custom_policy():
+    class ByName(ReadyPolicy):
+        def key(self, execution, step):
+            return step.name
+
+    steps = [MockStep(name=name) for name in 'cab']
+    execution = make_execution(*steps)
+    assert [step.name for step in ByName().order(execution, steps)] == ['a', 'b', 'c']
@@ -50,6 +50,8 @@ def test_non_referencing_reference():
     assert t2.all_references == {t, 5}
     for actual, expected in zip(list(t2.reference_generations()), [{5}, {t}, {t2}]):
         assert actual == expected
+    assert list(t2.reference_generations()) == [{5}, {t}, {t2}]
+    assert list(t2.reference_generations(for_execution=True)) == [{t}, {t2}]
 
     assert t.any_object_ref == 5
     assert t.get_references() == {5}
@@ -329,21 +331,47 @@ def test_circular_ref_cross_tree():
         else:
             assert False, "Should have thrown a CircularReferenceError"
 
-def test_maximum_recursion_error():
+def test_no_maximum_depth():
     t = TestRef(name='t')
-    t.create_mock_tree(layers=MAXIMUM_REFERENCE_DEPTH + 1, layer_size=1)
-    try:
-        t.all_references
-    except ExceedsMaximumDepthError:
-        pass
-    else:
-        assert False, "Should have raised the ExceedsMaximumDepthError"
+    leaf = t
+    for i in range(MAXIMUM_REFERENCE_DEPTH * 4):
+        leaf.ref = TestRef(name='t_{}'.format(i))
+        leaf = leaf.ref
+    assert len(t.all_references) == MAXIMUM_REFERENCE_DEPTH * 4
+    generations = list(t.reference_generations())
+    assert generations[0] == {leaf}
+    assert generations[-1] == {t}
 
 def test_maximum_depth():
     t = TestRef(name='t')
     t.create_mock_tree(layers=MAXIMUM_REFERENCE_DEPTH - 2, layer_size=1)
     t.all_references
 
+def test_circular_reference_error_message():
+    t = TestRef(name='t')
+    t2 = TestRef(name='t2', ref=t)
+    t3 = TestRef(name='t3', reflist=[t2])
+    t.ref = t3
+    try:
+        t3.all_references
+    except CircularReferenceError as e:
+        message = str(e)
+        assert "Circular Reference Found: {!r}".format(t3) in message
+        assert "{!r}.reflist".format(t3) in message
+        assert "{!r}.ref".format(t) in message
+        assert "{!r}.ref".format(t2) in message
+    else:
+        assert False, "Should have thrown a CircularReferenceError"
+
+    t = TestRef(name='t')
+    t.ref = t
+    try:
+        t.all_references
+    except CircularReferenceError as e:
+        assert 'refers to itself through ref' in str(e)
+    else:
+        assert False, "Should have thrown a CircularReferenceError"
+
 """
 def test_performance_tracing_1000_node_3_deep_tree():
     t = TestRef(name='t')
@@ -0,0 +1,78 @@
+from daisychain.result_cache import ResultCache, result_key, content_key
+from daisychain.executor import Executor
+from daisychain.steps.input import InMemoryInput
+from daisychain.steps.pipes.json_convert import JsonLoad, JsonDump
+from daisychain.steps.pipe import Pipe
+from daisychain.field import Field
+import os
+
+
+class CountingPipe(Pipe):
+    suffix = Field(instance_of=str, optional=True, default='!')
+    runs = 0
+
+    def run(self):
+        CountingPipe.runs += 1
+        self.output = self.input_step.output + self.suffix
+        self.status.set_finished()
+
+
+def test_result_key():
+    first = CountingPipe(name='first', input_step=InMemoryInput(output='a'))
+    renamed = CountingPipe(name='renamed', input_step=InMemoryInput(output='a'))
+    other_input = CountingPipe(input_step=InMemoryInput(output='b'))
+    other_field = CountingPipe(input_step=InMemoryInput(output='a'), suffix='?')
+    assert result_key(first) == result_key(renamed)
+    assert result_key(first) != result_key(other_input)
+    assert result_key(first) != result_key(other_field)
+
+    chained = CountingPipe(input_step=first)
+    first.result_key = 'mock key'
+    assert content_key(first) == 'mock key'
+    assert result_key(chained) != result_key(CountingPipe(input_step=renamed))
+
+    assert result_key(JsonDump(input_step=InMemoryInput(output={}), indent=2)) != result_key(JsonDump(input_step=InMemoryInput(output={})))
+
+
+def test_cache_get_put(tmpdir):
+    directory = str(tmpdir)
+    cache = ResultCache(directory)
+    assert cache.get('key') == (False, None)
+    cache.put('key', {'a': [1, 2]})
+    assert cache.get('key') == (True, {'a': [1, 2]})
+    assert ResultCache(directory).get('key') == (True, {'a': [1, 2]})
+    cache.clear()
+    assert cache.get('key') == (False, None)
+
+
+def test_cache_eviction(tmpdir):
+    directory = str(tmpdir)
+    cache = ResultCache(directory, max_bytes=2500)
+    for i in range(3):
+        cache.put('key_{}'.format(i), 'x' * 1000)
+        os.utime(os.path.join(directory, 'key_{}.pickle'.format(i)), (i, i))
+    cache.put('key_3', 'x' * 1000)
+    assert cache.size() <= 2500
+    assert cache.get('key_0') == (False, None)
+    assert cache.get('key_3')[0]
+
+
+def test_executor_restores_cached_outputs(tmpdir):
+    directory = str(tmpdir)
+    CountingPipe.runs = 0
+    for expected_runs, text in ((2, 'a'), (2, 'a'), (4, 'b')):
+        cache = ResultCache(directory)
+        first = CountingPipe(name='first', input_step=InMemoryInput(output=text))
+        second = CountingPipe(name='second', input_step=first)
+        Executor(dependencies=[second], result_cache=cache).execute()
+        assert second.output == text + '!!'
+        assert second.status.finished
+        assert CountingPipe.runs == expected_runs
+
+
+def test_executor_caches_json_load(tmpdir):
+    directory = str(tmpdir)
+    cache = ResultCache(directory)
+    load = JsonLoad(input_step=InMemoryInput(output='{"steps": {}}'))
+    Executor(dependencies=[load], result_cache=cache).execute()
+    assert cache.get(load.result_key) == (True, {'steps': {}})
@@ -77,23 +77,14 @@ def test_prune():
     assert t.dependencies == {dep}
 
 def test_prune_beyond_maximum_depth():
-    dep = MockStep()
+    first = dep = MockStep()
     for i in range(MAXIMUM_REFERENCE_DEPTH + 10):
-        dep = MockStep(dependencies=[dep])
+        dep = MockStep(dependencies=[dep, first])
 
-    try:
-        dep.all_references
-    except ExceedsMaximumDepthError:
-        pass
-    else:
-        assert False, "Should have exceeded the maximum depth on this call"
-
-    try:
-        dep.prune()
-    except ExceedsMaximumDepthError:
-        pass
-    else:
-        assert False, "Should have exceeded the maximum depth on this call"
+    assert len(dep.all_references) == MAXIMUM_REFERENCE_DEPTH + 10
+    assert len(dep.prune()) == MAXIMUM_REFERENCE_DEPTH + 10
+    assert first not in dep.dependencies
+    assert len(dep.dependencies) == 1
 
 def test_prune_circular_dependency():
     dep = MockStep()
@@ -205,3 +196,17 @@ def test_prompt_user_for_status():
     s.prompt_user_for_status()
     assert isinstance(s.status.stage, TypeError)
 
+
+def test_polls_status():
+    class NonPollingStep(Step):
+        def run(self):
+            self.status.set_finished()
+
+    assert MockStep().polls_status
+    assert not NonPollingStep().polls_status
+
+    s = NonPollingStep()
+    s.status.callback = None
+    assert not s.polls_status
+    s.status.callback = lambda: None
+    assert s.polls_status
@@ -98,3 +98,61 @@ def test_callback():
     assert not s.finished
     assert not s.failed
     assert s.stage is s.PENDING
+
+def test_listeners():
+    s = StepStatus()
+    assert s.listeners is None
+    transitions = []
+    listener = lambda status, stage: transitions.append((status, stage))
+    s.add_listener(listener)
+
+    s.set_validated()
+    s.set_running()
+    s.set_finished()
+    exception = RuntimeError('mock error')
+    s.set_failed(exception)
+    s.set_pending()
+    assert transitions == [(s, s.VALIDATED), (s, s.RUNNING), (s, s.FINISHED), (s, exception), (s, s.PENDING)]
+
+    s.remove_listener(listener)
+    assert s.listeners is None
+    s.set_running()
+    assert len(transitions) == 5
+
+def test_codes():
+    s = StepStatus()
+    assert s.code == StepStatus.PENDING_CODE
+    s.set_validated()
+    assert s.code == StepStatus.VALIDATED_CODE
+    s.set_running()
+    assert s.code == StepStatus.RUNNING_CODE
+    s.set_finished()
+    assert s.code == StepStatus.FINISHED_CODE
+    s.set_failed(RuntimeError('mock error'))
+    assert s.code == StepStatus.FAILED_CODE
+
+    s.stage = 'not a known stage'
+    assert s.failed
+    assert s.code == StepStatus.FAILED_CODE
+    s.stage = StepStatus.RUNNING
+    assert s.running
+    assert s.code == StepStatus.RUNNING_CODE
+
+def test_compact_status():
+    import pickle
+    s = StepStatus()
+    assert s._lock is None
+    assert s.lock is s.lock
+    assert not s.__dict__
+    s.process = 'mock process'
+    assert s.__dict__ == {'process': 'mock process'}
+
+    s.set_running()
+    s.add_listener(lambda status, stage: None)
+    s.callback = lambda: None
+    copied = pickle.loads(pickle.dumps(s))
+    assert copied.running
+    assert copied.process == 'mock process'
+    assert copied.listeners is None
+    assert copied.callback is None
+    assert copied.lock is not s.lock
@@ -0,0 +1,78 @@
+from daisychain.step_table import StepTable
+from daisychain.executor import Executor, Execution
+from daisychain.steps.marker import Marker
+
+
+def make_execution():
+    first = Marker(name='first')
+    second = Marker(name='second', dependencies=[first])
+    executor = Executor(dependencies=[second])
+    return Execution(executor=executor), first, second
+
+
+def test_counts_follow_moves():
+    execution, first, second = make_execution()
+    table = execution.table
+    assert len(execution.all_refs) == 2
+    assert table.counts[StepTable.WAITING] == 1
+    assert len(execution.working_set) == 1 and first in execution.working_set
+    assert second not in execution.working_set and second in execution.all_refs
+    assert execution.executor not in execution.all_refs
+
+    execution.consider_step_finished(first)
+    execution.add_consumers_to_working_set(first)
+    assert execution.finished_steps == {first}
+    assert execution.working_set == {second}
+    assert table.counts[StepTable.WAITING] == 0
+
+    execution.consider_step_failed(second)
+    assert len(execution.working_set) == 0
+    assert set([second]) == execution.failed_steps
+    try:
+        execution.consider_step_failed(second)
+    except KeyError:
+        pass
+    else:
+        assert False, "A step that left the working set cannot fail again"
+
+
+def test_weights_follow_moves():
+    execution, first, second = make_execution()
+    table = execution.table
+    weights = [0.0] * len(execution.plan_graph.nodes)
+    weights[execution.plan_graph.node_ids[first]] = 2.0
+    weights[execution.plan_graph.node_ids[second]] = 3.0
+    table.set_weights(weights)
+    assert table.weight_totals[StepTable.WORKING] == 2.0
+    assert table.weight_totals[StepTable.WAITING] == 3.0
+
+    execution.consider_step_finished(first)
+    execution.add_consumers_to_working_set(first)
+    assert table.weight_totals[StepTable.FINISHED] == 2.0
+    assert table.weight_totals[StepTable.WORKING] == 3.0
+    assert table.weight_totals[StepTable.WAITING] == 0.0
+
+
+def test_views_take_steps_outside_the_plan():
+    execution = Execution()
+    outsider = Marker(name='outsider')
+    execution.working_set.discard(outsider)
+    execution.failed_steps.add(outsider)
+    assert outsider in execution.failed_steps
+    assert len(execution.failed_steps) == 1
+    assert list(execution.all_refs) == [outsider]
+
+
+def test_snapshot_is_read_only_and_frozen():
+    execution, first, second = make_execution()
+    snapshot = execution.snapshot()
+    execution.consider_step_finished(first)
+    assert snapshot.in_flight == 1 and snapshot.finished == 0 and snapshot.total == 2
+    assert first in snapshot.working_set
+    assert first in execution.finished_steps
+    try:
+        snapshot.finished_steps.add(first)
+    except TypeError:
+        pass
+    else:
+        assert False, "Snapshots should not be writable"
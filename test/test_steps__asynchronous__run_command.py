@@ -0,0 +1,19 @@
+from daisychain.steps.asynchronous.run_command import AsyncRunCommand
+from daisychain.async_executor import AsyncExecutor
+from daisychain.executor import Executor
+import subprocess
+
+def test_basic_command():
+    c = AsyncRunCommand(command='ls -l')
+    assert 'ls -l' in c.instructions
+    executor = AsyncExecutor(dependencies=[c])
+    executor.execute()
+    assert c.status.finished
+    assert c.status.process.returncode == 0
+
+def test_failing_command():
+    c = AsyncRunCommand(command='false')
+    executor = AsyncExecutor(dependencies=[c], on_failure=Executor.SKIP)
+    executor.execute()
+    assert c.status.failed
+    assert isinstance(c.status.stage, subprocess.CalledProcessError)
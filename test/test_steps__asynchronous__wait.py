@@ -0,0 +1,17 @@
+from daisychain.steps.asynchronous.wait import AsyncWait
+from daisychain.async_executor import AsyncExecutor
+import time
+
+def test_init():
+    w = AsyncWait(seconds=4321)
+    assert w.start_time is None
+    assert w.instructions is not None
+    assert not w.polls_status
+
+def test_run():
+    w = AsyncWait(seconds=0.1)
+    executor = AsyncExecutor(dependencies=[w])
+    start_time = time.time()
+    executor.execute()
+    assert time.time() - start_time > 0.1
+    assert w.status.finished
@@ -8,3 +8,13 @@ def test_input_file():
     i.run()
     assert i.finished
     assert TEST_STRING in i.output
+
+def test_input_file_stream():
+    i = InputFile(path=__file__, stream=True)
+    i.run()
+    assert i.finished
+    mapped = i.output
+    assert TEST_STRING.encode('utf-8') in mapped.read()
+    i.close()
+    assert i.output is None
+    assert mapped.closed
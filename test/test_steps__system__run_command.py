@@ -110,3 +110,20 @@ def test_failing_auth_command():
             assert False, "Exception was not raised".format(e)
         assert validate_mock.communicate.call_count == 1
         auth_validate_mock.communicate.assert_called_once_with('mockpassword\n')
+
+def test_validation_key():
+    assert RunCommand(command='ls -l').validation_key() == RunCommand(command=['ls', '-a']).validation_key()
+    assert RunCommand(command='ls -l').validation_key() != RunCommand(command='cat -n').validation_key()
+
+    class CheckedRunCommand(RunCommand):
+        def validate(self):
+            self.status.set_validated()
+
+    assert CheckedRunCommand(command='ls -l').validation_key() != RunCommand(command='ls -l').validation_key()
+    assert CheckedRunCommand(command='ls -l').validation_key() == CheckedRunCommand(command='ls -a').validation_key()
+
+def test_command_with_process_pool():
+    commands = [RunCommand(name='true_{}'.format(i), command='true', poll_interval_seconds=0) for i in range(2)]
+    executor = Executor(dependencies=commands, max_workers=2, pool=Executor.PROCESS_POOL)
+    executor.execute()
+    assert all(command.finished for command in commands)
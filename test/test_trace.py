@@ -0,0 +1,60 @@
+from daisychain.executor import Executor
+from daisychain.trace import TraceRecorder
+from daisychain.step import Step
+from daisychain.steps.marker import Marker
+from daisychain.steps.input import InMemoryInput
+from daisychain.steps.pipes.json_convert import JsonLoad
+import json
+
+
+class Failing(Step):
+    def run(self):
+        raise RuntimeError("fails")
+
+
+def test_spans_and_flows(tmpdir):
+    recorder = TraceRecorder()
+    first = Marker(name='first')
+    second = Marker(name='second', dependencies=[first])
+    Executor(dependencies=[second], instrumentation=recorder, max_workers=2).execute()
+
+    spans = dict(((step.name, category), (start, end, outcome)) for step, category, start, end, _, outcome in recorder.spans())
+    assert set(spans) == {('first', 'validate'), ('first', 'run'), ('second', 'validate'), ('second', 'run')}
+    assert spans[('first', 'run')][2] == 'finished'
+    assert spans[('first', 'run')][1] <= spans[('second', 'run')][0]
+
+    trace = recorder.trace()
+    phases = [event['ph'] for event in trace['traceEvents']]
+    assert phases.count('X') == 4
+    assert phases.count('s') == phases.count('f') == 1
+    assert 'M' in phases
+
+    path = str(tmpdir.join('trace.json'))
+    recorder.write_trace(path)
+    with open(path) as f:
+        assert json.load(f)['traceEvents']
+
+
+def test_flows_follow_references():
+    recorder = TraceRecorder()
+    source = InMemoryInput(name='source', output='{"a": 1}')
+    load = JsonLoad(name='load', input_step=source)
+    Executor(dependencies=[load], instrumentation=recorder).execute()
+
+    events = recorder.trace()['traceEvents']
+    flow_starts = [event for event in events if event['ph'] == 's']
+    flow_ends = [event for event in events if event['ph'] == 'f']
+    assert len(flow_starts) == len(flow_ends) == 1
+    source_run, = [event for event in events if event['ph'] == 'X' and event['name'] == 'source' and event['cat'] == 'run']
+    assert flow_starts[0]['ts'] == source_run['ts'] + source_run['dur']
+
+
+def test_failed_run_span():
+    recorder = TraceRecorder()
+    failing = Failing(name='failing')
+    try:
+        Executor(dependencies=[failing], instrumentation=recorder).execute()
+    except Exception:
+        pass
+    outcomes = [(category, outcome) for step, category, _, _, _, outcome in recorder.spans() if step is failing]
+    assert outcomes == [('validate', 'validated'), ('run', 'failed')]